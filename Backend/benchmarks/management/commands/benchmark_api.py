@@ -0,0 +1,54 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from benchmarks import runner, seed
+
+
+class Command(BaseCommand):
+    help = "Benchmark every API endpoint at several data sizes and check query counts stay flat"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[1000, 100000, 1000000],
+            help='Transaction counts to seed, one benchmark user per size'
+        )
+        parser.add_argument('--repeat', type=int, default=3, help='Requests per endpoint; the median time is reported')
+        parser.add_argument('--output', default='benchmark-results.json', help='Where to write the JSON results')
+        parser.add_argument('--no-analyze', action='store_true', help='Skip EXPLAIN for rows scanned and full scans')
+        parser.add_argument('--keep-data', action='store_true', help='Keep the seeded users instead of rolling back')
+
+    def handle(self, *args, **options):
+        results = {}
+        for size in sorted(options['sizes']):
+            self.stdout.write(f" Seeding {size} transactions...")
+            with transaction.atomic():
+                user = seed.seed_user(size)
+                self.stdout.write(f" Benchmarking {size}...")
+                results[size] = runner.run_all(user, repeat=options['repeat'], analyze=not options['no_analyze'])
+                if not options['keep_data']:
+                    transaction.set_rollback(True)
+
+            for name, metrics in results[size].items():
+                self.stdout.write(
+                    f"  {name:<36} {metrics['status']} {metrics['time_ms']:>10.2f} ms "
+                    f"{metrics['queries']:>3} queries"
+                )
+
+        regressions = runner.find_regressions(results)
+        with open(options['output'], 'w') as f:
+            json.dump({
+                'created_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'results': {str(size): data for size, data in results.items()},
+                'regressions': regressions,
+            }, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(
+                f"{regression['endpoint']}: {regression['queries']} queries at {regression['size']} transactions, "
+                f"{regression['baseline_queries']} at {regression['baseline_size']}"
+            ))
+        if regressions:
+            raise CommandError(f"{len(regressions)} endpoints issue more queries as data grows")
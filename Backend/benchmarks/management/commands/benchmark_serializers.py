@@ -0,0 +1,52 @@
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from benchmarks import seed
+from categories.cache import category_cache
+from transactions.models import Transaction
+from transactions.serializers import TransactionSerializer, TRANSACTION_READ_FIELDS, serialize_transaction_rows
+
+
+def model_path(queryset, size, user):
+    return TransactionSerializer(queryset[:size], many=True).data
+
+
+def values_path(queryset, size, user):
+    return serialize_transaction_rows(queryset.values(*TRANSACTION_READ_FIELDS)[:size], category_cache.get(user.id))
+
+
+class Command(BaseCommand):
+    help = "Compare TransactionSerializer with the values-based list serializer at several page sizes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-sizes', type=int, nargs='+', default=[20, 200, 2000], help='Rows per page')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per page size; the median time is reported')
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        with transaction.atomic():
+            user = seed.seed_user(max(options['page_sizes']))
+            queryset = Transaction.objects.filter(user=user)
+
+            for size in options['page_sizes']:
+                timings = {}
+                rendered = {}
+                for name, build in (('serializer', model_path), ('values', values_path)):
+                    runs = []
+                    for _ in range(options['repeat']):
+                        start = time.perf_counter()
+                        rendered[name] = renderer.render(build(queryset, size, user))
+                        runs.append((time.perf_counter() - start) * 1000)
+                    timings[name] = statistics.median(runs)
+
+                if rendered['serializer'] != rendered['values']:
+                    raise CommandError(f"Output differs from TransactionSerializer at page size {size}")
+                self.stdout.write(
+                    f"  {size:>5} rows  serializer {timings['serializer']:>9.2f} ms  "
+                    f"values {timings['values']:>9.2f} ms  ({timings['serializer'] / timings['values']:.1f}x)"
+                )
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS("Output is byte-identical at every page size"))
\ No newline at end of file
@@ -0,0 +1,107 @@
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.models import User
+
+
+DEFAULT_PATHS = [
+    '/api/transactions/summary/',
+    '/api/budgets/current/',
+    '/api/budgets/comparison/',
+]
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Command(BaseCommand):
+    """
+    Compare deployments of the same code, e.g. worker and thread counts:
+
+        gunicorn config.wsgi -w 2 -k gthread --threads 4 -b 127.0.0.1:8001
+        gunicorn config.wsgi -w 4 -k gthread --threads 16 -b 127.0.0.1:8002
+        python manage.py loadtest http://127.0.0.1:8001 --email user@example.com
+        python manage.py loadtest http://127.0.0.1:8002 --email user@example.com
+
+    Run the load generator on another machine than the server, and against
+    the production database engine, so that query latency is realistic.
+    """
+    help = "Send concurrent authenticated GETs to a running server and report throughput and latency"
+
+    def add_arguments(self, parser):
+        parser.add_argument('base_url', help='Server to test, e.g. http://127.0.0.1:8000')
+        parser.add_argument('--email', required=True, help='User whose JWT is sent with every request')
+        parser.add_argument('--path', action='append', dest='paths', help='Path to request (repeatable)')
+        parser.add_argument('--concurrency', type=int, default=16, help='Simultaneous clients')
+        parser.add_argument('--duration', type=float, default=20, help='Seconds to run')
+        parser.add_argument('--output', help='Also write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['email'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['email']}")
+        token = str(RefreshToken.for_user(user).access_token)
+        paths = options['paths'] or DEFAULT_PATHS
+        base_url = options['base_url'].rstrip('/')
+
+        latencies = {path: [] for path in paths}
+        errors = []
+        lock = threading.Lock()
+        deadline = time.perf_counter() + options['duration']
+
+        def client(offset):
+            position = offset
+            while time.perf_counter() < deadline:
+                path = paths[position % len(paths)]
+                position += 1
+                request = urllib.request.Request(base_url + path, headers={'Authorization': f'Bearer {token}'})
+                start = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(request, timeout=30) as response:
+                        response.read()
+                except (urllib.error.URLError, OSError) as exc:
+                    with lock:
+                        errors.append(f'{path}: {exc}')
+                    continue
+                with lock:
+                    latencies[path].append((time.perf_counter() - start) * 1000)
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(options['concurrency'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        results = {'concurrency': options['concurrency'], 'seconds': round(elapsed, 2), 'errors': len(errors), 'paths': {}}
+        everything = sorted(value for values in latencies.values() for value in values)
+        for path, values in list(latencies.items()) + [('all', everything)]:
+            values = sorted(values)
+            if not values:
+                continue
+            results['paths'][path] = {
+                'requests': len(values),
+                'rps': round(len(values) / elapsed, 1),
+                'p50_ms': round(statistics.median(values), 1),
+                'p95_ms': round(percentile(values, 0.95), 1),
+                'p99_ms': round(percentile(values, 0.99), 1),
+            }
+            metrics = results['paths'][path]
+            self.stdout.write(
+                f"  {path:<32} {metrics['requests']:>6} req {metrics['rps']:>8.1f} req/s  "
+                f"p50 {metrics['p50_ms']:>7.1f}  p95 {metrics['p95_ms']:>7.1f}  p99 {metrics['p99_ms']:>7.1f} ms"
+            )
+        for error in errors[:5]:
+            self.stdout.write(self.style.ERROR(error))
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
\ No newline at end of file
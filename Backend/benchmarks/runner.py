@@ -0,0 +1,235 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from transactions.models import Transaction
+
+
+SCAN_NODES = {'Seq Scan', 'Index Scan', 'Index Only Scan', 'Bitmap Heap Scan'}
+
+
+def import_file():
+    rows = ["type,amount,date,description,category"]
+    rows += [f"EXPENSE,{i + 1}.50,{timezone.now().date()},benchmark import {i},Expense {i}" for i in range(10)]
+    return SimpleUploadedFile('benchmark.csv', '\n'.join(rows).encode())
+
+
+def endpoints(context):
+    """(name, method, url, request kwargs) for every API endpoint under test"""
+    today = context['today']
+    history_start = today - timedelta(days=3 * 365)
+    recent_start = today - timedelta(days=90)
+    next_month = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+    month_after = (next_month + timedelta(days=32)).replace(day=1)
+    return [
+        ('auth.profile', 'get', '/api/auth/profile/', {}),
+        ('categories.list', 'get', '/api/categories/', {}),
+        ('transactions.list', 'get', '/api/transactions/', {}),
+        ('transactions.list.uncounted', 'get', '/api/transactions/?count=false', {}),
+        ('transactions.list.cursor', 'get', '/api/transactions/?pagination=cursor', {}),
+        ('transactions.list.filtered', 'get', f'/api/transactions/?type=EXPENSE&start_date={recent_start}&min_amount=100', {}),
+        ('transactions.search', 'get', '/api/transactions/?search=coffee', {}),
+        ('transactions.retrieve', 'get', f"/api/transactions/{context['transaction_id']}/", {}),
+        ('transactions.create', 'post', '/api/transactions/', {
+            'data': {
+                'type': 'EXPENSE',
+                'amount': '12.34',
+                'date': str(today),
+                'description': 'benchmark',
+                'category': context['expense_category_id'],
+            },
+            'format': 'json',
+        }),
+        ('transactions.import', 'post', '/api/transactions/import/', {
+            'data': {'file': import_file},
+            'format': 'multipart',
+        }),
+        ('transactions.summary', 'get', '/api/transactions/summary/', {}),
+        ('transactions.summary.history', 'get', f'/api/transactions/summary/?start_date={history_start}', {}),
+        ('transactions.summary.by_month', 'get', f'/api/transactions/summary/?start_date={history_start}&group_by=month', {}),
+        ('transactions.summary.by_day', 'get', f'/api/transactions/summary/?start_date={recent_start}&group_by=day', {}),
+        ('transactions.timeseries', 'get', f'/api/transactions/timeseries/?start={history_start}&rolling=7,30&cumulative=true', {}),
+        ('transactions.timeseries.by_month', 'get', f'/api/transactions/timeseries/?interval=month&start={history_start}', {}),
+        ('transactions.export', 'get', '/api/transactions/export/?format=csv', {}),
+        ('transactions.archive', 'get', '/api/transactions/archive/', {}),
+        ('transactions.balance', 'get', '/api/transactions/balance/', {}),
+        ('transactions.recurring', 'get', '/api/transactions/recurring/', {}),
+        ('budgets.list', 'get', '/api/budgets/', {}),
+        ('budgets.rollover', 'post', '/api/budgets/rollover/', {
+            'data': {'month': next_month.month, 'year': next_month.year, 'carry_over': True},
+            'format': 'json',
+        }),
+        ('budgets.current', 'get', '/api/budgets/current/', {}),
+        ('budgets.comparison', 'get', '/api/budgets/comparison/', {}),
+        ('budgets.forecast', 'get', '/api/budgets/forecast/', {}),
+        ('budgets.history', 'get', f'/api/budgets/history/?start={history_start:%Y-%m}', {}),
+        ('budgets.bulk', 'post', '/api/budgets/bulk/', {
+            'data': {
+                'month': month_after.month,
+                'year': month_after.year,
+                'budgets': [{'category': context['expense_category_id'], 'allocated_amount': '250.00'}],
+            },
+            'format': 'json',
+        }),
+        ('jobs.create', 'post', '/api/jobs/', {
+            'data': {'kind': 'EXPORT', 'params': {'format': 'csv'}},
+            'format': 'json',
+        }),
+        ('jobs.list', 'get', '/api/jobs/', {}),
+        ('metrics', 'get', '/api/metrics/', {'staff': True}),
+        ('transactions.bulk_update', 'post', '/api/transactions/bulk_update/', {
+            'data': {'filters': {'start_date': str(recent_start)}, 'changes': {'description': 'benchmark bulk update'}},
+            'format': 'json',
+        }),
+        # Last, and only today's rows of one category: at least the one
+        # transactions.create posted, all in a single rollup bucket
+        ('transactions.bulk_delete', 'post', '/api/transactions/bulk_delete/', {
+            'data': {'filters': {
+                'start_date': str(today), 'end_date': str(today), 'category': str(context['expense_category_id']),
+            }},
+            'format': 'json',
+        }),
+    ]
+
+
+def staff_client(user):
+    """A client for the staff-only endpoints, as a staff user made for the benchmarked one"""
+    staff = get_user_model().objects.create_user(
+        f'staff-{user.email}', 'benchmark-pass', first_name='Bench', last_name='Staff', is_staff=True
+    )
+    return authenticated_client(staff)
+
+
+def authenticated_client(user):
+    client = APIClient()
+    token = RefreshToken.for_user(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def build_context(user):
+    latest = Transaction.objects.filter(user=user).order_by('-date').only('id').first()
+    category = user.categories.filter(type='EXPENSE').only('id').first()
+    return {
+        'today': timezone.now().date(),
+        'transaction_id': latest.id if latest else 0,
+        'expense_category_id': category.id if category else None,
+    }
+
+
+def explain(sql):
+    """
+    Inspect a captured SELECT's plan.
+
+    Returns (rows_scanned, full_scans). Row counts come from EXPLAIN ANALYZE
+    and are only available on PostgreSQL; full scans are reported on SQLite
+    and PostgreSQL.
+    """
+    rows_scanned = None
+    full_scans = []
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}')
+            plan = cursor.fetchone()[0]
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            rows_scanned = 0
+            nodes = [plan[0]['Plan']]
+            while nodes:
+                node = nodes.pop()
+                nodes.extend(node.get('Plans', []))
+                if node['Node Type'] in SCAN_NODES:
+                    loops = node.get('Actual Loops', 1)
+                    rows_scanned += (node.get('Actual Rows', 0) + node.get('Rows Removed by Filter', 0)) * loops
+                if node['Node Type'] == 'Seq Scan':
+                    full_scans.append(node['Relation Name'])
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            for row in cursor.fetchall():
+                detail = row[-1]
+                if detail.startswith('SCAN ') and 'USING' not in detail and 'VIRTUAL TABLE' not in detail:
+                    full_scans.append(detail.split()[1])
+    return rows_scanned, full_scans
+
+
+def measure(client, method, url, kwargs, repeat=1, analyze=True):
+    """
+    Call one endpoint `repeat` times and record wall time and query metrics.
+
+    Only GETs are repeated: a second create, import or rollover would be a
+    different request (a duplicate, or a 400). The status reported is the
+    highest of all calls, so one failed call is never hidden.
+    """
+    timings = []
+    statuses = []
+    for _ in range(repeat if method == 'get' else 1):
+        request_kwargs = dict(kwargs)
+        if 'data' in request_kwargs:
+            request_kwargs['data'] = {
+                key: value() if callable(value) else value
+                for key, value in request_kwargs['data'].items()
+            }
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = getattr(client, method)(url, **request_kwargs)
+            if getattr(response, 'streaming', False):
+                for _ in response.streaming_content:
+                    pass
+            timings.append((time.perf_counter() - start) * 1000)
+        statuses.append(response.status_code)
+
+    result = {
+        'status': max(statuses),
+        'time_ms': round(statistics.median(timings), 3),
+        'queries': len(queries.captured_queries),
+        'rows_scanned': None,
+        'full_scans': [],
+    }
+    if analyze:
+        selects = [q['sql'] for q in queries.captured_queries if q['sql'].lstrip().upper().startswith('SELECT')]
+        for sql in selects:
+            rows_scanned, full_scans = explain(sql)
+            if rows_scanned is not None:
+                result['rows_scanned'] = (result['rows_scanned'] or 0) + rows_scanned
+            result['full_scans'].extend(full_scans)
+    return result
+
+
+def run_all(user, repeat=1, analyze=True):
+    """Measure every endpoint for `user`, returning {endpoint name: metrics}"""
+    clients = {False: authenticated_client(user), True: staff_client(user)}
+    context = build_context(user)
+    results = {}
+    for name, method, url, kwargs in endpoints(context):
+        kwargs = dict(kwargs)
+        client = clients[kwargs.pop('staff', False)]
+        results[name] = measure(client, method, url, kwargs, repeat=repeat, analyze=analyze)
+    return results
+
+
+def find_regressions(results):
+    """
+    List endpoints whose query count grows with data size.
+
+    `results` maps transaction count -> run_all() output.
+    """
+    sizes = sorted(results)
+    regressions = []
+    for name, baseline in results[sizes[0]].items():
+        for size in sizes[1:]:
+            current = results[size][name]
+            if current['queries'] > baseline['queries']:
+                regressions.append({
+                    'endpoint': name,
+                    'size': size,
+                    'queries': current['queries'],
+                    'baseline_size': sizes[0],
+                    'baseline_queries': baseline['queries'],
+                })
+    return regressions
@@ -0,0 +1,79 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from categories.cache import bump_version
+from categories.models import Category
+from transactions.models import Transaction
+from transactions import rollups
+from budgets.models import Budget
+from users.versions import bump_data_version
+
+User = get_user_model()
+
+BATCH_SIZE = 5000
+HISTORY_DAYS = 3 * 365
+INCOME_CATEGORIES = 5
+EXPENSE_CATEGORIES = 30
+BUDGET_MONTHS = 12
+
+WORDS = [
+    'groceries', 'coffee', 'rent', 'salary', 'uber', 'dinner', 'movie', 'electricity',
+    'internet', 'gym', 'pharmacy', 'books', 'flight', 'hotel', 'bonus', 'refund',
+]
+
+
+def seed_user(transaction_count, email=None, seed=0):
+    """
+    Create a user with categories, budgets and `transaction_count` transactions.
+
+    Transactions are spread over the last three years and written with
+    bulk_create, then the user's monthly rollups are rebuilt.
+    """
+    rnd = random.Random(seed)
+    email = email or f'bench-{transaction_count}-{seed}@example.com'
+    user = User.objects.create_user(email, 'benchmark-pass', first_name='Bench', last_name='User')
+
+    income = Category.objects.bulk_create([
+        Category(user=user, name=f'Income {i}', type='INCOME') for i in range(INCOME_CATEGORIES)
+    ])
+    expense = Category.objects.bulk_create([
+        Category(user=user, name=f'Expense {i}', type='EXPENSE') for i in range(EXPENSE_CATEGORIES)
+    ])
+    bump_version(user.id)  # bulk_create sends no signals
+
+    today = timezone.now().date()
+    batch = []
+    for i in range(transaction_count):
+        is_income = i % 10 == 0
+        batch.append(Transaction(
+            user=user,
+            category=rnd.choice(income if is_income else expense),
+            type='INCOME' if is_income else 'EXPENSE',
+            amount=Decimal(rnd.randint(100, 500000)) / 100,
+            description=' '.join(rnd.sample(WORDS, 3)),
+            date=today - timedelta(days=rnd.randrange(HISTORY_DAYS)),
+        ))
+        if len(batch) >= BATCH_SIZE:
+            Transaction.objects.bulk_create(batch)
+            batch = []
+    Transaction.objects.bulk_create(batch)
+    rollups.rebuild([user.id])
+
+    budgets = []
+    month_start = today.replace(day=1)
+    for _ in range(BUDGET_MONTHS):
+        for category in expense:
+            budgets.append(Budget(
+                user=user,
+                category=category,
+                month=month_start.month,
+                year=month_start.year,
+                allocated_amount=Decimal(rnd.randint(1000, 20000)),
+            ))
+        month_start = (month_start - timedelta(days=1)).replace(day=1)
+    Budget.objects.bulk_create(budgets)
+    bump_data_version(user.id)
+
+    return user
\ No newline at end of file
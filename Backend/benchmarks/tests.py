@@ -0,0 +1,18 @@
+from django.test import TestCase
+from benchmarks import runner, seed
+
+
+class QueryCountRegressionTests(TestCase):
+    """Query counts per endpoint must not grow with the amount of data"""
+
+    def test_query_counts_do_not_grow_with_data_size(self):
+        results = {
+            size: runner.run_all(seed.seed_user(size, seed=size), analyze=False)
+            for size in (20, 400)
+        }
+        self.assertEqual(runner.find_regressions(results), [])
+
+    def test_endpoints_respond(self):
+        results = runner.run_all(seed.seed_user(50), repeat=2, analyze=False)
+        failures = {name: m['status'] for name, m in results.items() if m['status'] >= 400}
+        self.assertEqual(failures, {})
\ No newline at end of file
@@ -0,0 +1,144 @@
+import calendar
+from datetime import date, timedelta
+from decimal import Decimal
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+from categories.cache import category_cache
+from transactions import rollups
+from transactions.models import Transaction
+from users.versions import data_version
+from .models import Budget
+
+
+HISTORY_MONTHS = 6
+CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def cents_to_money(cents):
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def month_forecast(user, year, month, today=None):
+    """
+    build_forecast, cached per user and month.
+
+    The key includes the user's data version, so any transaction (or budget,
+    or category) write starts a new entry, and today's date, because the
+    projection moves as the month progresses.
+    """
+    today = today or timezone.now().date()
+    version = data_version(user.id)
+    if version is None:
+        return build_forecast(user, year, month, today)
+
+    key = f'budgets:forecast:{user.id}:{year}-{month}:{today}:{version}'
+    forecast = cache.get(key)
+    if forecast is None:
+        forecast = build_forecast(user, year, month, today)
+        cache.set(key, forecast, CACHE_TIMEOUT)
+    return forecast
+
+
+def build_forecast(user, year, month, today):
+    """
+    Projected month-end spend for every budgeted category of the month.
+
+    Daily expense totals per category for the month and the HISTORY_MONTHS
+    before it come from one grouped query; every category is then projected
+    in the same array operations:
+
+    - run rate: this month's spend so far, extrapolated over the days left;
+    - history: average spend in past months after the same point of the
+      month (days are compared as a share of the month's length).
+
+    The two are blended by how much of the month has passed, so the forecast
+    leans on history early in the month and on the run rate late in it.
+    Money is summed as integer cents.
+    """
+    month_start = date(year, month, 1)
+    days = calendar.monthrange(year, month)[1]
+    month_end = month_start + timedelta(days=days - 1)
+    elapsed = min(max((today - month_start).days + 1, 0), days)
+    progress = elapsed / days
+
+    budgets = list(Budget.objects.filter(user=user, month=month, year=year).order_by('category_id'))
+    category_ids = [budget.category_id for budget in budgets]
+    index = {category_id: position for position, category_id in enumerate(category_ids)}
+
+    rows = list(
+        Transaction.objects.filter(
+            user=user,
+            type=Transaction.EXPENSE,
+            category__in=category_ids,
+            date__gte=rollups.months_before(month_start, HISTORY_MONTHS),
+            date__lte=min(month_end, today),
+        ).values('category', 'date').annotate(total=Sum('amount')).order_by()
+    ) if budgets else []
+
+    category = np.fromiter((index[row['category']] for row in rows), dtype=np.int64, count=len(rows))
+    months_back = np.fromiter(
+        ((year - row['date'].year) * 12 + month - row['date'].month for row in rows), dtype=np.int64, count=len(rows)
+    )
+    day = np.fromiter((row['date'].day for row in rows), dtype=np.int64, count=len(rows))
+    length = np.fromiter(
+        (calendar.monthrange(row['date'].year, row['date'].month)[1] for row in rows), dtype=np.int64, count=len(rows)
+    )
+    cents = np.fromiter((int(row['total'] * 100) for row in rows), dtype=np.int64, count=len(rows))
+
+    current = months_back == 0
+    history = ~current
+    history_months = len(np.unique(months_back[history]))
+    late = history & (day > progress * length)
+
+    spent = np.zeros(len(budgets), dtype=np.int64)
+    np.add.at(spent, category[current], cents[current])
+    history_total = np.zeros(len(budgets), dtype=np.int64)
+    np.add.at(history_total, category[history], cents[history])
+    history_late = np.zeros(len(budgets), dtype=np.int64)
+    np.add.at(history_late, category[late], cents[late])
+
+    run_rate_remaining = spent / elapsed * (days - elapsed) if elapsed else np.zeros(len(budgets))
+    if history_months:
+        history_average = history_total / history_months
+        remaining = progress * run_rate_remaining + (1 - progress) * (history_late / history_months)
+    else:
+        history_average = np.zeros(len(budgets))
+        remaining = run_rate_remaining
+    forecast = spent + np.rint(remaining).astype(np.int64)
+    run_rate = spent + np.rint(run_rate_remaining).astype(np.int64)
+
+    categories = category_cache.get(user.id)
+    results = []
+    for position, budget in enumerate(budgets):
+        projected = cents_to_money(forecast[position])
+        results.append({
+            'category': budget.category_id,
+            'category_name': categories[budget.category_id]['name'] if budget.category_id in categories else None,
+            'allocated': budget.allocated_amount,
+            'spent': cents_to_money(spent[position]),
+            'forecast': projected,
+            'run_rate_forecast': cents_to_money(run_rate[position]),
+            'historical_average': cents_to_money(np.rint(history_average[position])),
+            'projected_remaining': budget.allocated_amount - projected,
+            'projected_percentage': round(float(projected) / float(budget.allocated_amount) * 100, 2) if budget.allocated_amount > 0 else 0,
+            'status': 'over' if projected > budget.allocated_amount else 'under',
+        })
+
+    total_allocated = sum((budget.allocated_amount for budget in budgets), Decimal('0.00'))
+    total_forecast = cents_to_money(forecast.sum())
+    return {
+        'month': month,
+        'year': year,
+        'days_in_month': days,
+        'days_elapsed': elapsed,
+        'history_months': history_months,
+        'overall': {
+            'total_allocated': total_allocated,
+            'total_spent': cents_to_money(spent.sum()),
+            'total_forecast': total_forecast,
+            'projected_remaining': total_allocated - total_forecast,
+        },
+        'by_category': results,
+    }
\ No newline at end of file
@@ -1,10 +1,18 @@
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from .models import Budget
-from categories.serializers import CategorySerializer
+from categories.cache import CachedCategoryField, category_cache
+from transactions import rollups
+from users.versions import bump_data_version
+
+
+MAX_AMOUNT = Decimal('1e10')
 
 
 class BudgetSerializer(serializers.ModelSerializer):
-    category_details = CategorySerializer(source='category', read_only=True)
+    category_details = CachedCategoryField()
     spent_amount = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True, required=False)
     remaining_amount = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True, required=False)
     percentage_used = serializers.FloatField(read_only=True, required=False)
@@ -78,4 +86,128 @@ class BudgetSerializer(serializers.ModelSerializer):
         validated_data.pop('month', None)
         validated_data.pop('year', None)
         
-        return super().update(instance, validated_data)
\ No newline at end of file
+        return super().update(instance, validated_data)
+
+
+class BudgetBulkItemSerializer(serializers.Serializer):
+    category = serializers.IntegerField()
+    allocated_amount = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=Decimal('0.00'))
+
+
+class MonthlyBudgetWriteMixin:
+    """
+    Shared by the bulk and rollover serializers: everything is checked against
+    one prefetched set of the user's categories and the month's existing
+    budgets, then written with a single bulk_create.
+    """
+    validate_month = BudgetSerializer.validate_month
+    validate_year = BudgetSerializer.validate_year
+
+    def load_month(self, month, year):
+        user = self.context['request'].user
+        self.categories = category_cache.get(user.id)
+        self.existing = set(
+            Budget.objects.filter(user=user, month=month, year=year).values_list('category_id', flat=True)
+        )
+
+    def bulk_create(self, budgets):
+        try:
+            with transaction.atomic():
+                Budget.objects.bulk_create(budgets)
+                bump_data_version(self.context['request'].user.id)
+        except IntegrityError:
+            # A budget for one of the categories was created concurrently
+            raise serializers.ValidationError("A budget already exists for this category in this month/year")
+        return budgets
+
+
+class BudgetBulkSerializer(MonthlyBudgetWriteMixin, serializers.Serializer):
+    """Create budgets for many expense categories of one month at once"""
+    month = serializers.IntegerField()
+    year = serializers.IntegerField()
+    budgets = BudgetBulkItemSerializer(many=True, allow_empty=False, max_length=1000)
+
+    def validate(self, attrs):
+        self.load_month(attrs['month'], attrs['year'])
+        errors = {}
+        seen = set()
+        for index, item in enumerate(attrs['budgets']):
+            category = self.categories.get(item['category'])
+            if category is None:
+                errors[index] = {'category': [f'Invalid pk "{item["category"]}" - object does not exist.']}
+            elif category['type'] != 'EXPENSE':
+                errors[index] = {'category': ["Budget can only be set for expense categories"]}
+            elif item['category'] in self.existing:
+                errors[index] = {'category': ["A budget already exists for this category in this month/year"]}
+            elif item['category'] in seen:
+                errors[index] = {'category': ["Category is listed more than once"]}
+            seen.add(item['category'])
+        if errors:
+            raise serializers.ValidationError({'budgets': errors})
+        return attrs
+
+    def create(self, validated_data):
+        user = self.context['request'].user
+        return self.bulk_create([
+            Budget(
+                user=user,
+                category_id=item['category'],
+                month=validated_data['month'],
+                year=validated_data['year'],
+                allocated_amount=item['allocated_amount'],
+            )
+            for item in validated_data['budgets']
+        ])
+
+
+class BudgetRolloverSerializer(MonthlyBudgetWriteMixin, serializers.Serializer):
+    """Copy one month's budgets into another, optionally scaled and with unspent amounts carried over"""
+    month = serializers.IntegerField()
+    year = serializers.IntegerField()
+    source_month = serializers.IntegerField(required=False)
+    source_year = serializers.IntegerField(required=False)
+    scale = serializers.DecimalField(max_digits=6, decimal_places=4, min_value=Decimal('0'), default=Decimal('1'))
+    carry_over = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if 'source_month' not in attrs or 'source_year' not in attrs:
+            previous = date(attrs['year'], attrs['month'], 1) - timedelta(days=1)
+            attrs.setdefault('source_month', previous.month)
+            attrs.setdefault('source_year', previous.year)
+        if not 1 <= attrs['source_month'] <= 12:
+            raise serializers.ValidationError({'source_month': "Month must be between 1 and 12"})
+        if (attrs['source_month'], attrs['source_year']) == (attrs['month'], attrs['year']):
+            raise serializers.ValidationError("Source and target month must differ")
+        self.load_month(attrs['month'], attrs['year'])
+        return attrs
+
+    def create(self, validated_data):
+        user = self.context['request'].user
+        source_month, source_year = validated_data['source_month'], validated_data['source_year']
+        spent = {}
+        if validated_data['carry_over']:
+            spent = {
+                row['category']: row['total']
+                for row in rollups.category_spend(user, source_year, source_month)
+            }
+
+        budgets = []
+        self.skipped = []
+        for source in Budget.objects.filter(user=user, month=source_month, year=source_year).order_by('category_id'):
+            if source.category_id in self.existing:
+                self.skipped.append(source.category_id)
+                continue
+            amount = source.allocated_amount * validated_data['scale']
+            if validated_data['carry_over']:
+                amount += max(source.allocated_amount - spent.get(source.category_id, 0), 0)
+            amount = amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            if amount >= MAX_AMOUNT:
+                raise serializers.ValidationError({'scale': "Scaled amounts must have no more than 12 digits in total."})
+            budgets.append(Budget(
+                user=user,
+                category_id=source.category_id,
+                month=validated_data['month'],
+                year=validated_data['year'],
+                allocated_amount=amount,
+            ))
+        return self.bulk_create(budgets)
\ No newline at end of file
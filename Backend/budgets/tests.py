@@ -1,3 +1,184 @@
+from datetime import date
+from decimal import Decimal
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
+from benchmarks import seed
+from categories.models import Category
+from transactions.models import Transaction
+from .models import Budget
+from . import forecast
 
-# Create your tests here.
+
+class MonthParameterTests(TestCase):
+    def setUp(self):
+        self.user = seed.seed_user(20)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_invalid_month_or_year_is_rejected(self):
+        for url in ('/api/budgets/current/', '/api/budgets/comparison/', '/api/budgets/forecast/'):
+            for params, field in (({'month': 'abc'}, 'month'), ({'month': '13'}, 'month'), ({'year': 'x'}, 'year')):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400, (url, params))
+                self.assertIn(field, response.json())
+
+    def test_valid_month_and_year(self):
+        for url in ('/api/budgets/current/', '/api/budgets/comparison/', '/api/budgets/forecast/'):
+            self.assertEqual(self.client.get(url, {'month': '3', 'year': '2025'}).status_code, 200)
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class ForecastTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('forecast@example.com', 'pass')
+        self.food = Category.objects.create(user=self.user, name='Food', type='EXPENSE')
+        self.rent = Category.objects.create(user=self.user, name='Rent', type='EXPENSE')
+        self.salary = Category.objects.create(user=self.user, name='Salary', type='INCOME')
+        Budget.objects.create(user=self.user, category=self.food, month=3, year=2024, allocated_amount=Decimal('200.00'))
+        for category, amount, day in (
+            (self.food, '100.00', date(2024, 3, 5)),
+            (self.food, '500.00', date(2024, 3, 20)),  # after today
+            (self.food, '50.00', date(2024, 2, 1)),  # before the same point of February
+            (self.food, '80.00', date(2024, 2, 20)),
+            (self.rent, '900.00', date(2024, 3, 1)),  # not budgeted
+            (self.salary, '3000.00', date(2024, 3, 1)),
+        ):
+            Transaction.objects.create(
+                user=self.user, category=category, type=category.type, amount=Decimal(amount), date=day, description=''
+            )
+
+    def test_blends_run_rate_and_history(self):
+        result = forecast.build_forecast(self.user, 2024, 3, date(2024, 3, 10))
+        self.assertEqual((result['days_in_month'], result['days_elapsed'], result['history_months']), (31, 10, 1))
+        [food] = result['by_category']
+        # Run rate: 100.00 over 10 days, 21 days left. History: 80.00 spent
+        # after the same point of February. Weighted 10/31 and 21/31.
+        self.assertEqual(food['category'], self.food.id)
+        self.assertEqual(food['spent'], Decimal('100.00'))
+        self.assertEqual(food['run_rate_forecast'], Decimal('310.00'))
+        self.assertEqual(food['historical_average'], Decimal('130.00'))
+        self.assertEqual(food['forecast'], Decimal('221.94'))
+        self.assertEqual(food['projected_remaining'], Decimal('-21.94'))
+        self.assertEqual(food['status'], 'over')
+        self.assertEqual(result['overall']['total_forecast'], Decimal('221.94'))
+
+    def test_month_without_budgets(self):
+        result = forecast.build_forecast(self.user, 2024, 4, date(2024, 4, 10))
+        self.assertEqual(result['by_category'], [])
+        self.assertEqual(result['overall']['total_forecast'], Decimal('0.00'))
+
+    def test_cached_forecast_follows_writes(self):
+        today = date(2024, 3, 10)
+        self.assertEqual(forecast.month_forecast(self.user, 2024, 3, today)['overall']['total_spent'], Decimal('100.00'))
+        Transaction.objects.create(
+            user=self.user, category=self.food, type='EXPENSE', amount=Decimal('25.00'), date=date(2024, 3, 9), description=''
+        )
+        self.assertEqual(forecast.month_forecast(self.user, 2024, 3, today)['overall']['total_spent'], Decimal('125.00'))
+
+
+class BudgetHistoryTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('history@example.com', 'pass')
+        self.food = Category.objects.create(user=self.user, name='Food', type='EXPENSE')
+        self.travel = Category.objects.create(user=self.user, name='Travel', type='EXPENSE')
+        Budget.objects.create(user=self.user, category=self.food, month=1, year=2024, allocated_amount=Decimal('100.00'))
+        Budget.objects.create(user=self.user, category=self.food, month=3, year=2024, allocated_amount=Decimal('50.00'))
+        for category, amount, day in (
+            (self.food, '40.00', date(2024, 1, 10)),
+            (self.food, '35.50', date(2024, 1, 31)),
+            (self.travel, '300.00', date(2024, 2, 14)),  # no budget that month
+            (self.food, '60.00', date(2024, 3, 1)),
+            (self.food, '999.00', date(2024, 4, 1)),  # after the range
+        ):
+            Transaction.objects.create(
+                user=self.user, category=category, type='EXPENSE', amount=Decimal(amount), date=day, description=''
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_budget_vs_actual_per_month(self):
+        response = self.client.get('/api/budgets/history/', {'start': '2024-01', 'end': '2024-03'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['start'], data['end']), ('2024-01', '2024-03'))
+        january, february, march = data['months']
+
+        self.assertEqual((january['year'], january['month']), (2024, 1))
+        self.assertEqual(Decimal(january['total_spent']), Decimal('75.50'))
+        self.assertEqual(january['percentage_used'], 75.5)
+        [food] = january['by_category']
+        self.assertEqual((food['category'], food['category_name'], food['status']), (self.food.id, 'Food', 'under'))
+        self.assertEqual(Decimal(food['remaining']), Decimal('24.50'))
+
+        self.assertEqual(february['by_category'], [])
+        self.assertEqual(Decimal(february['total_spent']), Decimal('300.00'))
+        self.assertEqual(february['percentage_used'], 0)
+
+        [food] = march['by_category']
+        self.assertEqual((Decimal(food['spent']), food['percentage_used'], food['status']), (Decimal('60.00'), 120.0, 'over'))
+
+    def test_invalid_ranges(self):
+        for params in ({'start': '2024-13'}, {'start': '2024-04', 'end': '2024-03'}, {'start': '2000-01', 'end': '2024-03'}):
+            response = self.client.get('/api/budgets/history/', params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('start', response.json())
+
+
+class BudgetBulkTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('bulk@example.com', 'pass')
+        self.food = Category.objects.create(user=self.user, name='Food', type='EXPENSE')
+        self.rent = Category.objects.create(user=self.user, name='Rent', type='EXPENSE')
+        self.salary = Category.objects.create(user=self.user, name='Salary', type='INCOME')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def bulk(self, *items):
+        return self.client.post('/api/budgets/bulk/', {
+            'month': 5, 'year': 2024,
+            'budgets': [{'category': category, 'allocated_amount': '100.00'} for category in items],
+        }, format='json')
+
+    def test_partial_failure_writes_nothing(self):
+        response = self.bulk(self.food.id, self.salary.id, self.rent.id)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.json()['budgets']), ['1'])
+        self.assertFalse(Budget.objects.filter(user=self.user).exists())
+
+        self.assertEqual(self.bulk(self.food.id, self.rent.id, self.food.id).status_code, 400)
+        self.assertFalse(Budget.objects.filter(user=self.user).exists())
+
+    def test_other_users_category_is_rejected(self):
+        other = get_user_model().objects.create_user('other@example.com', 'pass')
+        foreign = Category.objects.create(user=other, name='Food', type='EXPENSE')
+        response = self.bulk(self.food.id, foreign.id)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('does not exist', response.json()['budgets']['1']['category'][0])
+        self.assertFalse(Budget.objects.exists())
+
+    def test_creates_every_budget(self):
+        response = self.bulk(self.food.id, self.rent.id)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            set(Budget.objects.filter(user=self.user, month=5, year=2024).values_list('category_id', flat=True)),
+            {self.food.id, self.rent.id}
+        )
+
+    def test_rollover_is_idempotent(self):
+        Budget.objects.create(user=self.user, category=self.food, month=4, year=2024, allocated_amount=Decimal('80.00'))
+        Budget.objects.create(user=self.user, category=self.rent, month=4, year=2024, allocated_amount=Decimal('900.00'))
+        payload = {'month': 5, 'year': 2024, 'scale': '1.1'}
+
+        first = self.client.post('/api/budgets/rollover/', payload, format='json')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(len(first.json()['budgets']), 2)
+        second = self.client.post('/api/budgets/rollover/', payload, format='json')
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.json()['budgets'], [])
+        self.assertEqual(second.json()['skipped_categories'], [self.food.id, self.rent.id])
+
+        self.assertEqual(
+            dict(Budget.objects.filter(user=self.user, month=5, year=2024).values_list('category_id', 'allocated_amount')),
+            {self.food.id: Decimal('88.00'), self.rent.id: Decimal('990.00')}
+        )
\ No newline at end of file
@@ -1,15 +1,55 @@
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Sum, Q
 from django.utils import timezone
+from datetime import datetime
+from decimal import Decimal
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
-from datetime import datetime
 from .models import Budget
-from .serializers import BudgetSerializer
-from transactions.models import Transaction
+from .serializers import BudgetSerializer, BudgetBulkSerializer, BudgetRolloverSerializer
+from . import forecast
+from transactions import rollups
+from config.views import conditional_get, read_from_replica
+from categories.cache import category_cache, with_missing
+
+
+MAX_HISTORY_MONTHS = 120
+
+
+def spent_by_category(user, year, month):
+    """Map category id -> total expense for the month from the monthly rollups"""
+    return {row['category']: row['total'] for row in rollups.category_spend(user, year, month)}
+
+
+def month_budgets(user, year, month):
+    return list(Budget.objects.filter(user=user, month=month, year=year))
+
+
+def parse_month_param(request, param, default):
+    """A YYYY-MM query parameter as the first day of that month"""
+    value = request.query_params.get(param)
+    if not value:
+        return default
+    try:
+        parsed = datetime.strptime(value, '%Y-%m').date()
+    except ValueError:
+        raise ValidationError({param: "Month has wrong format. Use YYYY-MM."})
+    return parsed
+
+
+def month_and_year(request):
+    """The ?month= and ?year= of the per-month reports, defaulting to the current month"""
+    today = timezone.now()
+    month = request.query_params.get('month', str(today.month))
+    year = request.query_params.get('year', str(today.year))
+    if not month.isdigit() or not 1 <= int(month) <= 12:
+        raise ValidationError({'month': "Month must be between 1 and 12"})
+    if not year.isdigit() or not 1000 <= int(year) <= 9999:
+        raise ValidationError({'year': "Year must be a four-digit year"})
+    return int(month), int(year)
 
 
 @extend_schema(tags=['Budgets'])
@@ -25,7 +65,7 @@ class BudgetViewSet(viewsets.ModelViewSet):
     ordering_fields = ['month', 'year', 'allocated_amount']
 
     def get_queryset(self):
-        return Budget.objects.filter(user=self.request.user).select_related('category')
+        return Budget.objects.filter(user=self.request.user)
 
     @extend_schema(
         summary="List all budgets",
@@ -36,6 +76,8 @@ class BudgetViewSet(viewsets.ModelViewSet):
             OpenApiParameter('category', OpenApiTypes.INT, description='Filter by category ID'),
         ],
     )
+    @read_from_replica
+    @conditional_get
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -50,6 +92,7 @@ class BudgetViewSet(viewsets.ModelViewSet):
         summary="Get budget",
         description="Retrieve a specific budget by ID.",
     )
+    @conditional_get
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
@@ -67,6 +110,56 @@ class BudgetViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
+    @extend_schema(
+        summary="Create budgets in bulk",
+        description="Create budgets for many expense categories of one month in a single request. All rows are validated first; if any is invalid nothing is created.",
+        request=BudgetBulkSerializer,
+        responses={201: BudgetSerializer(many=True), 400: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create many budgets for one month"""
+        serializer = BudgetBulkSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        budgets = serializer.save()
+        
+        return Response({
+            'month': serializer.validated_data['month'],
+            'year': serializer.validated_data['year'],
+            'budgets': BudgetSerializer(budgets, many=True).data
+        }, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Roll budgets over",
+        description="Copy a month's budgets (default: the month before the target) into the target month, optionally scaled and with the unspent part of each budget carried over. Categories that already have a budget in the target month are skipped.",
+        request=BudgetRolloverSerializer,
+        responses={201: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=['post'])
+    def rollover(self, request):
+        """Copy budgets from one month to another"""
+        serializer = BudgetRolloverSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        budgets = serializer.save()
+        
+        return Response({
+            'month': serializer.validated_data['month'],
+            'year': serializer.validated_data['year'],
+            'source_month': serializer.validated_data['source_month'],
+            'source_year': serializer.validated_data['source_year'],
+            'skipped_categories': serializer.skipped,
+            'budgets': BudgetSerializer(budgets, many=True).data
+        }, status=status.HTTP_201_CREATED)
+
+    def load_month(self, request):
+        """The month's budgets, its spend per category from the rollups and the user's cached categories"""
+        month, year = month_and_year(request)
+        
+        budgets = month_budgets(request.user, year, month)
+        spent_map = spent_by_category(request.user, year, month)
+        categories = with_missing(category_cache.get(request.user.id), {budget.category_id for budget in budgets})
+        return month, year, budgets, spent_map, categories
+
     @extend_schema(
         summary="Get current month budget",
         description="Get budgets for current or specified month with spent amounts and percentage used. Perfect for budget tracking.",
@@ -74,36 +167,26 @@ class BudgetViewSet(viewsets.ModelViewSet):
             OpenApiParameter('month', OpenApiTypes.INT, description='Month (1-12), default: current month'),
             OpenApiParameter('year', OpenApiTypes.INT, description='Year, default: current year'),
         ],
+        responses=OpenApiTypes.OBJECT,
     )
     @action(detail=False, methods=['get'])
+    @read_from_replica
+    @conditional_get
     def current(self, request):
         """Get current month budget"""
-        today = timezone.now()
-        month = int(request.query_params.get('month', today.month))
-        year = int(request.query_params.get('year', today.year))
-        
-        budgets = self.get_queryset().filter(month=month, year=year)
+        month, year, budgets, spent_map, categories = self.load_month(request)
         
         # Annotate with spent amounts
-        budget_data = []
-        for budget in budgets:
-            # Get spent amount for this category in this month
-            spent = Transaction.objects.filter(
-                user=request.user,
-                category=budget.category,
-                type='EXPENSE',
-                date__year=year,
-                date__month=month
-            ).aggregate(total=Sum('amount'))['total'] or 0
+        budget_data = BudgetSerializer(budgets, many=True, context={'categories': categories}).data
+        for budget, budget_dict in zip(budgets, budget_data):
+            spent = spent_map.get(budget.category_id) or Decimal('0.00')
             
             remaining = budget.allocated_amount - spent
             percentage = (float(spent) / float(budget.allocated_amount) * 100) if budget.allocated_amount > 0 else 0
             
-            budget_dict = BudgetSerializer(budget).data
-            budget_dict['spent_amount'] = float(spent)
-            budget_dict['remaining_amount'] = float(remaining)
+            budget_dict['spent_amount'] = spent
+            budget_dict['remaining_amount'] = remaining
             budget_dict['percentage_used'] = round(percentage, 2)
-            budget_data.append(budget_dict)
         
         return Response({
             'month': month,
@@ -118,42 +201,30 @@ class BudgetViewSet(viewsets.ModelViewSet):
             OpenApiParameter('month', OpenApiTypes.INT, description='Month (1-12), default: current month'),
             OpenApiParameter('year', OpenApiTypes.INT, description='Year, default: current year'),
         ],
+        responses=OpenApiTypes.OBJECT,
     )
     @action(detail=False, methods=['get'])
+    @read_from_replica
+    @conditional_get
     def comparison(self, request):
         """Compare budget vs actual expenses"""
-        today = timezone.now()
-        month = int(request.query_params.get('month', today.month))
-        year = int(request.query_params.get('year', today.year))
-        
-        budgets = self.get_queryset().filter(month=month, year=year)
+        month, year, budgets, spent_map, categories = self.load_month(request)
         
-        total_allocated = budgets.aggregate(total=Sum('allocated_amount'))['total'] or 0
+        total_allocated = sum((budget.allocated_amount for budget in budgets), Decimal('0.00'))
         
-        # Get total expenses for the month
-        total_spent = Transaction.objects.filter(
-            user=request.user,
-            type='EXPENSE',
-            date__year=year,
-            date__month=month
-        ).aggregate(total=Sum('amount'))['total'] or 0
+        # Total expenses for the month, including unbudgeted categories
+        total_spent = sum(spent_map.values(), Decimal('0.00'))
         
         # Category-wise comparison
         comparisons = []
         for budget in budgets:
-            spent = Transaction.objects.filter(
-                user=request.user,
-                category=budget.category,
-                type='EXPENSE',
-                date__year=year,
-                date__month=month
-            ).aggregate(total=Sum('amount'))['total'] or 0
+            spent = spent_map.get(budget.category_id) or Decimal('0.00')
             
             comparisons.append({
-                'category': budget.category.name,
-                'allocated': float(budget.allocated_amount),
-                'spent': float(spent),
-                'remaining': float(budget.allocated_amount - spent),
+                'category': categories[budget.category_id]['name'],
+                'allocated': budget.allocated_amount,
+                'spent': spent,
+                'remaining': budget.allocated_amount - spent,
                 'percentage_used': round((float(spent) / float(budget.allocated_amount) * 100), 2) if budget.allocated_amount > 0 else 0,
                 'status': 'over' if spent > budget.allocated_amount else 'under'
             })
@@ -161,10 +232,96 @@ class BudgetViewSet(viewsets.ModelViewSet):
         return Response({
             'period': f"{month}/{year}",
             'overall': {
-                'total_allocated': float(total_allocated),
-                'total_spent': float(total_spent),
-                'total_remaining': float(total_allocated - total_spent),
+                'total_allocated': total_allocated,
+                'total_spent': total_spent,
+                'total_remaining': total_allocated - total_spent,
                 'percentage_used': round((float(total_spent) / float(total_allocated) * 100), 2) if total_allocated > 0 else 0
             },
             'by_category': comparisons
+        })
+
+    @extend_schema(
+        summary="Get month-end forecast",
+        description="Project month-end spend for every budgeted category from this month's run rate and the spending pattern of past months, to see which categories will go over budget before the month ends.",
+        parameters=[
+            OpenApiParameter('month', OpenApiTypes.INT, description='Month (1-12), default: current month'),
+            OpenApiParameter('year', OpenApiTypes.INT, description='Year, default: current year'),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=False, methods=['get'])
+    @read_from_replica
+    @conditional_get
+    def forecast(self, request):
+        """Forecast month-end spend per budget"""
+        month, year = month_and_year(request)
+        return Response(forecast.month_forecast(request.user, year, month))
+
+    @extend_schema(
+        summary="Get budget history",
+        description="Allocated, spent and percentage used per budgeted category for every month of a range, for budget-adherence trends. Defaults to the last twelve months.",
+        parameters=[
+            OpenApiParameter('start', OpenApiTypes.STR, description='First month (YYYY-MM), default: eleven months before end'),
+            OpenApiParameter('end', OpenApiTypes.STR, description='Last month (YYYY-MM), default: current month'),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=False, methods=['get'])
+    @read_from_replica
+    @conditional_get
+    def history(self, request):
+        """Get budget vs actual for a range of months"""
+        end = parse_month_param(request, 'end', rollups.month_start(timezone.now().date()))
+        start = parse_month_param(request, 'start', rollups.months_before(end, 11))
+        months = (end.year - start.year) * 12 + end.month - start.month + 1
+        if months < 1:
+            raise ValidationError({'start': "Must not be after end."})
+        if months > MAX_HISTORY_MONTHS:
+            raise ValidationError({'start': f"Range is limited to {MAX_HISTORY_MONTHS} months."})
+        
+        period = rollups.period_q(start, rollups.next_month(end))
+        budgets = Budget.objects.filter(period, user=request.user).values(
+            'year', 'month', 'category_id', 'allocated_amount'
+        ).order_by('year', 'month', 'category_id')
+        spend_rows = list(rollups.monthly_category_spend(request.user, start, rollups.next_month(end)))
+        categories = category_cache.get(request.user.id)
+        
+        spent_map = {(row['year'], row['month'], row['category']): row['total'] for row in spend_rows}
+        history = {}
+        current = start
+        while current <= end:
+            history[(current.year, current.month)] = {
+                'month': current.month,
+                'year': current.year,
+                'total_allocated': Decimal('0.00'),
+                'total_spent': Decimal('0.00'),
+                'by_category': [],
+            }
+            current = rollups.next_month(current)
+        for row in spend_rows:
+            history[(row['year'], row['month'])]['total_spent'] += row['total']
+        
+        for budget in budgets:
+            entry = history[(budget['year'], budget['month'])]
+            allocated = budget['allocated_amount']
+            spent = spent_map.get((budget['year'], budget['month'], budget['category_id'])) or Decimal('0.00')
+            category = categories.get(budget['category_id'])
+            entry['total_allocated'] += allocated
+            entry['by_category'].append({
+                'category': budget['category_id'],
+                'category_name': category['name'] if category else None,
+                'allocated': allocated,
+                'spent': spent,
+                'remaining': allocated - spent,
+                'percentage_used': round((float(spent) / float(allocated) * 100), 2) if allocated > 0 else 0,
+                'status': 'over' if spent > allocated else 'under'
+            })
+        
+        for entry in history.values():
+            entry['percentage_used'] = round((float(entry['total_spent']) / float(entry['total_allocated']) * 100), 2) if entry['total_allocated'] > 0 else 0
+        
+        return Response({
+            'start': f"{start:%Y-%m}",
+            'end': f"{end:%Y-%m}",
+            'months': list(history.values())
         })
\ No newline at end of file
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def create_cache_table(sender, using, **kwargs):
+    """The default cache is a database table (see CACHES); createcachetable skips it if it exists"""
+    from django.core.management import call_command
+    call_command('createcachetable', database=using, verbosity=0)
 
 
 class CategoriesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'categories'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(create_cache_table, sender=self)
\ No newline at end of file
@@ -0,0 +1,121 @@
+import threading
+import uuid
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+from .models import Category
+from .serializers import CategorySerializer
+
+
+MAX_USERS = 1024
+
+
+def version_key(user_id):
+    return f'categories:version:{user_id}'
+
+
+def bump_version(user_id):
+    """Invalidate every process's cached categories for the user"""
+    cache.set(version_key(user_id), uuid.uuid4().hex, settings.CATEGORY_CACHE_VERSION_TTL)
+
+
+def current_version(user_id):
+    key = version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # First use, expired or evicted from the shared cache: start a new version
+        cache.add(key, uuid.uuid4().hex, settings.CATEGORY_CACHE_VERSION_TTL)
+        version = cache.get(key)
+    return version
+
+
+class CategoryCache:
+    """
+    Serialized categories per user, held in this process.
+
+    Each entry records the version it was built at. The version lives in
+    the shared Django cache and changes whenever one of the user's categories
+    is saved or deleted in any process, so a stale entry is rebuilt on the
+    next lookup. The cache must be shared by the worker processes (see
+    CACHES in settings).
+    """
+
+    def __init__(self, maxsize=MAX_USERS):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, user_id):
+        """{category id: CategorySerializer data} for the user"""
+        version = current_version(user_id)
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is not None and entry[0] == version:
+                self.entries.move_to_end(user_id)
+                return entry[1]
+
+        categories = load(user_id)
+        with self.lock:
+            self.entries[user_id] = (version, categories)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return categories
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def serialize(queryset):
+    return {item['id']: dict(item) for item in CategorySerializer(queryset, many=True).data}
+
+
+def load(user_id):
+    # From the primary: a lagging replica could cache old rows under the new version
+    return serialize(Category.objects.using(DEFAULT_DB_ALIAS).filter(user_id=user_id))
+
+
+def with_missing(categories, category_ids):
+    """
+    The user's cached categories plus any of `category_ids` that belong to
+    someone else, which the cache does not hold.
+    """
+    missing = set(category_ids) - categories.keys() - {None}
+    if not missing:
+        return categories
+    return {**categories, **serialize(Category.objects.filter(id__in=missing))}
+
+
+category_cache = CategoryCache()
+
+
+@extend_schema_field(CategorySerializer)
+class CachedCategoryField(serializers.Field):
+    """
+    Read-only nested category for `category_details`, served from category_cache.
+
+    The user's categories are looked up once per serializer tree and kept in
+    its context; views that already hold them pass them in as
+    context['categories'].
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        if instance.category_id is None:
+            return None
+        categories = self.context.get('categories')
+        if categories is None:
+            categories = self.context['categories'] = category_cache.get(instance.user_id)
+        data = categories.get(instance.category_id)
+        if data is None:
+            # Not one of the instance owner's categories
+            data = CategorySerializer(instance.category).data
+        return data
\ No newline at end of file
@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .cache import bump_version
+from .models import Category
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_cached_categories(sender, instance, **kwargs):
+    user_id = instance.user_id
+    bump_version(user_id)
+    # Again after commit, in case another process re-cached the old rows
+    transaction.on_commit(lambda: bump_version(user_id))
\ No newline at end of file
@@ -1,3 +1,43 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+from transactions.models import Transaction
+from .cache import current_version
+from .models import Category
 
-# Create your tests here.
+
+class CacheTableTests(TransactionTestCase):
+    def test_migrate_creates_the_cache_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TABLE django_cache')
+        call_command('migrate', verbosity=0)
+
+        user = get_user_model().objects.create_user('cache@example.com', 'pass')
+        version = current_version(user.id)
+        Category.objects.create(user=user, name='Food', type='EXPENSE')
+        self.assertNotEqual(current_version(user.id), version)
+
+
+class CategoryCacheTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('rename@example.com', 'pass')
+        self.category = Category.objects.create(user=self.user, name='Food', type='EXPENSE')
+        Transaction.objects.create(
+            user=self.user, category=self.category, type='EXPENSE', amount=Decimal('12.00'), date=date(2024, 5, 1), description=''
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def listed_name(self):
+        [row] = self.client.get('/api/transactions/').json()['results']
+        return row['category_details']['name']
+
+    def test_rename_reaches_the_transaction_list(self):
+        self.assertEqual(self.listed_name(), 'Food')
+        response = self.client.patch(f'/api/categories/{self.category.id}/', {'name': 'Groceries'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.listed_name(), 'Groceries')
\ No newline at end of file
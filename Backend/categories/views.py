@@ -2,6 +2,7 @@ from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
+from config.views import conditional_get, read_from_replica
 from .models import Category
 from .serializers import CategorySerializer
 
@@ -37,6 +38,8 @@ class CategoryViewSet(viewsets.ModelViewSet):
             OpenApiParameter('ordering', OpenApiTypes.STR, description='Order by field (e.g., -created_at)'),
         ],
     )
+    @read_from_replica
+    @conditional_get
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -51,6 +54,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
         summary="Get category",
         description="Retrieve a specific category by ID.",
     )
+    @conditional_get
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
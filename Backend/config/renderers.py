@@ -0,0 +1,66 @@
+import datetime
+import decimal
+import orjson
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def money_as_string():
+    return settings.API_MONEY_FORMAT == 'string'
+
+
+def money_from_cents(cents):
+    """
+    An array of integer cents as API money values, formatted like the
+    Decimals MoneyJSONEncoder writes: "12.50" strings when API_MONEY_FORMAT
+    is 'string', otherwise numbers (the float array, which orjson writes
+    without a per-value call).
+    """
+    if money_as_string():
+        return [str(decimal.Decimal(int(value)).scaleb(-2)) for value in cents]
+    return cents / 100
+
+
+class MoneyJSONEncoder(encoders.JSONEncoder):
+    """DRF's encoder, writing Decimal values according to API_MONEY_FORMAT"""
+
+    def default(self, obj):
+        # Fast paths for the types API payloads are full of; same output as DRF
+        obj_type = type(obj)
+        if obj_type is decimal.Decimal:
+            return str(obj) if money_as_string() else float(obj)
+        if obj_type is datetime.date:
+            return obj.isoformat()
+        return super().default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer built on orjson.
+
+    Output matches DRF's compact JSON: datetimes, dates and anything else
+    orjson does not handle natively go through DRF's encoder, so their format
+    is unchanged. Decimal values (totals computed in views; serializer fields
+    already return strings) are written as numbers or strings depending on
+    the API_MONEY_FORMAT setting. Indented output (the browsable API,
+    `; indent=` media types) uses the stdlib renderer.
+    """
+    encoder_class = MoneyJSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder = self.encoder_class()
+        ret = orjson.dumps(data, default=encoder.default, option=ORJSON_OPTIONS)
+        # Same escaping as JSONRenderer: keep the output a strict JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
\ No newline at end of file
@@ -0,0 +1,54 @@
+import random
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+
+
+# Database alias the current request reads from, set by config.views.read_from_replica
+replica = ContextVar('replica', default=None)
+
+
+def pin_key(user_id):
+    return f'db:pinned:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """
+    Keep the user's reads on the primary until the replicas have caught up
+    with their write.
+
+    The pin lives in the shared cache, read from the primary, so it holds
+    whichever process serves the user's next request.
+    """
+    if settings.DATABASE_REPLICAS and settings.READ_YOUR_WRITES_SECONDS > 0:
+        cache.set(pin_key(user_id), True, settings.READ_YOUR_WRITES_SECONDS)
+
+
+def choose_replica(user_id):
+    """A replica alias for the user's request, or None while they are pinned to the primary"""
+    if not settings.DATABASE_REPLICAS or cache.get(pin_key(user_id)):
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+class ReplicaRouter:
+    """
+    Send reads to a replica inside views marked with read_from_replica.
+
+    Everything else, including every write and the database cache table,
+    uses the primary ('default').
+    Replicas hold the same data, so relations between their objects and the
+    primary's are allowed.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == 'django_cache':
+            # DatabaseCache entries: the versions and pins must be current
+            return 'default'
+        return replica.get()
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
\ No newline at end of file
@@ -1,7 +1,8 @@
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
+from decouple import config, Csv
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -30,9 +31,13 @@ INSTALLED_APPS = [
     'categories',
     'transactions',
     'budgets',
+    'jobs',
+    'benchmarks',
+    'metrics',
 ]
 
 MIDDLEWARE = [
+    'metrics.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -72,6 +77,19 @@ DATABASES = {
     )
 }
 
+# Read replicas, as comma-separated database URLs. Report and list endpoints
+# read from them (see config.routers); tests use the primary instead.
+for index, url in enumerate(config('DATABASE_REPLICA_URLS', default='', cast=Csv()), start=1):
+    DATABASES[f'replica_{index}'] = {
+        **dj_database_url.parse(url, conn_max_age=600, conn_health_checks=True),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['config.routers.ReplicaRouter']
+
+# Seconds a user's reads stay on the primary after they write
+READ_YOUR_WRITES_SECONDS = config('READ_YOUR_WRITES_SECONDS', default=5, cast=int)
+
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
@@ -93,11 +111,20 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'config.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
@@ -108,6 +135,13 @@ REST_FRAMEWORK = {
     ],
 }
 
+# How Decimal totals are written in API responses: 'number' or 'string'.
+# Serializer fields (e.g. a transaction's amount) are strings either way.
+API_MONEY_FORMAT = config('API_MONEY_FORMAT', default='number')
+
+# Per-request timing (Server-Timing header and /api/metrics/)
+PERFORMANCE_METRICS = config('PERFORMANCE_METRICS', default=False, cast=bool)
+
 # API Documentation 
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Budget Tracker API',
@@ -125,6 +159,46 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
 }
 
+# Shared cache; holds the category cache versions (see categories.cache) and
+# the read-your-writes pins (see config.routers), so every worker process must
+# see the same one. The default database table is created by `manage.py
+# migrate`; Redis or Memcached also work. A per-process LocMemCache is only
+# correct with a single process.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': config('CACHE_LOCATION', default='django_cache'),
+    }
+}
+
+# A pin held in one process's memory would send the user's next request,
+# served by another process, to a replica that has not seen their write yet
+if DATABASE_REPLICAS and CACHES['default']['BACKEND'] in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+):
+    raise ImproperlyConfigured("DATABASE_REPLICA_URLS needs a CACHE_BACKEND shared by all processes.")
+
+# Seconds a category cache version is kept; bounds how long a process can
+# serve stale categories if the cache is not shared after all
+CATEGORY_CACHE_VERSION_TTL = config('CATEGORY_CACHE_VERSION_TTL', default=300, cast=int)
+
+# Per-process cache of authenticated users (see users.authentication)
+AUTH_USER_CACHE_SIZE = config('AUTH_USER_CACHE_SIZE', default=1024, cast=int)
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=60, cast=int)
+
+# Months kept in the live transactions table by `manage.py archive_transactions`
+TRANSACTION_ARCHIVE_KEEP_MONTHS = config('TRANSACTION_ARCHIVE_KEEP_MONTHS', default=24, cast=int)
+
+# Background jobs (see jobs.worker): where results are written, how many jobs
+# a user may have queued or running and run at once, and when a running job
+# whose worker stopped heartbeating is queued again
+JOB_RESULTS_ROOT = config('JOB_RESULTS_ROOT', default=str(BASE_DIR / 'job_results'))
+JOB_MAX_ACTIVE_PER_USER = config('JOB_MAX_ACTIVE_PER_USER', default=5, cast=int)
+JOB_MAX_RUNNING_PER_USER = config('JOB_MAX_RUNNING_PER_USER', default=1, cast=int)
+JOB_STALE_SECONDS = config('JOB_STALE_SECONDS', default=60, cast=int)
+JOB_MAX_ATTEMPTS = config('JOB_MAX_ATTEMPTS', default=3, cast=int)
+
 # CORS Configuration
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
\ No newline at end of file
@@ -0,0 +1,97 @@
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from benchmarks import seed
+from transactions.models import Transaction
+from users.versions import bump_data_version
+from . import routers
+from .views import read_from_replica
+
+
+class View:
+    @read_from_replica
+    def get(self, request):
+        if request.fail:
+            raise RuntimeError
+        return routers.ReplicaRouter().db_for_read(Transaction)
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'], READ_YOUR_WRITES_SECONDS=5)
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        self.user = seed.seed_user(0)
+        cache.delete(routers.pin_key(self.user.id))
+        self.router = routers.ReplicaRouter()
+
+    def request(self, fail=False):
+        return SimpleNamespace(user=self.user, fail=fail)
+
+    def test_marked_views_read_from_a_replica(self):
+        self.assertIsNone(self.router.db_for_read(Transaction))
+        self.assertEqual(View().get(self.request()), 'replica_1')
+        self.assertIsNone(self.router.db_for_read(Transaction))
+
+    def test_replica_is_reset_when_the_view_fails(self):
+        with self.assertRaises(RuntimeError):
+            View().get(self.request(fail=True))
+        self.assertIsNone(self.router.db_for_read(Transaction))
+
+    def test_writes_pin_the_user_to_the_primary(self):
+        bump_data_version(self.user.id)
+        self.assertIsNone(View().get(self.request()))
+        other = seed.seed_user(0, email='other@example.com')
+        cache.delete(routers.pin_key(other.id))
+        self.assertEqual(routers.choose_replica(other.id), 'replica_1')
+
+        cache.delete(routers.pin_key(self.user.id))  # the pin expired
+        self.assertEqual(View().get(self.request()), 'replica_1')
+
+    @override_settings(READ_YOUR_WRITES_SECONDS=0)
+    def test_pinning_can_be_disabled(self):
+        bump_data_version(self.user.id)
+        self.assertEqual(View().get(self.request()), 'replica_1')
+
+    def test_cache_table_is_read_from_the_primary(self):
+        cache_model = DatabaseCache('django_cache', {}).cache_model_class
+        token = routers.replica.set('replica_1')
+        try:
+            self.assertEqual(self.router.db_for_read(cache_model), 'default')
+        finally:
+            routers.replica.reset(token)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        self.assertIsNone(View().get(self.request()))
+
+
+class MoneyFormatTests(TestCase):
+    def setUp(self):
+        self.user = seed.seed_user(0)
+        for txn_type, amount in (('INCOME', '1000.50'), ('EXPENSE', '20.25')):
+            Transaction.objects.create(user=self.user, type=txn_type, amount=Decimal(amount), date=date(2024, 5, 1), description='')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def fetch(self):
+        [row, _] = self.client.get('/api/transactions/', {'ordering': 'amount'}).json()['results']
+        summary = self.client.get('/api/transactions/summary/', {'start_date': '2024-05-01', 'end_date': '2024-05-31'}).json()
+        return row, summary['summary']
+
+    @override_settings(API_MONEY_FORMAT='number')
+    def test_number(self):
+        row, summary = self.fetch()
+        # Serializer fields keep DRF's string output in either format
+        self.assertEqual((row['amount'], row['running_balance']), ('20.25', '980.25'))
+        self.assertEqual((summary['total_income'], summary['total_expenses'], summary['balance']), (1000.5, 20.25, 980.25))
+        self.assertIsInstance(summary['balance'], float)
+
+    @override_settings(API_MONEY_FORMAT='string')
+    def test_string(self):
+        row, summary = self.fetch()
+        self.assertEqual((row['amount'], row['running_balance']), ('20.25', '980.25'))
+        self.assertEqual((summary['total_income'], summary['total_expenses'], summary['balance']), ('1000.50', '20.25', '980.25'))
+        self.assertEqual(summary['transaction_count'], 2)
\ No newline at end of file
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.urls import path, include
+from metrics.views import MetricsView
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularSwaggerView,
@@ -14,6 +15,8 @@ urlpatterns = [
     path('api/categories/', include('categories.urls')),
     path('api/transactions/', include('transactions.urls')),
     path('api/budgets/', include('budgets.urls')),
+    path('api/jobs/', include('jobs.urls')),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
     
     # API Documentation
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
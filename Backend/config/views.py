@@ -0,0 +1,83 @@
+import functools
+import hashlib
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+from users.versions import data_version
+from . import routers
+
+
+def data_etag(request):
+    """
+    ETag for a GET of the user's data, or None if the user has no version.
+
+    Covers everything the response depends on: the user's data version, the
+    path and query string, the negotiated format and the current date (the
+    default periods of the reports).
+    """
+    version = data_version(request.user.id)
+    if version is None:
+        return None
+    key = '|'.join([
+        str(request.user.id),
+        str(version),
+        request.path,
+        request.META.get('QUERY_STRING', ''),
+        request.accepted_media_type or '',
+        str(timezone.now().date()),
+    ])
+    return quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+
+def etag_matches(request, etag):
+    etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    # If-None-Match uses the weak comparison
+    return '*' in etags or etag.removeprefix('W/') in (tag.removeprefix('W/') for tag in etags)
+
+
+def set_validators(response, etag):
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        response['ETag'] = etag
+    # Always revalidate, and never from a cache shared between users
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def conditional_get(handler):
+    """
+    Answer a GET whose If-None-Match still matches with 304 Not Modified.
+
+    The check costs one primary key read of the user's data version (see
+    users.versions) and runs before the handler, so an unchanged poll never
+    reaches the transaction tables.
+    """
+    @functools.wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        etag = data_etag(request)
+        if etag is None:
+            return handler(self, request, *args, **kwargs)
+        if etag_matches(request, etag):
+            return set_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+        return set_validators(handler(self, request, *args, **kwargs), etag)
+    return wrapper
+
+
+def read_from_replica(handler):
+    """
+    Run the handler with its reads on a database replica (see config.routers).
+
+    Apply above conditional_get, so the data version behind the ETag is read
+    from the same database as the data. Users who wrote within the last
+    READ_YOUR_WRITES_SECONDS keep reading from the primary.
+    """
+    @functools.wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        token = routers.replica.set(routers.choose_replica(request.user.id))
+        try:
+            return handler(self, request, *args, **kwargs)
+        finally:
+            routers.replica.reset(token)
+    return wrapper
@@ -0,0 +1,41 @@
+import signal
+from django.core.management.base import BaseCommand, CommandError
+from jobs import worker
+
+
+class Command(BaseCommand):
+    """
+    Start a pool of job worker threads:
+
+        python manage.py run_jobs --workers 4
+
+    Several pools may run at once against the same database. On SIGTERM or
+    Ctrl-C the pool stops claiming jobs and exits when its running jobs
+    finish; jobs of a pool that is killed are queued again once their
+    heartbeat is older than JOB_STALE_SECONDS.
+    """
+    help = "Run queued background jobs (exports, time series, rollup rebuilds)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Jobs run at once by this pool')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between queue polls')
+        parser.add_argument('--until-idle', action='store_true', help='Exit when no job is queued or running')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError("--workers must be positive")
+
+        pool = worker.WorkerPool(options['workers'], options['poll_interval'])
+        requeued, failed = worker.requeue_stale()
+        if requeued or failed:
+            self.stdout.write(f" Re-queued {requeued} and failed {failed} jobs left by stopped workers")
+
+        def stop(signum, frame):
+            self.stdout.write(" Stopping after the running jobs finish...")
+            pool.stop()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        self.stdout.write(f" Worker {pool.name} running {options['workers']} jobs at a time")
+        pool.run(until_idle=options['until_idle'])
+        self.stdout.write(self.style.SUCCESS("Worker stopped"))
\ No newline at end of file
@@ -0,0 +1,67 @@
+from django.db import models
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+
+
+def results_storage():
+    return FileSystemStorage(location=settings.JOB_RESULTS_ROOT)
+
+
+class Job(models.Model):
+    """
+    A report, export or maintenance task run outside the request by the
+    `manage.py run_jobs` worker pool (see jobs.worker).
+    """
+    EXPORT = 'EXPORT'
+    TIMESERIES = 'TIMESERIES'
+    REBUILD_ROLLUPS = 'REBUILD_ROLLUPS'
+
+    KIND_CHOICES = [
+        (EXPORT, 'Transaction export'),
+        (TIMESERIES, 'Time series'),
+        (REBUILD_ROLLUPS, 'Rollup rebuild'),
+    ]
+
+    QUEUED = 'QUEUED'
+    RUNNING = 'RUNNING'
+    SUCCEEDED = 'SUCCEEDED'
+    FAILED = 'FAILED'
+
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+
+    ACTIVE = [QUEUED, RUNNING]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='jobs'
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    progress = models.PositiveSmallIntegerField(default=0)
+    message = models.CharField(max_length=255, blank=True)
+    result = models.FileField(storage=results_storage, blank=True)
+    result_content_type = models.CharField(max_length=100, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['user', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
\ No newline at end of file
@@ -0,0 +1,84 @@
+from django.conf import settings
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+from transactions import timeseries
+from .models import Job
+
+
+class ExportParamsSerializer(serializers.Serializer):
+    format = serializers.ChoiceField(choices=['csv', 'ndjson'], default='csv')
+    type = serializers.ChoiceField(choices=['INCOME', 'EXPENSE'], required=False)
+    category = serializers.IntegerField(required=False)
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    min_amount = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
+    max_amount = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
+    include_archived = serializers.BooleanField(default=False)
+
+
+class TimeseriesParamsSerializer(serializers.Serializer):
+    interval = serializers.ChoiceField(choices=timeseries.INTERVALS, default='day')
+    start = serializers.DateField()
+    end = serializers.DateField()
+    rolling = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=timeseries.MAX_WINDOW), required=False, max_length=10
+    )
+    cumulative = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if attrs['start'] > attrs['end']:
+            raise serializers.ValidationError({'start': "Must not be after end."})
+        if timeseries.bucket_count(attrs['start'], attrs['end'], attrs['interval']) > timeseries.MAX_BUCKETS:
+            raise serializers.ValidationError({'start': f"Range is limited to {timeseries.MAX_BUCKETS} buckets; use a longer interval."})
+        return attrs
+
+
+class RebuildRollupsParamsSerializer(serializers.Serializer):
+    pass
+
+
+PARAMS_SERIALIZERS = {
+    Job.EXPORT: ExportParamsSerializer,
+    Job.TIMESERIES: TimeseriesParamsSerializer,
+    Job.REBUILD_ROLLUPS: RebuildRollupsParamsSerializer,
+}
+
+
+class JobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'kind', 'params', 'status', 'progress', 'message', 'attempts',
+            'download_url', 'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = [
+            'id', 'status', 'progress', 'message', 'attempts',
+            'download_url', 'created_at', 'started_at', 'finished_at'
+        ]
+
+    @extend_schema_field(serializers.URLField(allow_null=True))
+    def get_download_url(self, obj):
+        if obj.status != Job.SUCCEEDED or not obj.result:
+            return None
+        return reverse('job-download', args=[obj.pk], request=self.context.get('request'))
+
+    def validate(self, attrs):
+        params = PARAMS_SERIALIZERS[attrs['kind']](data=attrs.get('params') or {}, context=self.context)
+        if not params.is_valid():
+            raise serializers.ValidationError({'params': params.errors})
+        # Stored as JSON: dates and decimals in their string form
+        attrs['params'] = dict(params.data)
+
+        user = self.context['request'].user
+        if Job.objects.filter(user=user, status__in=Job.ACTIVE).count() >= settings.JOB_MAX_ACTIVE_PER_USER:
+            raise serializers.ValidationError(
+                f"You already have {settings.JOB_MAX_ACTIVE_PER_USER} jobs queued or running; wait for one to finish."
+            )
+        return attrs
+
+    def create(self, validated_data):
+        validated_data['user'] = self.context['request'].user
+        return super().create(validated_data)
\ No newline at end of file
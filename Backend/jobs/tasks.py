@@ -0,0 +1,68 @@
+import itertools
+import orjson
+from config.renderers import ORJSONRenderer
+from transactions import exporters, rollups, timeseries
+from transactions.filters import TransactionFilter, ArchivedTransactionFilter
+from transactions.models import Transaction, ArchivedTransaction
+from .models import Job
+from .serializers import TimeseriesParamsSerializer
+
+
+TASKS = {}
+PROGRESS_EVERY = exporters.CHUNK_SIZE
+
+
+def task(kind):
+    """
+    Register `run(job, output, progress)` for a job kind.
+
+    `output` is the binary file the result is written to and `progress(done)`
+    reports completion from 0 to 1. It returns (filename, content type) for
+    the download.
+    """
+    def register(run):
+        TASKS[kind] = run
+        return run
+    return register
+
+
+@task(Job.EXPORT)
+def export(job, output, progress):
+    params = job.params
+    filters = {key: value for key, value in params.items() if value is not None}
+    querysets = [TransactionFilter(filters, queryset=Transaction.objects.filter(user=job.user)).qs]
+    if params.get('include_archived'):
+        querysets.append(ArchivedTransactionFilter(filters, queryset=ArchivedTransaction.objects.filter(user=job.user)).qs)
+    total = sum(queryset.count() for queryset in querysets)
+
+    rows = itertools.chain.from_iterable(exporters.export_rows(queryset) for queryset in querysets)
+    stream = exporters.ndjson_stream(rows) if params['format'] == 'ndjson' else exporters.csv_stream(rows)
+    for written, line in enumerate(stream, start=1):
+        output.write(line.encode())
+        if total and written % PROGRESS_EVERY == 0:
+            progress(written / total)
+
+    content_type = 'application/x-ndjson' if params['format'] == 'ndjson' else 'text/csv'
+    return f"transactions.{params['format']}", content_type
+
+
+@task(Job.TIMESERIES)
+def build_timeseries(job, output, progress):
+    params = TimeseriesParamsSerializer(data=job.params)
+    params.is_valid(raise_exception=True)
+    params = params.validated_data
+    series = timeseries.build_series(
+        job.user, params['start'], params['end'], params['interval'],
+        windows=sorted(set(params.get('rolling', []))), cumulative=params['cumulative']
+    )
+    output.write(ORJSONRenderer().render(series))
+    return 'timeseries.json', 'application/json'
+
+
+@task(Job.REBUILD_ROLLUPS)
+def rebuild_rollups(job, output, progress):
+    created = rollups.rebuild([job.user_id])
+    progress(0.5)
+    mismatches = rollups.verify([job.user_id])
+    output.write(orjson.dumps({'created': created, 'mismatches': len(mismatches)}))
+    return 'rollups.json', 'application/json'
\ No newline at end of file
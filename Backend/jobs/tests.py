@@ -0,0 +1,151 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from benchmarks import seed
+from .models import Job
+from . import worker
+
+
+def execute(job_id, name):
+    """worker.execute, leaving the test's connection (and transaction) open"""
+    with mock.patch.object(worker.connection, 'close'):
+        worker.execute(job_id, name)
+
+
+@override_settings(JOB_MAX_RUNNING_PER_USER=1, JOB_MAX_ACTIVE_PER_USER=5, JOB_STALE_SECONDS=60, JOB_MAX_ATTEMPTS=3)
+class WorkerTests(TestCase):
+    def setUp(self):
+        self.results = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.results, ignore_errors=True)
+        settings_override = override_settings(JOB_RESULTS_ROOT=self.results)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.alice = seed.seed_user(30, email='alice@example.com')
+        self.bob = seed.seed_user(30, email='bob@example.com', seed=1)
+
+    def queue(self, user, kind=Job.EXPORT, **params):
+        return Job.objects.create(user=user, kind=kind, params={'format': 'csv', **params})
+
+    def test_claims_oldest_first(self):
+        jobs = [self.queue(self.alice), self.queue(self.bob)]
+        self.assertEqual(worker.claim_jobs(5, 'w1'), [job.pk for job in jobs])
+        for job in Job.objects.all():
+            self.assertEqual((job.status, job.worker, job.attempts), (Job.RUNNING, 'w1', 1))
+        self.assertEqual(worker.claim_jobs(5, 'w2'), [])
+
+    def test_per_user_running_limit(self):
+        first, second = self.queue(self.alice), self.queue(self.alice)
+        bob = self.queue(self.bob)
+        self.assertEqual(worker.claim_jobs(5, 'w1'), [first.pk, bob.pk])
+        self.assertEqual(Job.objects.get(pk=second.pk).status, Job.QUEUED)
+
+        Job.objects.filter(pk=first.pk).update(status=Job.SUCCEEDED)
+        self.assertEqual(worker.claim_jobs(5, 'w1'), [second.pk])
+
+    def test_job_taken_by_another_worker_is_skipped(self):
+        first, second = self.queue(self.alice), self.queue(self.bob)
+        now = timezone.now()
+
+        def claimed_meanwhile():
+            # Another worker claims the oldest job after this one read the candidates
+            Job.objects.filter(pk=first.pk).update(status=Job.RUNNING, worker='w2')
+            return now
+
+        with mock.patch.object(worker.timezone, 'now', claimed_meanwhile):
+            self.assertEqual(worker.claim_jobs(2, 'w1'), [second.pk])
+        self.assertEqual(Job.objects.get(pk=first.pk).worker, 'w2')
+
+    def test_requeue_stale(self):
+        stale = timezone.now() - timedelta(seconds=120)
+        retried = self.queue(self.alice)
+        exhausted = self.queue(self.bob)
+        alive = self.queue(self.bob)
+        Job.objects.filter(pk=retried.pk).update(status=Job.RUNNING, worker='gone', attempts=1, heartbeat_at=stale)
+        Job.objects.filter(pk=exhausted.pk).update(status=Job.RUNNING, worker='gone', attempts=3, heartbeat_at=stale)
+        Job.objects.filter(pk=alive.pk).update(status=Job.RUNNING, worker='w1', attempts=1, heartbeat_at=timezone.now())
+
+        self.assertEqual(worker.requeue_stale(), (1, 1))
+        retried, exhausted, alive = (Job.objects.get(pk=job.pk) for job in (retried, exhausted, alive))
+        self.assertEqual((retried.status, retried.worker, retried.heartbeat_at), (Job.QUEUED, '', None))
+        self.assertEqual((exhausted.status, exhausted.message), (Job.FAILED, "The worker running this job stopped"))
+        self.assertEqual((alive.status, alive.worker), (Job.RUNNING, 'w1'))
+
+    def test_execute_records_result(self):
+        job = self.queue(self.alice)
+        worker.claim_jobs(1, 'w1')
+        execute(job.pk, 'w1')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress, job.worker), (Job.SUCCEEDED, 100, ''))
+        self.assertEqual(job.result_content_type, 'text/csv')
+        with job.result.open('rb') as result:
+            self.assertEqual(len(result.read().splitlines()), 31)
+
+    def test_execute_records_failure(self):
+        job = self.queue(self.alice)
+        worker.claim_jobs(1, 'w1')
+
+        def fail(job, output, progress):
+            raise RuntimeError("disk full")
+
+        with mock.patch.dict(worker.TASKS, {Job.EXPORT: fail}), self.assertLogs('jobs.worker', 'ERROR'):
+            execute(job.pk, 'w1')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.message, job.worker), (Job.FAILED, "disk full", ''))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_execute_skips_job_requeued_elsewhere(self):
+        job = self.queue(self.alice)
+        worker.claim_jobs(1, 'w1')
+        Job.objects.filter(pk=job.pk).update(worker='w2')
+        execute(job.pk, 'w1')
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.RUNNING)
+
+
+class JobEndpointTests(TestCase):
+    def setUp(self):
+        self.results = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.results, ignore_errors=True)
+        settings_override = override_settings(JOB_RESULTS_ROOT=self.results, JOB_MAX_ACTIVE_PER_USER=2)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.alice = seed.seed_user(10, email='alice@example.com')
+        self.bob = seed.seed_user(10, email='bob@example.com', seed=1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def test_active_job_limit(self):
+        for _ in range(2):
+            self.assertEqual(self.client.post('/api/jobs/', {'kind': 'EXPORT'}, format='json').status_code, 201)
+        self.assertEqual(self.client.post('/api/jobs/', {'kind': 'EXPORT'}, format='json').status_code, 400)
+
+    def test_download(self):
+        job_id = self.client.post('/api/jobs/', {'kind': 'EXPORT'}, format='json').json()['id']
+        self.assertEqual(self.client.get(f'/api/jobs/{job_id}/download/').status_code, 404)
+
+        worker.claim_jobs(1, 'w1')
+        execute(job_id, 'w1')
+        response = self.client.get(f'/api/jobs/{job_id}/download/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 11)
+
+        other = APIClient()
+        other.force_authenticate(self.bob)
+        self.assertEqual(other.get(f'/api/jobs/{job_id}/download/').status_code, 404)
+        self.assertEqual(other.get(f'/api/jobs/{job_id}/').status_code, 404)
+        self.assertEqual(APIClient().get(f'/api/jobs/{job_id}/download/').status_code, 401)
+
+    def test_rollup_rebuild_changes_the_summary_etag(self):
+        etag = self.client.get('/api/transactions/summary/')['ETag']
+        job_id = self.client.post('/api/jobs/', {'kind': 'REBUILD_ROLLUPS'}, format='json').json()['id']
+        worker.claim_jobs(1, 'w1')
+        execute(job_id, 'w1')
+        self.assertEqual(Job.objects.get(pk=job_id).status, Job.SUCCEEDED)
+
+        response = self.client.get('/api/transactions/summary/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
\ No newline at end of file
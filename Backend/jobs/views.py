@@ -0,0 +1,91 @@
+import shutil
+from django.http import FileResponse
+from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
+from .models import Job
+from .serializers import JobSerializer
+
+
+@extend_schema(tags=['Jobs'])
+class JobViewSet(mixins.CreateModelMixin,
+                 mixins.ListModelMixin,
+                 mixins.RetrieveModelMixin,
+                 mixins.DestroyModelMixin,
+                 viewsets.GenericViewSet):
+    """
+    Background jobs for work too long for one request.
+
+    Jobs are run by `manage.py run_jobs`; poll a job until its status is
+    SUCCEEDED or FAILED, then fetch the result from its download_url.
+    """
+    serializer_class = JobSerializer
+    filterset_fields = ['kind', 'status']
+
+    def get_queryset(self):
+        return Job.objects.filter(user=self.request.user)
+
+    @extend_schema(
+        summary="List jobs",
+        description="Get paginated list of the user's jobs, newest first.",
+        parameters=[
+            OpenApiParameter('kind', OpenApiTypes.STR, enum=['EXPORT', 'TIMESERIES', 'REBUILD_ROLLUPS'], description='Filter by job kind'),
+            OpenApiParameter('status', OpenApiTypes.STR, enum=['QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED'], description='Filter by status'),
+        ],
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        summary="Submit job",
+        description=(
+            "Queue a job. EXPORT takes the transaction export filters (format csv or ndjson, type, category, "
+            "start_date, end_date, min_amount, max_amount) and include_archived; TIMESERIES takes interval, "
+            "start, end, rolling (list of windows) and cumulative; REBUILD_ROLLUPS rebuilds and verifies the "
+            "user's monthly rollups. Each user may have a limited number of jobs queued or running."
+        ),
+    )
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @extend_schema(
+        summary="Get job",
+        description="Poll a job's status and progress (0-100).",
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @extend_schema(
+        summary="Delete job",
+        description="Cancel a queued job, or delete a finished one and its result. Running jobs cannot be deleted.",
+    )
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        # Only delete a job nothing has claimed in the meantime
+        deleted, _ = Job.objects.filter(pk=instance.pk).exclude(status=Job.RUNNING).delete()
+        if not deleted:
+            raise ValidationError("Running jobs cannot be deleted.")
+        shutil.rmtree(instance.result.storage.path(str(instance.pk)), ignore_errors=True)
+
+    @extend_schema(
+        summary="Download job result",
+        description="Download the file produced by a succeeded job.",
+        responses={(200, 'application/octet-stream'): OpenApiTypes.BINARY},
+    )
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Download a job's result"""
+        job = self.get_object()
+        if job.status != Job.SUCCEEDED or not job.result:
+            raise NotFound("This job has no result yet.")
+        
+        return FileResponse(
+            job.result.open('rb'),
+            as_attachment=True,
+            filename=job.result.name.rsplit('/', 1)[-1],
+            content_type=job.result_content_type or 'application/octet-stream'
+        )
\ No newline at end of file
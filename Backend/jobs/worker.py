@@ -0,0 +1,174 @@
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection
+from django.db.models import Count, F
+from django.utils import timezone
+from .models import Job
+from .tasks import TASKS
+
+
+logger = logging.getLogger(__name__)
+
+# Queued jobs looked at per free slot when skipping users at their limit
+CLAIM_LOOKAHEAD = 10
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def heartbeat(job_ids, worker, **fields):
+    """
+    Best effort: a missed heartbeat or progress update is retried on the next
+    one, so a briefly locked database (SQLite) must not fail the job.
+    """
+    try:
+        Job.objects.filter(pk__in=job_ids, worker=worker).update(heartbeat_at=timezone.now(), **fields)
+    except DatabaseError:
+        logger.warning("Could not update jobs %s", job_ids, exc_info=True)
+
+
+def requeue_stale(now=None):
+    """
+    Queue running jobs whose worker stopped heartbeating again, or fail them
+    once they have used up JOB_MAX_ATTEMPTS. Returns (requeued, failed).
+    """
+    now = now or timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, heartbeat_at__lt=now - timedelta(seconds=settings.JOB_STALE_SECONDS))
+    failed = stale.filter(attempts__gte=settings.JOB_MAX_ATTEMPTS).update(
+        status=Job.FAILED, message="The worker running this job stopped", worker='', finished_at=now
+    )
+    requeued = stale.update(status=Job.QUEUED, worker='', heartbeat_at=None)
+    return requeued, failed
+
+
+def claim_jobs(slots, worker):
+    """
+    Mark up to `slots` queued jobs as running on `worker`, oldest first.
+
+    Users already running JOB_MAX_RUNNING_PER_USER jobs are skipped. Each
+    claim is a conditional UPDATE, so two workers never take the same job.
+    """
+    if slots <= 0:
+        return []
+    candidates = list(
+        Job.objects.filter(status=Job.QUEUED).order_by('created_at', 'id')
+        .values_list('id', 'user_id')[:slots * CLAIM_LOOKAHEAD]
+    )
+    running = dict(
+        Job.objects.filter(status=Job.RUNNING, user_id__in={user_id for _, user_id in candidates})
+        .values_list('user_id').annotate(count=Count('id')).order_by()
+    )
+
+    claimed = []
+    now = timezone.now()
+    for job_id, user_id in candidates:
+        if len(claimed) == slots:
+            break
+        if running.get(user_id, 0) >= settings.JOB_MAX_RUNNING_PER_USER:
+            continue
+        taken = Job.objects.filter(pk=job_id, status=Job.QUEUED).update(
+            status=Job.RUNNING, worker=worker, attempts=F('attempts') + 1,
+            progress=0, message='', started_at=now, heartbeat_at=now
+        )
+        if taken:
+            running[user_id] = running.get(user_id, 0) + 1
+            claimed.append(job_id)
+    return claimed
+
+
+def execute(job_id, worker):
+    """
+    Run a claimed job and record its result.
+
+    The result is written next to its final name and renamed into place, so
+    a job that is resumed after a crash starts again from a clean file.
+    """
+    try:
+        job = Job.objects.select_related('user').filter(pk=job_id, worker=worker).first()
+        if job is None:
+            # Re-queued while this worker was unresponsive
+            return
+        storage = job.result.storage
+        directory = str(job.pk)
+        os.makedirs(storage.path(directory), exist_ok=True)
+        partial = storage.path(os.path.join(directory, 'result.part'))
+        last = [0]
+
+        def progress(done):
+            percent = min(int(done * 100), 99)
+            if percent > last[0]:
+                last[0] = percent
+                heartbeat([job.pk], worker, progress=percent)
+
+        try:
+            with open(partial, 'wb') as output:
+                filename, content_type = TASKS[job.kind](job, output, progress)
+            name = os.path.join(directory, filename)
+            os.replace(partial, storage.path(name))
+        except Exception as exc:
+            logger.exception("Job %s failed", job_id)
+            Job.objects.filter(pk=job.pk, worker=worker).update(
+                status=Job.FAILED, message=str(exc)[:255], worker='', finished_at=timezone.now()
+            )
+            return
+
+        Job.objects.filter(pk=job.pk, worker=worker).update(
+            status=Job.SUCCEEDED, progress=100, result=name, result_content_type=content_type,
+            worker='', finished_at=timezone.now()
+        )
+    finally:
+        connection.close()
+
+
+class WorkerPool:
+    """
+    Runs queued jobs on a thread pool until stopped.
+
+    Every poll the pool heartbeats its running jobs, re-queues jobs left
+    running by workers that died (see requeue_stale), and claims as many
+    queued jobs as it has free threads. Several pools, in one or more
+    processes or hosts, can share the database. On SQLite, jobs that write
+    (rollup rebuilds) wait for running exports to finish reading, so prefer
+    PostgreSQL or a single worker thread there.
+    """
+
+    def __init__(self, workers, poll_interval=1.0, name=None):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.name = name or worker_name()
+        self.stopping = threading.Event()
+
+    def stop(self):
+        self.stopping.set()
+
+    def run(self, until_idle=False):
+        """
+        Poll until stop() is called, or with until_idle until no job is left
+        to run. Running jobs are always allowed to finish (and heartbeat)
+        first; a hard kill leaves them to requeue_stale.
+        """
+        running = {}
+        with ThreadPoolExecutor(self.workers, thread_name_prefix='job') as pool:
+            while True:
+                close_old_connections()
+                for job_id, future in list(running.items()):
+                    if future.done():
+                        del running[job_id]
+                if running:
+                    heartbeat(list(running), self.name)
+
+                if not self.stopping.is_set():
+                    requeue_stale()
+                    for job_id in claim_jobs(self.workers - len(running), self.name):
+                        running[job_id] = pool.submit(execute, job_id, self.name)
+                if not running and (until_idle or self.stopping.is_set()):
+                    break
+                time.sleep(self.poll_interval)
+        connection.close()
\ No newline at end of file
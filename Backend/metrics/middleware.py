@@ -0,0 +1,79 @@
+from contextlib import ExitStack, contextmanager
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from . import timing
+from .registry import registry
+
+
+class PerformanceMiddleware:
+    """
+    Measure database, authentication, serialization and total time per request.
+
+    Adds a Server-Timing header to every response and records per-route
+    summaries for the /api/metrics/ endpoint. Enabled with the
+    PERFORMANCE_METRICS setting; when it is off Django drops the middleware
+    entirely and nothing is instrumented.
+
+    A streaming response (exports, job downloads) does its work while the
+    body is iterated, after the headers are sent: it gets no Server-Timing
+    header, and is recorded once its iterator is exhausted or closed.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERFORMANCE_METRICS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        timing.install()
+
+    def __call__(self, request):
+        timer = timing.RequestTimer()
+        with self.instrument(timer):
+            response = self.get_response(request)
+
+        if response.streaming and not response.is_async:
+            response.streaming_content = self.timed_stream(response.streaming_content, timer, request)
+            return response
+        response['Server-Timing'] = self.server_timing(timer, timer.total)
+        self.record(request, timer)
+        return response
+
+    @contextmanager
+    def instrument(self, timer):
+        """Attribute the block's queries and DRF phases to `timer`"""
+        token = timing.activate(timer)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timing.query_timer))
+                yield
+        finally:
+            timing.deactivate(token)
+
+    def timed_stream(self, content, timer, request):
+        """Yield the body's chunks, producing each one instrumented; record when done or closed"""
+        chunks = iter(content)
+        done = object()
+        try:
+            while True:
+                with self.instrument(timer):
+                    chunk = next(chunks, done)
+                if chunk is done:
+                    return
+                yield chunk
+        finally:
+            self.record(request, timer)
+
+    def record(self, request, timer):
+        match = getattr(request, 'resolver_match', None)
+        if match is not None:
+            values = dict(timer.durations, total=timer.total, queries=timer.queries)
+            registry.observe(match.view_name or match.route, request.method, values)
+
+    def server_timing(self, timer, total):
+        entries = [f'db;dur={timer.durations.get("db", 0.0) * 1000:.2f};desc="{timer.queries} queries"']
+        for name in ('auth', 'serialize', 'render'):
+            if name in timer.durations:
+                entries.append(f'{name};dur={timer.durations[name] * 1000:.2f}')
+        entries.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(entries)
\ No newline at end of file
@@ -0,0 +1,94 @@
+import threading
+from collections import deque
+
+
+RESERVOIR_SIZE = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+
+SERIES = [
+    ('http_request_duration_seconds', 'Total time spent handling the request', 'total'),
+    ('http_request_db_seconds', 'Time spent in database queries', 'db'),
+    ('http_request_db_queries', 'Number of database queries', 'queries'),
+    ('http_request_auth_seconds', 'Time spent authenticating the request', 'auth'),
+    ('http_request_serialize_seconds', 'Time spent in serializers', 'serialize'),
+    ('http_request_render_seconds', 'Time spent rendering the response body', 'render'),
+]
+
+
+class Summary:
+    """Count, sum and a bounded reservoir of recent samples for quantiles"""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.samples = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.samples.append(value)
+
+    def quantile(self, q):
+        if not self.samples:
+            return float('nan')
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Registry:
+    """
+    Per-route request metrics for this process.
+
+    Each worker process keeps its own registry; scrape every worker (or
+    aggregate in Prometheus) when running several.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.collectors = []
+
+    def add_collector(self, collect):
+        """Register a callable returning (name, help, type, value) tuples to render on each scrape"""
+        self.collectors.append(collect)
+
+    def observe(self, route, method, values):
+        with self.lock:
+            summaries = self.routes.setdefault((route, method), {})
+            for _, _, key in SERIES:
+                if key in values:
+                    summaries.setdefault(key, Summary()).observe(values[key])
+
+    def reset(self):
+        with self.lock:
+            self.routes = {}
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        with self.lock:
+            for name, help_text, key in SERIES:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} summary')
+                for (route, method), summaries in sorted(self.routes.items()):
+                    summary = summaries.get(key)
+                    if summary is None:
+                        continue
+                    labels = f'route="{_escape(route)}",method="{method}"'
+                    for q in QUANTILES:
+                        lines.append(f'{name}{{{labels},quantile="{q}"}} {summary.quantile(q):.6f}')
+                    lines.append(f'{name}_sum{{{labels}}} {summary.sum:.6f}')
+                    lines.append(f'{name}_count{{{labels}}} {summary.count}')
+        for collect in self.collectors:
+            for name, help_text, metric_type, value in collect():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = Registry()
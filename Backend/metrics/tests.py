@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient
+from benchmarks import seed
+from transactions.models import Transaction
+from .middleware import PerformanceMiddleware
+from .registry import registry
+
+
+@override_settings(PERFORMANCE_METRICS=True)
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self):
+        self.user = seed.seed_user(30)
+        registry.reset()
+        self.addCleanup(registry.reset)
+
+    def request(self):
+        request = RequestFactory().get('/report/')
+        request.resolver_match = SimpleNamespace(view_name='report', route='report/')
+        return request
+
+    def observed(self, key):
+        return registry.routes[('report', 'GET')][key]
+
+    def test_streaming_body_is_measured_until_closed(self):
+        def rows():
+            for txn in Transaction.objects.filter(user=self.user).iterator(chunk_size=10):
+                yield f'{txn.id}\n'
+            yield str(Transaction.objects.count())
+
+        response = PerformanceMiddleware(lambda request: StreamingHttpResponse(rows()))(self.request())
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(registry.routes, {})
+
+        body = b''.join(response.streaming_content)
+        response.close()
+        self.assertEqual(len(body.splitlines()), 31)
+        self.assertEqual(self.observed('queries').samples[-1], 2)
+        self.assertEqual(self.observed('total').count, 1)
+
+    def test_streaming_response_closed_early_is_recorded(self):
+        response = PerformanceMiddleware(lambda request: StreamingHttpResponse(iter([b'a', b'b'])))(self.request())
+        next(iter(response.streaming_content))
+        response.close()
+        self.assertEqual(self.observed('total').count, 1)
+
+    def test_regular_response(self):
+        def view(request):
+            Transaction.objects.count()
+            return HttpResponse('ok')
+
+        response = PerformanceMiddleware(view)(self.request())
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('"1 queries"', response['Server-Timing'])
+        self.assertEqual(self.observed('queries').samples[-1], 1)
+
+
+@override_settings(PERFORMANCE_METRICS=True)
+class TransactionTimingTests(TestCase):
+    def test_row_serializer_is_timed(self):
+        client = APIClient()
+        client.force_authenticate(seed.seed_user(30))
+        for url in ('/api/transactions/', f'/api/transactions/{Transaction.objects.first().id}/'):
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('serialize;dur=', response['Server-Timing'], url)
\ No newline at end of file
@@ -0,0 +1,102 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+_current = ContextVar('request_timer', default=None)
+
+
+class RequestTimer:
+    """Accumulates time per phase (db, auth, serialize, render) for one request"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.durations = {}
+        self.queries = 0
+        self._active = set()
+
+    def add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    @property
+    def total(self):
+        return time.perf_counter() - self.start
+
+
+def activate(timer):
+    return _current.set(timer)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def track(name):
+    """Time a block against the current request; nested blocks of the same name count once"""
+    timer = _current.get()
+    if timer is None or name in timer._active:
+        yield
+        return
+    timer._active.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer._active.discard(name)
+        timer.add(name, time.perf_counter() - start)
+
+
+def query_timer(execute, sql, params, many, context):
+    """Database execute wrapper counting queries and their time"""
+    timer = _current.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.queries += 1
+        timer.add('db', time.perf_counter() - start)
+
+
+_installed = False
+
+
+def install():
+    """
+    Time JWT authentication, serialization and rendering in DRF.
+
+    Wraps APIView.perform_authentication, BaseSerializer.data and
+    Response.rendered_content once per process. Only called when the
+    performance middleware is enabled, so there is no cost otherwise.
+    """
+    global _installed
+    if _installed:
+        return
+    from rest_framework.response import Response
+    from rest_framework.serializers import BaseSerializer
+    from rest_framework.views import APIView
+
+    perform_authentication = APIView.perform_authentication
+
+    def timed_perform_authentication(self, request):
+        with track('auth'):
+            return perform_authentication(self, request)
+
+    APIView.perform_authentication = timed_perform_authentication
+
+    for cls, attr, phase in ((BaseSerializer, 'data', 'serialize'), (Response, 'rendered_content', 'render')):
+        getter = getattr(cls, attr).fget
+
+        def timed(self, getter=getter, phase=phase):
+            with track(phase):
+                return getter(self)
+
+        setattr(cls, attr, property(timed))
+
+    _installed = True
@@ -0,0 +1,21 @@
+from django.http import HttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions
+from rest_framework.views import APIView
+from .registry import registry
+
+
+@extend_schema(tags=['Metrics'])
+class MetricsView(APIView):
+    """
+    Per-route request timings in Prometheus text format. Staff only.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(
+        summary="Get request metrics",
+        description="Per-route p50/p95/p99 of total, database, auth, serialization and render time, plus query counts, in Prometheus text format. Empty unless PERFORMANCE_METRICS is enabled.",
+        responses={(200, 'text/plain'): str},
+    )
+    def get(self, request):
+        return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
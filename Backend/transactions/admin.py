@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Transaction
+from django.db import connections
+from .models import Transaction, ArchivedTransaction, MonthlyRollup, RecurringTransaction
+from . import search
 
 
 @admin.register(Transaction)
@@ -8,4 +10,41 @@ class TransactionAdmin(admin.ModelAdmin):
     list_filter = ['type', 'date', 'created_at']
     search_fields = ['user__email', 'description', 'category__name']
     ordering = ['-date', '-created_at']
-    date_hierarchy = 'date'
\ No newline at end of file
+    date_hierarchy = 'date'
+
+    def get_search_fields(self, request):
+        # Descriptions are matched through the full-text index in get_search_results
+        if search.supports_full_text(connections[self.model.objects.db].vendor):
+            return [field for field in self.search_fields if field != 'description']
+        return self.search_fields
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        terms = search_term.split()
+        if terms and search.supports_full_text(connections[queryset.db].vendor):
+            results = results | search.matching(queryset, terms)
+        return results, may_have_duplicates
+
+
+@admin.register(MonthlyRollup)
+class MonthlyRollupAdmin(admin.ModelAdmin):
+    list_display = ['user', 'year', 'month', 'category', 'type', 'total', 'count']
+    list_filter = ['type', 'year', 'month']
+    search_fields = ['user__email', 'category__name']
+    ordering = ['-year', '-month']
+
+
+@admin.register(ArchivedTransaction)
+class ArchivedTransactionAdmin(admin.ModelAdmin):
+    list_display = ['user', 'type', 'amount', 'category', 'date', 'archived_at']
+    list_filter = ['type', 'archived_at']
+    search_fields = ['user__email', 'description', 'category__name']
+    ordering = ['-date', '-created_at']
+
+
+@admin.register(RecurringTransaction)
+class RecurringTransactionAdmin(admin.ModelAdmin):
+    list_display = ['user', 'type', 'amount', 'category', 'frequency', 'interval', 'next_date', 'active']
+    list_filter = ['type', 'frequency', 'active']
+    search_fields = ['user__email', 'description', 'category__name']
+    ordering = ['next_date']
\ No newline at end of file
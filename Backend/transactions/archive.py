@@ -0,0 +1,51 @@
+from django.db import transaction
+from django.utils import timezone
+from users.versions import bump_data_version
+from .models import Transaction, ArchivedTransaction
+from . import bulk, rollups
+
+
+BATCH_SIZE = 1000
+# Budget forecasts read up to six past months of daily transactions
+MIN_KEEP_MONTHS = 12
+ARCHIVED_FIELDS = (
+    'id', 'user_id', 'category_id', 'type', 'amount', 'description', 'date', 'created_at', 'updated_at',
+    'recurring_id', 'occurrence'
+)
+
+
+def archive_cutoff(keep_months, today=None):
+    """First day of the oldest live month: the current month plus `keep_months` full months stay live"""
+    return rollups.months_before(today or timezone.now().date(), keep_months)
+
+
+def archivable(cutoff, user_ids=None):
+    transactions = Transaction.objects.filter(date__lt=cutoff)
+    if user_ids:
+        transactions = transactions.filter(user_id__in=user_ids)
+    return transactions
+
+
+def archive_user(user_id, cutoff, batch_size=BATCH_SIZE):
+    """
+    Move the user's transactions dated before `cutoff` to the archive table.
+
+    Rows are copied and deleted in batches, one database transaction each.
+    The delete (bulk.delete_rows) bypasses model signals, so the monthly
+    rollups keep the archived amounts and reports over those months stay
+    correct.
+    """
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Transaction.objects.filter(user_id=user_id, date__lt=cutoff)
+                .order_by('id').values(*ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+            ArchivedTransaction.objects.bulk_create([ArchivedTransaction(**row) for row in rows])
+            bulk.delete_rows(Transaction.objects.filter(id__in=[row['id'] for row in rows]))
+            bump_data_version(user_id)
+        moved += len(rows)
+    return moved
\ No newline at end of file
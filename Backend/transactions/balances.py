@@ -0,0 +1,108 @@
+import bisect
+from decimal import Decimal
+from django.db.models import Case, DecimalField, F, Q, Sum, When
+from .models import Transaction, ArchivedTransaction, MonthlyRollup
+from . import rollups
+
+
+def signed(txn_type, amount):
+    return amount if txn_type == Transaction.INCOME else -amount
+
+
+def opening_balances(user_id, months):
+    """
+    {month: balance before it} for the given first-of-month dates.
+
+    Read from the monthly rollups, which every write path keeps current
+    (back-dated transactions included). The database sums the user's
+    earlier months into one filtered total per requested month, so only
+    len(months) values come back however long the history is.
+    """
+    signed_total = Case(
+        When(type=Transaction.INCOME, then=F('total')),
+        default=-F('total'),
+        output_field=DecimalField(max_digits=14, decimal_places=2)
+    )
+    months = sorted(set(months))
+    totals = MonthlyRollup.objects.filter(
+        before_month(months[-1]), user_id=user_id, count__gt=0
+    ).aggregate(**{
+        str(index): Sum(signed_total, filter=before_month(month))
+        for index, month in enumerate(months)
+    })
+    return {month: totals[str(index)] or Decimal('0.00') for index, month in enumerate(months)}
+
+
+def before_month(month):
+    return Q(year__lt=month.year) | Q(year=month.year, month__lt=month.month)
+
+
+def month_q(last_dates):
+    """Transactions from the start of each month up to its given last date"""
+    q = Q()
+    for month, last_date in last_dates.items():
+        q |= Q(date__gte=month, date__lte=last_date)
+    return q
+
+
+def balance_as_of(user_id, as_of):
+    """The user's balance at the end of `as_of`: the month's opening balance plus its transactions up to that day"""
+    month = rollups.month_start(as_of)
+    balance = opening_balances(user_id, [month])[month]
+    for model in (Transaction, ArchivedTransaction):
+        rows = model.objects.filter(user_id=user_id, date__gte=month, date__lte=as_of).values('type').annotate(
+            total=Sum('amount')
+        ).order_by()
+        for row in rows:
+            balance += signed(row['type'], row['total'])
+    return balance
+
+
+def running_balances(user_id, rows):
+    """
+    {id: balance after the transaction} for `rows` (dicts with id, date and
+    created_at), counting every transaction of the user in (date,
+    created_at, id) order, whatever filter or ordering picked the rows.
+
+    Each month the rows fall in is read once, up to its latest row, into
+    prefix sums that start at the month's opening balance; a row is then
+    found by bisection. The cost follows the rows' months, not the length
+    of the user's history.
+    """
+    if not rows:
+        return {}
+    last_dates = {}
+    for row in rows:
+        month = rollups.month_start(row['date'])
+        last_dates[month] = max(last_dates.get(month, row['date']), row['date'])
+    opening = opening_balances(user_id, list(last_dates))
+
+    entries = []
+    for model in (Transaction, ArchivedTransaction):
+        entries.extend(
+            model.objects.filter(month_q(last_dates), user_id=user_id)
+            .values_list('date', 'created_at', 'id', 'type', 'amount')
+        )
+    entries.sort()
+
+    keys = []
+    prefix = []
+    month = balance = None
+    for txn_date, created_at, pk, txn_type, amount in entries:
+        if rollups.month_start(txn_date) != month:
+            month = rollups.month_start(txn_date)
+            balance = opening[month]
+        balance += signed(txn_type, amount)
+        keys.append((txn_date, created_at, pk))
+        prefix.append(balance)
+
+    balances = {}
+    for row in rows:
+        month = rollups.month_start(row['date'])
+        index = bisect.bisect_right(keys, (row['date'], row['created_at'], row['id'])) - 1
+        if index < 0 or rollups.month_start(keys[index][0]) != month:
+            # Nothing earlier in the month, e.g. the row was deleted meanwhile
+            balances[row['id']] = opening[month]
+        else:
+            balances[row['id']] = prefix[index]
+    return balances
\ No newline at end of file
@@ -0,0 +1,139 @@
+from decimal import Decimal
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from users.versions import bump_data_version
+from .filters import TransactionFilter
+from .models import Transaction
+from . import rollups
+
+
+MAX_IDS = 10000
+MAX_REPORTED_IDS = 20
+LOCK_CHUNK_SIZE = 2000
+
+# Changing any of these moves a transaction's amount to another rollup bucket
+BUCKET_FIELDS = {'category', 'type', 'date'}
+
+
+def selection(user, ids=None, filters=None):
+    """The user's transactions picked by an id list or by TransactionFilter parameters"""
+    queryset = Transaction.objects.filter(user=user)
+    if ids is not None:
+        return queryset.filter(id__in=ids)
+    filterset = TransactionFilter(data=filters, queryset=queryset)
+    if not filterset.is_valid():
+        raise serializers.ValidationError({'filters': filterset.errors})
+    return filterset.qs
+
+
+def lock(queryset, ids=None):
+    """
+    Lock the selected rows so the grouped deltas read next match what the
+    write changes. Only ids are streamed, never whole rows.
+
+    Requested ids that are not the user's transactions are all reported
+    from this one query.
+    """
+    found = set()
+    for pk in queryset.select_for_update().values_list('id', flat=True).iterator(chunk_size=LOCK_CHUNK_SIZE):
+        if ids is not None:
+            found.add(pk)
+    if ids is not None:
+        missing = sorted(set(ids) - found)
+        if missing:
+            shown = ', '.join(str(pk) for pk in missing[:MAX_REPORTED_IDS])
+            more = f" and {len(missing) - MAX_REPORTED_IDS} more" if len(missing) > MAX_REPORTED_IDS else ''
+            raise serializers.ValidationError({'ids': [f"Transactions not found: {shown}{more}."]})
+
+
+def moved_deltas(deltas, changes):
+    """Rollup deltas that move the grouped totals `deltas` to the buckets `changes` put them in"""
+    moved = {}
+
+    def add(key, amount, count):
+        total, total_count = moved.get(key, (Decimal('0.00'), 0))
+        moved[key] = (total + amount, total_count + count)
+
+    for (user_id, year, month, category_id, txn_type), (amount, count) in deltas.items():
+        add((user_id, year, month, category_id, txn_type), -amount, -count)
+        if 'category' in changes:
+            category_id = changes['category'].id if changes['category'] else None
+        if 'type' in changes:
+            txn_type = changes['type']
+        if 'date' in changes:
+            year, month = changes['date'].year, changes['date'].month
+        add((user_id, year, month, category_id, txn_type), amount, count)
+    return {key: delta for key, delta in moved.items() if delta != (0, 0)}
+
+
+def check_category_types(queryset, changes):
+    """
+    TransactionSerializer's category/type rule, checked for the whole
+    selection with at most one query.
+    """
+    category = changes.get('category')
+    txn_type = changes.get('type')
+    if category is not None:
+        mismatched = category.type != txn_type if txn_type else queryset.exclude(type=category.type).exists()
+    elif txn_type and 'category' not in changes:
+        mismatched = queryset.filter(category__isnull=False).exclude(category__type=txn_type).exists()
+    else:
+        mismatched = False
+    if mismatched:
+        raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: ["Category type must match transaction type"]})
+
+
+def delete_rows(queryset):
+    """
+    Delete the selected transactions with a single DELETE and no model signals.
+
+    QuerySet.delete() would load every row to send post_delete, whose
+    receivers update the rollups and data version one row at a time; the
+    callers adjust those once for the whole selection instead. This is the
+    statement delete() issues itself when nothing listens, through the
+    private QuerySet._raw_delete, so it is only called from here and
+    DeleteRowsTests pins its behaviour. Returns the number of rows deleted.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def bulk_update(user, changes, ids=None, filters=None):
+    """
+    Apply the same field changes to many transactions with a single UPDATE.
+
+    The rollups are moved once per bucket touched, from one grouped query
+    over the selection taken before the update. Returns the number of
+    transactions updated.
+    """
+    with transaction.atomic():
+        queryset = selection(user, ids, filters)
+        lock(queryset, ids)
+        check_category_types(queryset, changes)
+        deltas = rollups.grouped_deltas(queryset) if BUCKET_FIELDS & changes.keys() else {}
+        updated = queryset.update(updated_at=timezone.now(), **changes)
+        if not updated:
+            return 0
+        rollups.apply_deltas(moved_deltas(deltas, changes))
+        bump_data_version(user.id)
+    return updated
+
+
+def bulk_delete(user, ids=None, filters=None):
+    """
+    Delete many transactions with a single DELETE.
+
+    The rollups are reduced once per bucket, from one grouped query over
+    the selection. Returns the number of transactions deleted.
+    """
+    with transaction.atomic():
+        queryset = selection(user, ids, filters)
+        lock(queryset, ids)
+        deltas = rollups.grouped_deltas(queryset)
+        deleted = delete_rows(queryset)
+        if not deleted:
+            return 0
+        rollups.apply_deltas(deltas, sign=-1)
+        bump_data_version(user.id)
+    return deleted
\ No newline at end of file
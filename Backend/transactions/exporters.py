@@ -0,0 +1,57 @@
+import csv
+import json
+from django.utils import timezone
+
+
+CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = [
+    'id', 'date', 'type', 'amount', 'category', 'category__name',
+    'description', 'created_at', 'updated_at'
+]
+
+EXPORT_HEADER = [
+    'id', 'date', 'type', 'amount', 'category', 'category_name',
+    'description', 'created_at', 'updated_at'
+]
+
+
+def export_rows(queryset):
+    """
+    Yield plain tuples for every transaction in the queryset.
+
+    Uses values_list with a chunked iterator (a server-side cursor on
+    PostgreSQL), so no model instances are built and memory stays flat.
+    """
+    for row in queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=CHUNK_SIZE):
+        pk, date, txn_type, amount, category, category_name, description, created_at, updated_at = row
+        yield (
+            pk,
+            date.isoformat(),
+            txn_type,
+            str(amount),
+            category,
+            category_name,
+            description,
+            timezone.localtime(created_at).isoformat(),
+            timezone.localtime(updated_at).isoformat(),
+        )
+
+
+class _Echo:
+    """File-like object whose write() hands the line straight back to csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def csv_stream(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_stream(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_HEADER, row))) + '\n'
\ No newline at end of file
@@ -1,5 +1,5 @@
 import django_filters
-from .models import Transaction
+from .models import Transaction, ArchivedTransaction
 
 
 class TransactionFilter(django_filters.FilterSet):
@@ -10,4 +10,9 @@ class TransactionFilter(django_filters.FilterSet):
     
     class Meta:
         model = Transaction
-        fields = ['type', 'category', 'date']
\ No newline at end of file
+        fields = ['type', 'category', 'date']
+
+
+class ArchivedTransactionFilter(TransactionFilter):
+    class Meta(TransactionFilter.Meta):
+        model = ArchivedTransaction
\ No newline at end of file
@@ -0,0 +1,198 @@
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from django.db import transaction
+from rest_framework import serializers
+from categories.models import Category
+from users.versions import bump_data_version
+from .models import Transaction
+from . import rollups
+
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+FORMATS = ['csv', 'ndjson']
+
+TYPES = {choice for choice, _ in Transaction.TYPE_CHOICES}
+MIN_AMOUNT = Decimal('0.01')
+MAX_AMOUNT = Decimal('1e10')
+
+
+def detect_format(upload, requested=None):
+    """Pick the file format from an explicit value or the upload's file name"""
+    if requested:
+        return requested if requested in FORMATS else None
+    name = (upload.name or '').lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    return None
+
+
+def read_rows(upload, file_format):
+    """
+    Yield (line number, row dict) from the upload without reading it all into memory.
+
+    Raises ValidationError for files that are not UTF-8 text or not CSV.
+    """
+    stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    try:
+        if file_format == 'csv':
+            reader = csv.DictReader(stream)
+            try:
+                for row in reader:
+                    yield reader.line_num, row
+            except csv.Error as exc:
+                raise serializers.ValidationError({'file': [f"After line {reader.line_num}: {exc}"]})
+            return
+
+        for line_num, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield line_num, {'non_field_errors': ['Invalid JSON']}
+                continue
+            if not isinstance(row, dict):
+                yield line_num, {'non_field_errors': ['Each line must be a JSON object']}
+                continue
+            yield line_num, row
+    except UnicodeDecodeError:
+        # Decoding runs ahead of the rows, so the file is rejected as a whole
+        raise serializers.ValidationError({'file': ["The file is not valid UTF-8 text."]})
+
+
+class CategoryResolver:
+    """Resolve categories by id or name from one prefetched set of the user's categories"""
+
+    def __init__(self, user):
+        self.by_id = {}
+        self.by_name = {}
+        for category in Category.objects.filter(user=user).only('id', 'name', 'type'):
+            self.by_id[category.id] = category
+            self.by_name[(category.name.lower(), category.type)] = category
+
+    def resolve(self, value, txn_type):
+        if value in (None, ''):
+            return None
+        if isinstance(value, int) or (isinstance(value, str) and value.strip().isdigit()):
+            category = self.by_id.get(int(value))
+            if category:
+                return category
+        if isinstance(value, str):
+            category = self.by_name.get((value.strip().lower(), txn_type))
+            if category:
+                return category
+        raise serializers.ValidationError(f'Unknown category "{value}"')
+
+
+def parse_type(value):
+    # JSON lines can carry lists or objects, which are unhashable
+    if not isinstance(value, str) or value not in TYPES:
+        raise serializers.ValidationError(f'"{value}" is not a valid choice.')
+    return value
+
+
+def parse_amount(value):
+    # Mirrors the Transaction.amount field: max_digits=12, decimal_places=2, >= 0.01
+    try:
+        amount = Decimal(str(value).strip())
+    except (InvalidOperation, ValueError):
+        raise serializers.ValidationError("A valid number is required.")
+    if not amount.is_finite():
+        raise serializers.ValidationError("A valid number is required.")
+    if amount.as_tuple().exponent < -2:
+        raise serializers.ValidationError("Ensure that there are no more than 2 decimal places.")
+    if amount < MIN_AMOUNT:
+        raise serializers.ValidationError("Ensure this value is greater than or equal to 0.01.")
+    if amount >= MAX_AMOUNT:
+        raise serializers.ValidationError("Ensure that there are no more than 12 digits in total.")
+    return amount
+
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(str(value).strip())
+    except ValueError:
+        raise serializers.ValidationError("Date has wrong format. Use YYYY-MM-DD.")
+
+
+def build_transaction(user, resolver, row):
+    """Validate one input row and return an unsaved Transaction"""
+    if 'non_field_errors' in row:
+        raise serializers.ValidationError(row)
+
+    errors = {}
+    values = {'description': str(row.get('description') or '')}
+    for name, parse in (('type', parse_type), ('amount', parse_amount), ('date', parse_date)):
+        value = row.get(name)
+        if value in (None, ''):
+            errors[name] = ["This field is required."]
+            continue
+        try:
+            values[name] = parse(value)
+        except serializers.ValidationError as exc:
+            errors[name] = exc.detail
+
+    if 'type' in values:
+        try:
+            values['category'] = resolver.resolve(row.get('category'), values['type'])
+        except serializers.ValidationError as exc:
+            errors['category'] = exc.detail
+        else:
+            # Same rule as TransactionSerializer.validate
+            if values['category'] and values['category'].type != values['type']:
+                errors['non_field_errors'] = ["Category type must match transaction type"]
+
+    if errors:
+        raise serializers.ValidationError(errors)
+    return Transaction(user=user, **values)
+
+
+def import_transactions(user, rows):
+    """
+    Validate and insert transactions in batches.
+
+    Invalid rows are reported and skipped; valid ones are written with
+    bulk_create inside a single database transaction, and the monthly
+    rollups are updated once per bucket at the end.
+    """
+    resolver = CategoryResolver(user)
+    created = 0
+    failed = 0
+    errors = []
+    deltas = {}
+    batch = []
+
+    with transaction.atomic():
+        for line_num, row in rows:
+            try:
+                batch.append(build_transaction(user, resolver, row))
+            except serializers.ValidationError as exc:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({'row': line_num, 'errors': exc.detail})
+                continue
+
+            if len(batch) >= BATCH_SIZE:
+                Transaction.objects.bulk_create(batch)
+                rollups.collect_deltas(batch, deltas)
+                created += len(batch)
+                batch = []
+
+        Transaction.objects.bulk_create(batch)
+        rollups.collect_deltas(batch, deltas)
+        created += len(batch)
+        rollups.apply_deltas(deltas)
+        bump_data_version(user.id)
+
+    return {
+        'created': created,
+        'failed': failed,
+        'errors': errors,
+    }
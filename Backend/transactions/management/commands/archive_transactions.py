@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from transactions import archive
+
+
+class Command(BaseCommand):
+    help = "Move transactions older than the live window into the archived transactions table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-months', type=int, default=settings.TRANSACTION_ARCHIVE_KEEP_MONTHS,
+            help='Full months to keep live before the current one (default: TRANSACTION_ARCHIVE_KEEP_MONTHS)'
+        )
+        parser.add_argument(
+            '--user', type=int, action='append', dest='users',
+            help='Limit to the given user id (repeatable)'
+        )
+        parser.add_argument('--batch-size', type=int, default=archive.BATCH_SIZE, help='Rows moved per database transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be archived without moving anything')
+
+    def handle(self, *args, **options):
+        if options['keep_months'] < archive.MIN_KEEP_MONTHS:
+            raise CommandError(f"--keep-months must be at least {archive.MIN_KEEP_MONTHS}")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        cutoff = archive.archive_cutoff(options['keep_months'])
+        pending = (
+            archive.archivable(cutoff, options['users'])
+            .values_list('user_id').annotate(count=Count('id')).order_by('user_id')
+        )
+        self.stdout.write(f" Archiving transactions dated before {cutoff}...")
+
+        total = 0
+        for user_id, count in pending:
+            if options['dry_run']:
+                moved = count
+            else:
+                moved = archive.archive_user(user_id, cutoff, options['batch_size'])
+            total += moved
+            self.stdout.write(f"  user={user_id}: {moved}")
+
+        verb = "Would archive" if options['dry_run'] else "Archived"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {total} transactions"))
\ No newline at end of file
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from transactions import recurring
+
+
+class Command(BaseCommand):
+    help = "Post every due occurrence of the active recurring transaction schedules"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Post occurrences due up to this date, YYYY-MM-DD (default: today)')
+        parser.add_argument(
+            '--user', type=int, action='append', dest='users',
+            help='Limit to the given user id (repeatable)'
+        )
+        parser.add_argument('--batch-size', type=int, default=recurring.BATCH_SIZE, help='Schedules posted per database transaction')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive")
+        today = timezone.now().date()
+        if options['date']:
+            try:
+                today = parse_date(options['date'])
+            except ValueError:
+                today = None
+            if today is None:
+                raise CommandError("--date must be YYYY-MM-DD")
+
+        self.stdout.write(f" Posting recurring transactions due by {today}...")
+        schedules, created = recurring.materialize(today, options['users'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Posted {created} transactions from {schedules} schedules"))
\ No newline at end of file
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from transactions import rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild monthly transaction rollups from raw transactions and verify them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', type=int, action='append', dest='users',
+            help='Limit to the given user id (repeatable)'
+        )
+        parser.add_argument(
+            '--verify-only', action='store_true',
+            help='Compare rollups against raw transactions without rebuilding'
+        )
+
+    def handle(self, *args, **options):
+        users = options['users']
+
+        if not options['verify_only']:
+            self.stdout.write(" Rebuilding rollups...")
+            created = rollups.rebuild(users)
+            self.stdout.write(self.style.SUCCESS(f"Created {created} rollup rows"))
+
+        mismatches = rollups.verify(users)
+        for key, expected, actual in mismatches:
+            self.stdout.write(self.style.WARNING(
+                f"user={key[0]} category={key[1]} type={key[2]} {key[4]}/{key[3]}: "
+                f"expected {expected}, found {actual}"
+            ))
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} rollup rows do not match raw transactions")
+        self.stdout.write(self.style.SUCCESS("Rollups match raw transactions"))
@@ -0,0 +1,74 @@
+from django.db import migrations
+
+
+# A copy of the schema in transactions.search as it was when this migration
+# was written, so later changes to that module cannot change this migration.
+SQLITE_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts
+    USING fts5(description, content='transactions', content_rowid='id')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF description ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+        INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS transactions_fts_ai",
+    "DROP TRIGGER IF EXISTS transactions_fts_ad",
+    "DROP TRIGGER IF EXISTS transactions_fts_au",
+    "DROP TABLE IF EXISTS transactions_fts",
+]
+
+POSTGRES_SCHEMA = [
+    """
+    ALTER TABLE transactions ADD COLUMN IF NOT EXISTS description_search tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', coalesce(description, ''))) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS transactions_description_search_idx
+    ON transactions USING GIN (description_search)
+    """,
+]
+
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS transactions_description_search_idx",
+    "ALTER TABLE transactions DROP COLUMN IF EXISTS description_search",
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0003_transaction_keyset_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_SCHEMA, 'postgresql': POSTGRES_SCHEMA}),
+            run({'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP}),
+        ),
+    ]
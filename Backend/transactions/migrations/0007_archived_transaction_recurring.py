@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-17 20:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        ('transactions', '0006_recurring_transaction'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedtransaction',
+            name='occurrence',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedtransaction',
+            name='recurring',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_transactions', to='transactions.recurringtransaction'),
+        ),
+        migrations.AddConstraint(
+            model_name='archivedtransaction',
+            constraint=models.UniqueConstraint(fields=('recurring', 'occurrence'), name='unique_archived_recurring_occurrence'),
+        ),
+    ]
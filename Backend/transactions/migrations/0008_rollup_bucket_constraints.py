@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-17 20:29
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum, Count
+
+
+def merge_uncategorized(apps, schema_editor):
+    MonthlyRollup = apps.get_model('transactions', 'MonthlyRollup')
+    rows = MonthlyRollup.objects.filter(category__isnull=True)
+    duplicates = (
+        rows.values('user', 'year', 'month', 'type')
+        .annotate(total_sum=Sum('total'), count_sum=Sum('count'), rows=Count('id'))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for bucket in list(duplicates):
+        rows.filter(user_id=bucket['user'], year=bucket['year'], month=bucket['month'], type=bucket['type']).delete()
+        MonthlyRollup.objects.create(
+            user_id=bucket['user'],
+            year=bucket['year'],
+            month=bucket['month'],
+            type=bucket['type'],
+            total=bucket['total_sum'],
+            count=bucket['count_sum'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        ('transactions', '0007_archived_transaction_recurring'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_uncategorized, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='monthlyrollup',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', False)), fields=('user', 'year', 'month', 'category', 'type'), name='unique_rollup_bucket'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('user', 'year', 'month', 'type'), name='unique_uncategorized_rollup_bucket'),
+        ),
+    ]
@@ -34,14 +34,187 @@ class Transaction(models.Model):
     date = models.DateField(db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set on transactions posted from a schedule; together they identify the occurrence
+    recurring = models.ForeignKey(
+        'RecurringTransaction',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='transactions'
+    )
+    occurrence = models.DateField(null=True, blank=True)
 
     class Meta:
         db_table = 'transactions'
-        ordering = ['-date', '-created_at']
+        ordering = ['-date', '-created_at', 'id']
         indexes = [
             models.Index(fields=['user', 'date']),
             models.Index(fields=['user', 'type']),
+            models.Index(fields=['user', '-date', '-created_at', 'id']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['recurring', 'occurrence'], name='unique_recurring_occurrence'),
+        ]
+
+    def __str__(self):
+        return f"{self.type} - {self.amount} on {self.date}"
+
+
+class MonthlyRollup(models.Model):
+    """
+    Per-user monthly totals by category and type.
+
+    Maintained incrementally from Transaction signals so that summaries and
+    budget reports don't have to re-scan the raw transactions table.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='monthly_rollups'
+    )
+    category = models.ForeignKey(
+        'categories.Category',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='monthly_rollups'
+    )
+    year = models.IntegerField()
+    month = models.IntegerField()
+    type = models.CharField(max_length=10, choices=Transaction.TYPE_CHOICES)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'monthly_rollups'
+        ordering = ['-year', '-month']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'year', 'month', 'category', 'type'],
+                condition=models.Q(category__isnull=False),
+                name='unique_rollup_bucket',
+            ),
+            # A plain unique index treats NULLs as distinct, so uncategorized buckets need their own
+            models.UniqueConstraint(
+                fields=['user', 'year', 'month', 'type'],
+                condition=models.Q(category__isnull=True),
+                name='unique_uncategorized_rollup_bucket',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'year', 'month']),
+        ]
+
+    def __str__(self):
+        return f"{self.type} - {self.total} ({self.count}) for {self.month}/{self.year}"
+
+
+class ArchivedTransaction(models.Model):
+    """
+    A transaction moved out of the live table by `manage.py archive_transactions`.
+
+    Keeps its original id and timestamps. Its amount stays in MonthlyRollup,
+    so reports over archived months are unchanged; the raw rows are only
+    read for partial-month report edges and the archive API.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_transactions'
+    )
+    category = models.ForeignKey(
+        'categories.Category',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='archived_transactions'
+    )
+    type = models.CharField(max_length=10, choices=Transaction.TYPE_CHOICES)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    description = models.TextField(blank=True)
+    date = models.DateField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    # Kept so an archived occurrence is never posted again (see transactions.recurring)
+    recurring = models.ForeignKey(
+        'RecurringTransaction',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_transactions'
+    )
+    occurrence = models.DateField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'archived_transactions'
+        ordering = ['-date', '-created_at', 'id']
+        indexes = [
+            models.Index(fields=['user', '-date', '-created_at', 'id']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['recurring', 'occurrence'], name='unique_archived_recurring_occurrence'),
+        ]
+
+    def __str__(self):
+        return f"{self.type} - {self.amount} on {self.date} (archived)"
+
+
+class RecurringTransaction(models.Model):
+    """
+    A schedule that posts the same transaction repeatedly: monthly on a day
+    of the month, weekly, or every N days, optionally until an end date.
+
+    `next_date` is the first occurrence not yet posted (None once the
+    schedule has ended); `manage.py materialize_recurring` posts everything
+    due up to today.
+    """
+    MONTHLY = 'MONTHLY'
+    WEEKLY = 'WEEKLY'
+    DAILY = 'DAILY'
+
+    FREQUENCY_CHOICES = [
+        (MONTHLY, 'Monthly'),
+        (WEEKLY, 'Weekly'),
+        (DAILY, 'Daily'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='recurring_transactions'
+    )
+    category = models.ForeignKey(
+        'categories.Category',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='recurring_transactions'
+    )
+    type = models.CharField(max_length=10, choices=Transaction.TYPE_CHOICES)
+    amount = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        validators=[MinValueValidator(Decimal('0.01'))]
+    )
+    description = models.TextField(blank=True)
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES)
+    # Every `interval` months, weeks or days
+    interval = models.PositiveSmallIntegerField(default=1, validators=[MinValueValidator(1)])
+    # Monthly only; clamped to the last day of shorter months
+    day_of_month = models.PositiveSmallIntegerField(null=True, blank=True)
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True)
+    next_date = models.DateField(null=True, blank=True)
+    active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'recurring_transactions'
+        ordering = ['next_date', 'id']
+        indexes = [
+            models.Index(fields=['active', 'next_date']),
+            models.Index(fields=['user', 'next_date']),
         ]
 
     def __str__(self):
-        return f"{self.type} - {self.amount} on {self.date}"
\ No newline at end of file
+        return f"{self.type} - {self.amount} {self.get_frequency_display().lower()}"
\ No newline at end of file
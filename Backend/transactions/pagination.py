@@ -0,0 +1,139 @@
+import base64
+import json
+from datetime import date, datetime
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class TransactionPagination(PageNumberPagination):
+    """
+    Page-number pagination with two opt-ins for long histories.
+
+    ?pagination=cursor switches to keyset pagination on the default ordering
+    (-date, -created_at, id). Each page is a range scan on the composite index,
+    so fetch time does not grow with depth, and no COUNT(*) is run.
+
+    ?count=false keeps page numbers but skips the COUNT(*) query; the next
+    link is detected by fetching one extra row.
+    """
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    ordering = ('-date', '-created_at', 'id')
+    reverse_ordering = ('date', 'created_at', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.mode = 'page'
+        if request.query_params.get(self.mode_query_param) == 'cursor':
+            self.mode = 'cursor'
+            return self.paginate_keyset(queryset, request)
+        if request.query_params.get(self.count_query_param, '').lower() in ('false', '0'):
+            self.mode = 'uncounted'
+            return self.paginate_uncounted(queryset, request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.mode == 'page':
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.next_link,
+            'previous': self.previous_link,
+            'results': data,
+        })
+
+    # Page numbers without COUNT(*)
+
+    def paginate_uncounted(self, queryset, request):
+        page_size = self.get_page_size(request)
+        try:
+            page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            page_number = 0
+        if page_number < 1:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message='Invalid page.'))
+
+        offset = (page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        url = request.build_absolute_uri()
+
+        self.next_link = None
+        if len(rows) > page_size:
+            self.next_link = replace_query_param(url, self.page_query_param, page_number + 1)
+        self.previous_link = None
+        if page_number == 2:
+            self.previous_link = remove_query_param(url, self.page_query_param)
+        elif page_number > 2:
+            self.previous_link = replace_query_param(url, self.page_query_param, page_number - 1)
+        return rows[:page_size]
+
+    # Keyset pagination
+
+    def paginate_keyset(self, queryset, request):
+        if request.query_params.get('ordering'):
+            raise ValidationError({'ordering': "Custom ordering is not supported with cursor pagination."})
+
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*(self.reverse_ordering if reverse else self.ordering))
+        if position:
+            queryset = queryset.filter(self.beyond(position, reverse))
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        has_next = position is not None if reverse else has_more
+        has_previous = has_more if reverse else position is not None
+        url = request.build_absolute_uri()
+
+        self.next_link = None
+        if has_next and rows:
+            self.next_link = replace_query_param(url, self.cursor_query_param, self.encode_cursor(rows[-1], False))
+        self.previous_link = None
+        if has_previous and rows:
+            self.previous_link = replace_query_param(url, self.cursor_query_param, self.encode_cursor(rows[0], True))
+        return rows
+
+    def beyond(self, position, reverse):
+        """Rows strictly after `position` in the (possibly reversed) ordering"""
+        txn_date, created_at, pk = position
+        if reverse:
+            return (
+                Q(date__gt=txn_date) |
+                Q(date=txn_date, created_at__gt=created_at) |
+                Q(date=txn_date, created_at=created_at, id__lt=pk)
+            )
+        return (
+            Q(date__lt=txn_date) |
+            Q(date=txn_date, created_at__lt=created_at) |
+            Q(date=txn_date, created_at=created_at, id__gt=pk)
+        )
+
+    def encode_cursor(self, row, reverse):
+        # Rows may be model instances or .values() dicts
+        if isinstance(row, dict):
+            txn_date, created_at, pk = row['date'], row['created_at'], row['id']
+        else:
+            txn_date, created_at, pk = row.date, row.created_at, row.pk
+        payload = [txn_date.isoformat(), created_at.isoformat(), pk, int(reverse)]
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            txn_date, created_at, pk, reverse = json.loads(base64.urlsafe_b64decode(token.encode()))
+            position = (date.fromisoformat(txn_date), datetime.fromisoformat(created_at), int(pk))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(reverse)
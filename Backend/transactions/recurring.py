@@ -0,0 +1,161 @@
+import calendar
+from datetime import date, timedelta
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from users.versions import bump_data_version
+from .models import Transaction, ArchivedTransaction, RecurringTransaction
+from . import rollups
+
+
+BATCH_SIZE = 1000
+# Occurrences posted per schedule per batch; a schedule with more catching up
+# to do stays due and is picked up again by the next batch
+MAX_OCCURRENCES = 400
+
+
+def month_day(index, day):
+    """`day` of the month with index year * 12 + month - 1, clamped to the month's length"""
+    year, month = divmod(index, 12)
+    return date(year, month + 1, min(day, calendar.monthrange(year, month + 1)[1]))
+
+
+def month_index(value):
+    return value.year * 12 + value.month - 1
+
+
+def step_days(schedule):
+    return schedule.interval * (7 if schedule.frequency == RecurringTransaction.WEEKLY else 1)
+
+
+def first_occurrence(schedule, on_or_after):
+    """The schedule's first occurrence on or after `on_or_after` (and its start date)"""
+    on_or_after = max(on_or_after, schedule.start_date)
+    if schedule.frequency == RecurringTransaction.MONTHLY:
+        start = month_index(schedule.start_date)
+        day = schedule.day_of_month or schedule.start_date.day
+        periods = -(-max(month_index(on_or_after) - start, 0) // schedule.interval)
+        while True:
+            occurrence = month_day(start + periods * schedule.interval, day)
+            if occurrence >= on_or_after:
+                return occurrence
+            periods += 1
+
+    step = step_days(schedule)
+    periods = -(-(on_or_after - schedule.start_date).days // step)
+    return schedule.start_date + timedelta(days=periods * step)
+
+
+def next_occurrence(schedule, occurrence):
+    """The occurrence following `occurrence`"""
+    if schedule.frequency == RecurringTransaction.MONTHLY:
+        day = schedule.day_of_month or schedule.start_date.day
+        return month_day(month_index(occurrence) + schedule.interval, day)
+    return occurrence + timedelta(days=step_days(schedule))
+
+
+def reschedule(schedule):
+    """
+    Set next_date from the schedule's rule after it is created or edited.
+
+    Dates already posted are never reposted: the next occurrence is after
+    the last one materialized from this schedule, archived or not.
+    """
+    on_or_after = schedule.start_date
+    if schedule.pk:
+        for model in (Transaction, ArchivedTransaction):
+            last = model.objects.filter(recurring=schedule).aggregate(last=Max('occurrence'))['last']
+            if last:
+                on_or_after = max(on_or_after, last + timedelta(days=1))
+    occurrence = first_occurrence(schedule, on_or_after)
+    if schedule.end_date and occurrence > schedule.end_date:
+        occurrence = None
+    schedule.next_date = occurrence
+
+
+def due(today=None, user_ids=None):
+    schedules = RecurringTransaction.objects.filter(active=True, next_date__lte=today or timezone.now().date())
+    if user_ids:
+        schedules = schedules.filter(user_id__in=user_ids)
+    return schedules
+
+
+def occurrences(schedule, today):
+    """Due occurrence dates from next_date, up to MAX_OCCURRENCES; advances next_date past them"""
+    dates = []
+    occurrence = schedule.next_date
+    while occurrence <= today and len(dates) < MAX_OCCURRENCES:
+        if schedule.end_date and occurrence > schedule.end_date:
+            break
+        dates.append(occurrence)
+        occurrence = next_occurrence(schedule, occurrence)
+    if schedule.end_date and occurrence > schedule.end_date:
+        occurrence = None
+    schedule.next_date = occurrence
+    return dates
+
+
+def materialize_batch(today, user_ids=None, batch_size=BATCH_SIZE):
+    """
+    Post the due occurrences of up to `batch_size` schedules in one database
+    transaction. Returns (schedules, transactions created).
+
+    Occurrences already posted (the unique recurring/occurrence key), live
+    or archived, are skipped, so an interrupted or overlapping run never
+    double-posts.
+    """
+    with transaction.atomic():
+        schedules = list(
+            due(today, user_ids).select_for_update(skip_locked=True)
+            .order_by('next_date', 'id')[:batch_size]
+        )
+        if not schedules:
+            return 0, 0
+
+        first = min(schedule.next_date for schedule in schedules)
+        pending = [(schedule, occurrences(schedule, today)) for schedule in schedules]
+        posted = set()
+        for model in (Transaction, ArchivedTransaction):
+            posted.update(
+                model.objects.filter(recurring__in=schedules, occurrence__gte=first)
+                .values_list('recurring_id', 'occurrence')
+            )
+        created = [
+            Transaction(
+                user_id=schedule.user_id,
+                category_id=schedule.category_id,
+                type=schedule.type,
+                amount=schedule.amount,
+                description=schedule.description,
+                date=occurrence,
+                recurring=schedule,
+                occurrence=occurrence,
+            )
+            for schedule, dates in pending
+            for occurrence in dates
+            if (schedule.id, occurrence) not in posted
+        ]
+
+        Transaction.objects.bulk_create(created, batch_size=rollups.BATCH_SIZE)
+        rollups.apply_transactions(created)
+        # Schedules due together mostly advance together: one UPDATE per new date
+        advanced = {}
+        for schedule in schedules:
+            advanced.setdefault(schedule.next_date, []).append(schedule.id)
+        for next_date, ids in advanced.items():
+            RecurringTransaction.objects.filter(id__in=ids).update(next_date=next_date)
+        for user_id in {txn.user_id for txn in created}:
+            bump_data_version(user_id)
+    return len(schedules), len(created)
+
+
+def materialize(today=None, user_ids=None, batch_size=BATCH_SIZE):
+    """Post every due occurrence up to `today`, batch by batch. Returns (schedules, transactions created)."""
+    today = today or timezone.now().date()
+    schedules = created = 0
+    while True:
+        batch_schedules, batch_created = materialize_batch(today, user_ids, batch_size)
+        if not batch_schedules:
+            return schedules, created
+        schedules += batch_schedules
+        created += batch_created
\ No newline at end of file
@@ -0,0 +1,331 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import Sum, Count, F, Q
+from django.db.models.functions import ExtractYear, ExtractMonth, TruncDay, TruncWeek, TruncMonth
+from users.versions import bump_data_version
+from .models import Transaction, ArchivedTransaction, MonthlyRollup
+
+
+BATCH_SIZE = 1000
+
+PERIOD_FUNCTIONS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+def month_start(value):
+    return value.replace(day=1)
+
+
+def next_month(value):
+    """First day of the month following the one `value` falls in"""
+    return (value.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def months_before(value, months):
+    """First day of the month `months` before the one `value` falls in"""
+    index = value.year * 12 + value.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def period_q(start, end):
+    """Rollup filter for whole months in the half-open range [start, end)"""
+    return (
+        (Q(year__gt=start.year) | Q(year=start.year, month__gte=start.month)) &
+        (Q(year__lt=end.year) | Q(year=end.year, month__lt=end.month))
+    )
+
+
+def grouped_transactions(queryset):
+    """Group a transaction queryset by the rollup key"""
+    return queryset.values(
+        'user', 'category', 'type',
+        year=ExtractYear('date'),
+        month=ExtractMonth('date'),
+    ).annotate(total=Sum('amount'), count=Count('id')).order_by()
+
+
+def apply_delta(user_id, date, category_id, txn_type, amount, count):
+    """Add `amount`/`count` to the rollup bucket a transaction falls into"""
+    rows = MonthlyRollup.objects.filter(
+        user_id=user_id,
+        year=date.year,
+        month=date.month,
+        category_id=category_id,
+        type=txn_type
+    )
+    if rows.update(total=F('total') + amount, count=F('count') + count):
+        return
+    if count <= 0:
+        # Nothing to subtract from; the rebuild command will repair any drift
+        return
+    try:
+        with transaction.atomic():
+            MonthlyRollup.objects.create(
+                user_id=user_id,
+                year=date.year,
+                month=date.month,
+                category_id=category_id,
+                type=txn_type,
+                total=amount,
+                count=count
+            )
+    except IntegrityError:
+        # Another request created the bucket first
+        rows.update(total=F('total') + amount, count=F('count') + count)
+
+
+def collect_deltas(transactions, deltas=None):
+    """Sum transaction amounts and counts per rollup bucket"""
+    deltas = {} if deltas is None else deltas
+    for txn in transactions:
+        key = (txn.user_id, txn.date.year, txn.date.month, txn.category_id, txn.type)
+        amount, count = deltas.get(key, (Decimal('0.00'), 0))
+        deltas[key] = (amount + txn.amount, count + 1)
+    return deltas
+
+
+def grouped_deltas(queryset):
+    """collect_deltas computed in the database: one grouped query however many rows are selected"""
+    return {
+        (row['user'], row['year'], row['month'], row['category'], row['type']): (
+            # SQLite sums decimals as floats
+            Decimal(row['total']).quantize(Decimal('0.01')), row['count']
+        )
+        for row in grouped_transactions(queryset)
+    }
+
+
+def apply_deltas(deltas, sign=1):
+    """
+    Apply bucketed deltas from collect_deltas, e.g. after bulk_create.
+
+    Costs one update per bucket touched rather than one per transaction.
+    Use sign=-1 for removals.
+    """
+    for (user_id, year, month, category_id, txn_type), (amount, count) in deltas.items():
+        apply_delta(user_id, date(year, month, 1), category_id, txn_type, sign * amount, sign * count)
+
+
+def apply_transactions(transactions, sign=1):
+    """Apply many transactions to the rollups at once"""
+    apply_deltas(collect_deltas(transactions), sign)
+
+
+def uncategorize(category):
+    """
+    Move a category's rollups into the uncategorized buckets.
+
+    Runs before the category is deleted; otherwise SET_NULL would turn them
+    into second uncategorized rows for the same month and type.
+    """
+    rows = MonthlyRollup.objects.filter(category=category)
+    with transaction.atomic():
+        for row in rows.values('user', 'year', 'month', 'type', 'total', 'count'):
+            apply_delta(row['user'], date(row['year'], row['month'], 1), None, row['type'], row['total'], row['count'])
+        rows.delete()
+
+
+def grouped_archive(user_ids=None):
+    """Archived transactions grouped by the rollup key, as {key: (total, count)}"""
+    archived = ArchivedTransaction.objects.all()
+    if user_ids:
+        archived = archived.filter(user_id__in=user_ids)
+    return {
+        (row['user'], row['category'], row['type'], row['year'], row['month']): (row['total'], row['count'])
+        for row in grouped_transactions(archived).iterator(chunk_size=BATCH_SIZE)
+    }
+
+
+def rebuild(user_ids=None):
+    """
+    Recompute rollups from the raw transactions and archived transactions tables.
+
+    Bumps the data version of every user whose rollups were replaced, so
+    cached summaries and reports are revalidated.
+    """
+    transactions = Transaction.objects.all()
+    rollups = MonthlyRollup.objects.all()
+    if user_ids:
+        transactions = transactions.filter(user_id__in=user_ids)
+        rollups = rollups.filter(user_id__in=user_ids)
+
+    created = 0
+    with transaction.atomic():
+        touched = set(user_ids or rollups.values_list('user_id', flat=True).distinct())
+        rollups.delete()
+        archived = grouped_archive(user_ids)
+        batch = []
+        for row in grouped_transactions(transactions).iterator(chunk_size=BATCH_SIZE):
+            key = (row['user'], row['category'], row['type'], row['year'], row['month'])
+            if key in archived:
+                # A live transaction dated in an archived month
+                total, count = archived.pop(key)
+                row['total'] += total
+                row['count'] += count
+            touched.add(row['user'])
+            batch.append(MonthlyRollup(
+                user_id=row['user'],
+                category_id=row['category'],
+                type=row['type'],
+                year=row['year'],
+                month=row['month'],
+                total=row['total'],
+                count=row['count']
+            ))
+            if len(batch) >= BATCH_SIZE:
+                MonthlyRollup.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        for (user_id, category_id, txn_type, year, month), (total, count) in archived.items():
+            touched.add(user_id)
+            batch.append(MonthlyRollup(
+                user_id=user_id,
+                category_id=category_id,
+                type=txn_type,
+                year=year,
+                month=month,
+                total=total,
+                count=count
+            ))
+        MonthlyRollup.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+        created += len(batch)
+        for user_id in touched:
+            bump_data_version(user_id)
+    return created
+
+
+def verify(user_ids=None):
+    """Return a list of (key, expected, actual) tuples where rollups disagree with raw and archived data"""
+    transactions = Transaction.objects.all()
+    rollups = MonthlyRollup.objects.filter(count__gt=0)
+    if user_ids:
+        transactions = transactions.filter(user_id__in=user_ids)
+        rollups = rollups.filter(user_id__in=user_ids)
+
+    key_fields = ('user', 'category', 'type', 'year', 'month')
+    expected = grouped_archive(user_ids)
+    for row in grouped_transactions(transactions):
+        key = tuple(row[f] for f in key_fields)
+        total, count = expected.get(key, (0, 0))
+        expected[key] = (row['total'] + total, row['count'] + count)
+    actual = {
+        tuple(row[f] for f in key_fields): (row['total'], row['count'])
+        for row in rollups.values(*key_fields).annotate(
+            total=Sum('total'), count=Sum('count')
+        ).order_by()
+    }
+
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys(), key=str):
+        if expected.get(key) != actual.get(key):
+            mismatches.append((key, expected.get(key), actual.get(key)))
+    return mismatches
+
+
+def period_querysets(user, start_date, end_date, group_by='month', by_category=True):
+    """
+    The grouped queries behind period_totals: (rollup rows, raw rows, archived rows).
+
+    For monthly periods, whole months inside the range are read from the rollup
+    table and only the partial months at either edge touch raw transactions.
+    Daily and weekly periods come from a single grouped scan of the range.
+    Raw rows are read from both the live and the archived transactions.
+    """
+    full_start = start_date if start_date.day == 1 else next_month(start_date)
+    full_end = month_start(end_date + timedelta(days=1))
+
+    rolled = MonthlyRollup.objects.none()
+    if group_by == 'month' and full_start < full_end:
+        raw_q = (
+            Q(date__gte=start_date, date__lt=full_start) |
+            Q(date__gte=full_end, date__lte=end_date)
+        )
+        rolled = MonthlyRollup.objects.filter(user=user, count__gt=0).filter(
+            period_q(full_start, full_end)
+        )
+    else:
+        raw_q = Q(date__gte=start_date, date__lte=end_date)
+
+    keys = ['category__name', 'type'] if by_category else ['type']
+    rolled = rolled.values(*keys, 'year', 'month').annotate(total=Sum('total'), count=Sum('count')).order_by()
+
+    def raw(model):
+        return model.objects.filter(raw_q, user=user).values(*keys, period=PERIOD_FUNCTIONS[group_by]('date')).annotate(
+            total=Sum('amount'), count=Count('id')
+        ).order_by()
+
+    return rolled, raw(Transaction), raw(ArchivedTransaction)
+
+
+def combine_period_rows(rolled_rows, *raw_rows):
+    rows = []
+    for row in rolled_rows:
+        row['period'] = date(row.pop('year'), row.pop('month'), 1)
+        rows.append(row)
+    for source in raw_rows:
+        rows.extend(source)
+    return rows
+
+
+def period_totals(user, start_date, end_date, group_by='month', by_category=True):
+    """
+    Totals and counts by category, type and period for the inclusive date range.
+
+    With by_category=False rows are grouped by type and period only and carry
+    no category__name.
+    """
+    return combine_period_rows(*period_querysets(user, start_date, end_date, group_by, by_category))
+
+
+def category_spend(user, year, month):
+    """Expense total per category for one month, as (category, total) rows"""
+    return MonthlyRollup.objects.filter(
+        user=user,
+        type='EXPENSE',
+        year=year,
+        month=month
+    ).values('category').annotate(total=Sum('total')).order_by()
+
+
+def monthly_category_spend(user, start, end):
+    """Expense total per month and category for the months in [start, end), as (year, month, category, total) rows"""
+    return MonthlyRollup.objects.filter(
+        period_q(start, end),
+        user=user,
+        type='EXPENSE'
+    ).values('year', 'month', 'category').annotate(total=Sum('total')).order_by()
+
+
+def breakdown_by_category(rows):
+    """Fold period rows into per-category totals, largest first"""
+    totals = {}
+    for row in rows:
+        key = (row['category__name'], row['type'])
+        entry = totals.setdefault(key, {
+            'category__name': row['category__name'],
+            'type': row['type'],
+            'total': Decimal('0.00'),
+            'count': 0,
+        })
+        entry['total'] += row['total']
+        entry['count'] += row['count']
+    return sorted(totals.values(), key=lambda entry: entry['total'], reverse=True)
+
+
+def totals_by_period(rows):
+    """Fold period rows into income/expense totals per period, oldest first"""
+    buckets = {}
+    for row in rows:
+        bucket = buckets.setdefault(row['period'], {
+            'period': row['period'],
+            'income': Decimal('0.00'),
+            'expenses': Decimal('0.00'),
+            'count': 0,
+        })
+        bucket['income' if row['type'] == 'INCOME' else 'expenses'] += row['total']
+        bucket['count'] += row['count']
+    return [buckets[period] for period in sorted(buckets)]
@@ -0,0 +1,155 @@
+import re
+from django.db import connections
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+SQLITE_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts
+    USING fts5(description, content='transactions', content_rowid='id')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF description ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+        INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+]
+
+SQLITE_TRIGGERS = ['transactions_fts_ai', 'transactions_fts_ad', 'transactions_fts_au']
+
+POSTGRES_SCHEMA = [
+    """
+    ALTER TABLE transactions ADD COLUMN IF NOT EXISTS description_search tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', coalesce(description, ''))) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS transactions_description_search_idx
+    ON transactions USING GIN (description_search)
+    """,
+]
+
+
+def ensure_search_index(connection):
+    """
+    Create the full-text index for transaction descriptions if it is missing.
+
+    On SQLite this is an external-content FTS5 table kept in sync by triggers;
+    rebuilding the transactions table during a migration drops the triggers,
+    so they are recreated (and the index rebuilt) whenever they are missing.
+    On PostgreSQL it is a generated tsvector column with a GIN index.
+    Does nothing until the transactions table has been migrated.
+    """
+    if 'transactions' not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+                SQLITE_TRIGGERS
+            )
+            if cursor.fetchone()[0] == len(SQLITE_TRIGGERS):
+                return
+            for statement in SQLITE_SCHEMA:
+                cursor.execute(statement)
+            cursor.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+        elif connection.vendor == 'postgresql':
+            for statement in POSTGRES_SCHEMA:
+                cursor.execute(statement)
+
+
+def drop_search_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for trigger in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute("DROP TABLE IF EXISTS transactions_fts")
+        elif connection.vendor == 'postgresql':
+            cursor.execute("DROP INDEX IF EXISTS transactions_description_search_idx")
+            cursor.execute("ALTER TABLE transactions DROP COLUMN IF EXISTS description_search")
+
+
+def build_query(terms, vendor):
+    """Turn search terms into a prefix-matching full-text query, or None"""
+    tokens = [token for term in terms for token in TOKEN_RE.findall(term)]
+    if not tokens:
+        return None
+    if vendor == 'sqlite':
+        return ' '.join(f'"{token}"*' for token in tokens)
+    return ' & '.join(f'{token}:*' for token in tokens)
+
+
+def supports_full_text(vendor):
+    return vendor in ('sqlite', 'postgresql')
+
+
+def matching(queryset, terms):
+    """Filter to transactions whose description matches every term (no ranking)"""
+    vendor = connections[queryset.db].vendor
+    query = build_query(terms, vendor)
+    if query is None:
+        return queryset
+    if vendor == 'sqlite':
+        sql = "SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH %s"
+    else:
+        sql = "SELECT id FROM transactions WHERE description_search @@ to_tsquery('simple', %s)"
+    return queryset.filter(id__in=RawSQL(sql, [query]))
+
+
+def ranked(queryset, terms):
+    """Filter to matching transactions, best matches first"""
+    vendor = connections[queryset.db].vendor
+    query = build_query(terms, vendor)
+    if query is None:
+        return queryset
+    if vendor == 'sqlite':
+        # bm25 rank, lower is better. The ranked matches are read from the FTS
+        # table once into a materialized CTE: a per-row MATCH, or a join that
+        # SQLite drives from the user's rows, would run the full-text query
+        # once per row (minutes on large users).
+        materialized = 'MATERIALIZED' if connections[queryset.db].Database.sqlite_version_info >= (3, 35) else ''
+        rank = RawSQL(
+            f"(WITH matches AS {materialized} ("
+            "SELECT rowid AS id, rank FROM transactions_fts WHERE transactions_fts MATCH %s"
+            ") SELECT rank FROM matches WHERE matches.id = transactions.id)",
+            [query]
+        )
+        return matching(queryset, terms).order_by(rank)
+    return queryset.filter(
+        RawSQL("transactions.description_search @@ to_tsquery('simple', %s)", [query], output_field=BooleanField())
+    ).order_by(RawSQL("ts_rank(transactions.description_search, to_tsquery('simple', %s))", [query]).desc())
+
+
+class TransactionSearchFilter(filters.SearchFilter):
+    """
+    Full-text search over transaction descriptions.
+
+    Replaces the `ILIKE '%term%'` scan of SearchFilter with the FTS5 table on
+    SQLite or the tsvector column on PostgreSQL. Every term must match, each
+    as a word prefix, and results are ordered by relevance unless an explicit
+    `ordering` is requested. Other databases fall back to SearchFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        if not supports_full_text(connections[queryset.db].vendor):
+            return super().filter_queryset(request, queryset, view)
+        return ranked(queryset, terms)
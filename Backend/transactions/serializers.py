@@ -1,10 +1,14 @@
 from rest_framework import serializers
-from .models import Transaction
-from categories.serializers import CategorySerializer
+from .models import Transaction, ArchivedTransaction, RecurringTransaction
+from categories.cache import CachedCategoryField, with_missing
+from categories.models import Category
+from metrics import timing
+from .filters import TransactionFilter
+from . import bulk, recurring
 
 
 class TransactionSerializer(serializers.ModelSerializer):
-    category_details = CategorySerializer(source='category', read_only=True)
+    category_details = CachedCategoryField()
     
     class Meta:
         model = Transaction
@@ -24,4 +28,158 @@ class TransactionSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(
                     "Category type must match transaction type"
                 )
-        return attrs
\ No newline at end of file
+        return attrs
+
+
+class TransactionWithBalanceSerializer(TransactionSerializer):
+    running_balance = serializers.DecimalField(
+        max_digits=None, decimal_places=2, read_only=True,
+        help_text="Balance after this transaction, over all of the user's transactions in date order"
+    )
+
+    class Meta(TransactionSerializer.Meta):
+        fields = TransactionSerializer.Meta.fields + ['running_balance']
+
+
+class BulkChangesSerializer(serializers.Serializer):
+    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), allow_null=True, required=False)
+    type = serializers.ChoiceField(choices=Transaction.TYPE_CHOICES, required=False)
+    description = serializers.CharField(allow_blank=True, required=False)
+    date = serializers.DateField(required=False)
+
+    def validate_category(self, value):
+        if value is not None and value.user_id != self.context['request'].user.id:
+            raise serializers.ValidationError(f'Invalid pk "{value.pk}" - object does not exist.')
+        return value
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("Give at least one field to change.")
+        return attrs
+
+
+class TransactionSelectionSerializer(serializers.Serializer):
+    """Transactions picked by id, or by the list endpoint's filter parameters"""
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False, max_length=bulk.MAX_IDS)
+    filters = serializers.DictField(
+        child=serializers.CharField(), required=False,
+        help_text="Any of: type, category, date, start_date, end_date, min_amount, max_amount"
+    )
+
+    def validate_filters(self, value):
+        # TransactionFilter ignores names it does not know, which would widen the selection
+        unknown = sorted(set(value) - set(TransactionFilter.base_filters))
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown filters: {', '.join(unknown)}. Use: {', '.join(TransactionFilter.base_filters)}."
+            )
+        if not value:
+            raise serializers.ValidationError("Give at least one filter.")
+        filterset = TransactionFilter(data=value, queryset=Transaction.objects.none())
+        if not filterset.is_valid():
+            raise serializers.ValidationError(filterset.errors)
+        return value
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filters' in attrs):
+            raise serializers.ValidationError("Give either ids or filters.")
+        return attrs
+
+
+class BulkUpdateSerializer(TransactionSelectionSerializer):
+    changes = BulkChangesSerializer()
+
+
+class ArchivedTransactionSerializer(serializers.ModelSerializer):
+    category_details = CachedCategoryField()
+
+    class Meta:
+        model = ArchivedTransaction
+        fields = TransactionSerializer.Meta.fields + ['archived_at']
+        read_only_fields = fields
+
+
+class RecurringTransactionSerializer(serializers.ModelSerializer):
+    category_details = CachedCategoryField()
+
+    class Meta:
+        model = RecurringTransaction
+        fields = [
+            'id', 'category', 'category_details', 'type', 'amount', 'description',
+            'frequency', 'interval', 'day_of_month', 'start_date', 'end_date',
+            'next_date', 'active', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'next_date', 'created_at', 'updated_at']
+
+    def validate_day_of_month(self, value):
+        if value is not None and not 1 <= value <= 31:
+            raise serializers.ValidationError("Must be between 1 and 31.")
+        return value
+
+    def validate(self, attrs):
+        values = {
+            name: attrs.get(name, getattr(self.instance, name, None))
+            for name in ('category', 'type', 'frequency', 'day_of_month', 'start_date', 'end_date')
+        }
+        # Same rule as TransactionSerializer.validate
+        if values['category'] and values['category'].type != values['type']:
+            raise serializers.ValidationError("Category type must match transaction type")
+        if values['day_of_month'] is not None and values['frequency'] != RecurringTransaction.MONTHLY:
+            raise serializers.ValidationError({'day_of_month': "Only used with a monthly frequency."})
+        if values['end_date'] and values['end_date'] < values['start_date']:
+            raise serializers.ValidationError({'end_date': "Must not be before start_date."})
+        return attrs
+
+    def create(self, validated_data):
+        validated_data['user'] = self.context['request'].user
+        schedule = RecurringTransaction(**validated_data)
+        recurring.reschedule(schedule)
+        schedule.save()
+        return schedule
+
+    def update(self, instance, validated_data):
+        for name, value in validated_data.items():
+            setattr(instance, name, value)
+        recurring.reschedule(instance)
+        instance.save()
+        return instance
+
+
+TRANSACTION_READ_FIELDS = (
+    'id', 'category', 'type', 'amount', 'description', 'date', 'created_at', 'updated_at'
+)
+
+
+def serialize_transaction_rows(rows, categories):
+    """
+    Read-only fast path producing the same output as TransactionSerializer.
+
+    Takes `.values(*TRANSACTION_READ_FIELDS)` rows instead of model instances
+    and the owner's serialized categories (category_cache), and formats
+    values with TransactionSerializer's own bound fields, so the rendered
+    JSON is byte-identical without the per-row cost of the serializer tree.
+    """
+    with timing.track('serialize'):
+        rows = list(rows)
+        fields = TransactionSerializer().fields
+        amount = fields['amount'].to_representation
+        txn_date = fields['date'].to_representation
+        created_at = fields['created_at'].to_representation
+        updated_at = fields['updated_at'].to_representation
+
+        categories = with_missing(categories, {row['category'] for row in rows})
+
+        return [
+            {
+                'id': row['id'],
+                'category': row['category'],
+                'category_details': categories.get(row['category']),
+                'type': row['type'],
+                'amount': amount(row['amount']),
+                'description': row['description'],
+                'date': txn_date(row['date']),
+                'created_at': created_at(row['created_at']),
+                'updated_at': updated_at(row['updated_at']),
+            }
+            for row in rows
+        ]
\ No newline at end of file
@@ -0,0 +1,54 @@
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from categories.models import Category
+from .models import Transaction
+from . import rollups
+
+
+ROLLUP_FIELDS = ('user_id', 'date', 'category_id', 'type', 'amount')
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_previous_values(sender, instance, **kwargs):
+    """Keep the stored row so post_save can move its amount out of the old bucket"""
+    instance._rollup_previous = None
+    if instance.pk:
+        instance._rollup_previous = sender.objects.filter(pk=instance.pk).values(*ROLLUP_FIELDS).first()
+
+
+@receiver(post_save, sender=Transaction)
+def update_rollup_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_rollup_previous', None)
+    current = {field: getattr(instance, field) for field in ROLLUP_FIELDS}
+
+    if previous and all(previous[f] == current[f] for f in ROLLUP_FIELDS if f != 'amount'):
+        # Same bucket, only the amount can have changed
+        if previous['amount'] != current['amount']:
+            rollups.apply_delta(
+                current['user_id'], current['date'], current['category_id'], current['type'],
+                current['amount'] - previous['amount'], 0
+            )
+        return
+
+    if previous:
+        rollups.apply_delta(
+            previous['user_id'], previous['date'], previous['category_id'], previous['type'],
+            -previous['amount'], -1
+        )
+    rollups.apply_delta(
+        current['user_id'], current['date'], current['category_id'], current['type'],
+        current['amount'], 1
+    )
+
+
+@receiver(post_delete, sender=Transaction)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    rollups.apply_delta(
+        instance.user_id, instance.date, instance.category_id, instance.type,
+        -instance.amount, -1
+    )
+
+
+@receiver(pre_delete, sender=Category)
+def uncategorize_rollups_on_category_delete(sender, instance, **kwargs):
+    rollups.uncategorize(instance)
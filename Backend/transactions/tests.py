@@ -1,3 +1,493 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.models.signals import post_delete
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from benchmarks import runner, seed
+from categories.cache import category_cache
+from categories.models import Category
+from users.versions import data_version
+from .models import Transaction, ArchivedTransaction, MonthlyRollup, RecurringTransaction
+from .serializers import TransactionSerializer, TRANSACTION_READ_FIELDS, serialize_transaction_rows
+from . import archive, balances, bulk, recurring, rollups
 
-# Create your tests here.
+
+class RollupAssertions:
+    def assertRollupsMatch(self, user):
+        """Rollups equal the live and archived rows summed exactly (SQLite sums decimals as floats)"""
+        expected = {}
+        for model in (Transaction, ArchivedTransaction):
+            for txn in model.objects.filter(user=user):
+                key = (txn.date.year, txn.date.month, txn.category_id, txn.type)
+                total, count = expected.get(key, (Decimal('0.00'), 0))
+                expected[key] = (total + txn.amount, count + 1)
+        actual = {
+            (row.year, row.month, row.category_id, row.type): (row.total, row.count)
+            for row in MonthlyRollup.objects.filter(user=user, count__gt=0)
+        }
+        self.assertEqual(actual, expected)
+
+
+class BulkEndpointTests(RollupAssertions, TestCase):
+    def setUp(self):
+        self.user = seed.seed_user(60)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_unknown_filter_is_rejected(self):
+        response = self.client.post('/api/transactions/bulk_delete/', {'filters': {'categroy': '5'}}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('filters', response.data)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 60)
+
+    def test_empty_or_invalid_filters_are_rejected(self):
+        for filters in ({}, {'start_date': 'nope'}, {'type': 'BOTH'}):
+            response = self.client.post('/api/transactions/bulk_delete/', {'filters': filters}, format='json')
+            self.assertEqual(response.status_code, 400, filters)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 60)
+
+    def test_other_users_ids_are_rejected(self):
+        other = seed.seed_user(5, seed=1)
+        ids = list(Transaction.objects.filter(user=self.user).values_list('id', flat=True)[:3])
+        foreign = Transaction.objects.filter(user=other).values_list('id', flat=True).first()
+
+        response = self.client.post('/api/transactions/bulk_delete/', {'ids': ids + [foreign]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(foreign), str(response.data['ids']))
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 60)
+        self.assertEqual(Transaction.objects.filter(user=other).count(), 5)
+
+    def test_category_type_rule_and_ownership(self):
+        income = Category.objects.filter(user=self.user, type='INCOME').first()
+        foreign = Category.objects.filter(user=seed.seed_user(5, seed=1), type='EXPENSE').first()
+        selection = {'filters': {'type': 'EXPENSE'}}
+        for changes in ({'category': income.id}, {'type': 'INCOME'}, {'category': foreign.id}):
+            response = self.client.post('/api/transactions/bulk_update/', {**selection, 'changes': changes}, format='json')
+            self.assertEqual(response.status_code, 400, changes)
+
+    def test_update_moves_rollups(self):
+        category = Category.objects.filter(user=self.user, type='EXPENSE').first()
+        version = data_version(self.user.id)
+        response = self.client.post('/api/transactions/bulk_update/', {
+            'filters': {'type': 'EXPENSE'},
+            'changes': {'category': category.id, 'date': '2024-02-29'},
+        }, format='json')
+
+        expenses = Transaction.objects.filter(user=self.user, type='EXPENSE')
+        self.assertEqual(response.data, {'updated': expenses.count()})
+        self.assertEqual(expenses.exclude(category=category, date=date(2024, 2, 29)).count(), 0)
+        self.assertRollupsMatch(self.user)
+        self.assertNotEqual(data_version(self.user.id), version)
+
+    def test_delete_reduces_rollups(self):
+        ids = list(Transaction.objects.filter(user=self.user).values_list('id', flat=True)[:10])
+        response = self.client.post('/api/transactions/bulk_delete/', {'ids': ids}, format='json')
+        self.assertEqual(response.data, {'deleted': 10})
+
+        response = self.client.post('/api/transactions/bulk_delete/', {'filters': {'type': 'INCOME'}}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Transaction.objects.filter(user=self.user).exclude(type='EXPENSE').count(), 0)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 50 - response.data['deleted'])
+        self.assertRollupsMatch(self.user)
+
+
+class ImportTests(TestCase):
+    def setUp(self):
+        self.user = seed.seed_user(0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, name, body):
+        return self.client.post('/api/transactions/import/', {'file': SimpleUploadedFile(name, body)}, format='multipart')
+
+    def test_non_string_values_are_row_errors(self):
+        response = self.upload('rows.ndjson', (
+            b'{"type": ["EXPENSE"], "amount": "1", "date": "2024-01-01"}\n'
+            b'{"type": {"a": 1}, "amount": [1], "date": {"d": 1}, "category": [3]}\n'
+            b'{"type": "EXPENSE", "amount": "2.50", "date": "2024-01-02"}\n'
+        ))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['failed']), (1, 2))
+        self.assertEqual([error['row'] for error in response.data['errors']], [1, 2])
+
+    def test_unreadable_files_are_rejected(self):
+        for name, body in (
+            ('rows.csv', b'type,amount,date\nEXPENSE,1,2024-01-01\n\xff\xfe,2,2024-01-01\n'),
+            ('rows.ndjson', b'{"type": "EXPENSE", "amount": "2", "date": "2024-01-02"}\n\xff\n'),
+            ('rows.csv', b'type,amount,date,description\nEXPENSE,1,2024-01-01,' + b'x' * 200000 + b'\n'),
+        ):
+            response = self.upload(name, body)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('file', response.data)
+        self.assertFalse(Transaction.objects.filter(user=self.user).exists())
+
+
+class ListSerializerTests(TestCase):
+    """The values-based list path must render exactly what TransactionSerializer does"""
+
+    def test_output_matches_transaction_serializer(self):
+        user = seed.seed_user(50)
+        Transaction.objects.create(user=user, type='EXPENSE', amount=Decimal('3.10'), date=date(2024, 2, 29), description='')
+        queryset = Transaction.objects.filter(user=user)
+        renderer = JSONRenderer()
+        self.assertEqual(
+            renderer.render(serialize_transaction_rows(queryset.values(*TRANSACTION_READ_FIELDS), category_cache.get(user.id))),
+            renderer.render(TransactionSerializer(queryset, many=True).data),
+        )
+
+
+class ConditionalGetTests(TestCase):
+    """Unchanged polls are answered with 304 from the data version alone"""
+
+    def test_not_modified_until_a_write(self):
+        user = seed.seed_user(50)
+        client = runner.authenticated_client(user)
+        client.get('/api/auth/profile/')  # warm the user cache
+        etag = client.get('/api/transactions/summary/')['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/transactions/summary/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('data_versions', queries[0]['sql'])
+
+        Transaction.objects.create(user=user, type='EXPENSE', amount=Decimal('1.00'), date=date.today(), description='')
+        self.assertEqual(client.get('/api/transactions/summary/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class RecurringMaterializeTests(TestCase):
+    """Materializing schedules posts each occurrence exactly once"""
+
+    def test_rerun_does_not_double_post(self):
+        user = seed.seed_user(20)
+        RecurringTransaction.objects.bulk_create([
+            RecurringTransaction(
+                user=user, type='EXPENSE', amount=Decimal('9.99'), frequency=RecurringTransaction.MONTHLY,
+                day_of_month=31, start_date=date(2024, 1, 1), next_date=date(2024, 1, 31)
+            )
+            for _ in range(30)
+        ])
+        self.assertEqual(recurring.materialize(date(2024, 3, 31), batch_size=7), (30, 90))
+        self.assertEqual(recurring.materialize(date(2024, 3, 31)), (0, 0))
+
+        posted = Transaction.objects.filter(recurring__isnull=False)
+        self.assertEqual(sorted(set(posted.values_list('date', flat=True))), [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31)])
+        self.assertEqual(rollups.verify([user.id]), [])
+
+
+class RunningBalanceTests(TestCase):
+    """Running balances from rollups and month prefix sums match a full ledger scan"""
+
+    def test_matches_ledger(self):
+        user = seed.seed_user(200)
+        Transaction.objects.create(user=user, type='INCOME', amount=Decimal('12.34'), date=date(2020, 2, 29), description='')
+        ledger = {}
+        balance = Decimal('0.00')
+        for txn in Transaction.objects.filter(user=user).order_by('date', 'created_at', 'id'):
+            balance += txn.amount if txn.type == 'INCOME' else -txn.amount
+            ledger[txn.id] = balance
+
+        rows = list(Transaction.objects.filter(user=user).order_by('amount').values('id', 'date', 'created_at')[:60])
+        running = balances.running_balances(user.id, rows)
+        self.assertEqual({row['id']: running[row['id']] for row in rows}, {row['id']: ledger[row['id']] for row in rows})
+        self.assertEqual(balances.balance_as_of(user.id, date.today() + timedelta(days=1)), balance)
+
+
+class ArchiveTests(RollupAssertions, TestCase):
+    def setUp(self):
+        self.user = seed.seed_user(150)
+        self.other = seed.seed_user(30, seed=1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.cutoff = archive.archive_cutoff(12)
+
+    def summary(self):
+        start = date.today() - timedelta(days=3 * 365 + 10)
+        return self.client.get('/api/transactions/summary/', {
+            'start_date': start.isoformat(), 'end_date': date.today().isoformat(), 'group_by': 'month'
+        }).json()
+
+    def test_moves_old_transactions_and_keeps_reports(self):
+        old = set(Transaction.objects.filter(user=self.user, date__lt=self.cutoff).values_list('id', flat=True))
+        self.assertTrue(old)
+        summary = self.summary()
+        version = data_version(self.user.id)
+
+        self.assertEqual(archive.archive_user(self.user.id, self.cutoff, batch_size=7), len(old))
+        self.assertFalse(Transaction.objects.filter(user=self.user, date__lt=self.cutoff).exists())
+        self.assertEqual(set(ArchivedTransaction.objects.filter(user=self.user).values_list('id', flat=True)), old)
+        self.assertFalse(ArchivedTransaction.objects.filter(user=self.other).exists())
+        self.assertGreater(data_version(self.user.id), version)
+        self.assertRollupsMatch(self.user)
+        self.assertEqual(self.summary(), summary)
+
+        response = self.client.get('/api/transactions/archive/', {'count': 'false'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['results'])
+        other = APIClient()
+        other.force_authenticate(self.other)
+        self.assertEqual(other.get(f'/api/transactions/archive/{min(old)}/').status_code, 404)
+
+    def test_archived_occurrences_are_not_posted_again(self):
+        start = rollups.months_before(self.cutoff, 3)
+        schedule = RecurringTransaction.objects.create(
+            user=self.user, type='EXPENSE', amount=Decimal('9.99'), frequency=RecurringTransaction.MONTHLY,
+            start_date=start, next_date=start
+        )
+        self.assertEqual(recurring.materialize(self.cutoff - timedelta(days=1), user_ids=[self.user.id]), (1, 3))
+        archive.archive_user(self.user.id, self.cutoff)
+        self.assertEqual(
+            sorted(ArchivedTransaction.objects.filter(recurring=schedule).values_list('occurrence', flat=True)),
+            [start, rollups.next_month(start), rollups.next_month(rollups.next_month(start))]
+        )
+
+        recurring.reschedule(schedule)
+        self.assertEqual(schedule.next_date, self.cutoff)
+        # A schedule moved back to its start posts only what was never posted
+        RecurringTransaction.objects.filter(pk=schedule.pk).update(next_date=start)
+        self.assertEqual(recurring.materialize(self.cutoff, user_ids=[self.user.id]), (1, 1))
+        self.assertEqual(Transaction.objects.get(recurring=schedule).occurrence, self.cutoff)
+        self.assertRollupsMatch(self.user)
+
+    def test_command(self):
+        with self.assertRaises(CommandError):
+            call_command('archive_transactions', keep_months=archive.MIN_KEEP_MONTHS - 1, stdout=io.StringIO())
+        live = Transaction.objects.count()
+        call_command('archive_transactions', keep_months=12, dry_run=True, stdout=io.StringIO())
+        self.assertEqual(Transaction.objects.count(), live)
+
+        call_command('archive_transactions', keep_months=12, users=[self.user.id], stdout=io.StringIO())
+        self.assertFalse(Transaction.objects.filter(user=self.user, date__lt=self.cutoff).exists())
+        self.assertTrue(Transaction.objects.filter(user=self.other, date__lt=self.cutoff).exists())
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.user = seed.seed_user(40)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Transaction.objects.filter(user=self.user).update(description='rent')
+        self.ids = {}
+        for description, amount in (
+            ('coffee with friends after a long walk in the park', '3.00'),
+            ('coffee coffee', '2.00'),
+            ('groceries and coffee beans', '1.00'),
+            ('tea', '4.00'),
+        ):
+            self.ids[description] = Transaction.objects.create(
+                user=self.user, type='EXPENSE', amount=Decimal(amount), date=date(2024, 5, 1), description=description
+            ).id
+        other = seed.seed_user(0, email='other@example.com')
+        Transaction.objects.create(user=other, type='EXPENSE', amount=Decimal('1.00'), date=date(2024, 5, 1), description='coffee')
+
+    def search(self, **params):
+        response = self.client.get('/api/transactions/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_best_matches_first(self):
+        data = self.search(search='coffee')
+        self.assertEqual(data['count'], 3)
+        self.assertEqual([row['id'] for row in data['results']], [
+            self.ids['coffee coffee'],
+            self.ids['groceries and coffee beans'],
+            self.ids['coffee with friends after a long walk in the park'],
+        ])
+
+    def test_every_term_matches_as_a_prefix(self):
+        data = self.search(search='cof gro')
+        self.assertEqual([row['id'] for row in data['results']], [self.ids['groceries and coffee beans']])
+
+    def test_explicit_ordering_wins(self):
+        data = self.search(search='coffee', ordering='amount')
+        self.assertEqual([row['description'] for row in data['results']], [
+            'groceries and coffee beans', 'coffee coffee', 'coffee with friends after a long walk in the park'
+        ])
+
+
+class RollupBucketTests(RollupAssertions, TestCase):
+    def test_duplicate_uncategorized_bucket_is_rejected(self):
+        user = seed.seed_user(0)
+        MonthlyRollup.objects.create(user=user, year=2024, month=5, type='EXPENSE', total=Decimal('1.00'), count=1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            MonthlyRollup.objects.create(user=user, year=2024, month=5, type='EXPENSE', total=Decimal('2.00'), count=1)
+
+    def test_deleting_a_category_folds_its_rollups_into_uncategorized(self):
+        user = seed.seed_user(200)
+        for category in Category.objects.filter(user=user, transactions__isnull=False).distinct()[:3]:
+            category.delete()
+        self.assertRollupsMatch(user)
+
+
+class PaginationTests(TestCase):
+    def setUp(self):
+        self.user = seed.seed_user(0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Transaction.objects.bulk_create([
+            Transaction(user=self.user, type='EXPENSE', amount=Decimal('1.00'), date=date(2024, 5, 1 + i % 3), description=str(i))
+            for i in range(45)
+        ])
+        # Ties on both date and created_at leave the id to break them
+        Transaction.objects.filter(user=self.user).update(created_at=Transaction.objects.filter(user=self.user).first().created_at)
+        self.expected = list(
+            Transaction.objects.filter(user=self.user).order_by('-date', '-created_at', 'id').values_list('id', flat=True)
+        )
+
+    def walk(self, url, link):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            pages.append([row['id'] for row in data['results']])
+            url = data[link]
+        return pages
+
+    def test_cursor_pages_cover_every_row_once(self):
+        pages = self.walk('/api/transactions/?pagination=cursor', 'next')
+        self.assertEqual([len(page) for page in pages], [20, 20, 5])
+        self.assertEqual([pk for page in pages for pk in page], self.expected)
+
+        last = self.client.get('/api/transactions/?pagination=cursor').json()
+        while last['next']:
+            last = self.client.get(last['next']).json()
+        backwards = self.walk(last['previous'], 'previous')
+        self.assertEqual([pk for page in reversed(backwards) for pk in page], self.expected[:40])
+
+    def test_uncounted_pages_omit_the_count(self):
+        first = self.client.get('/api/transactions/', {'count': 'false'}).json()
+        self.assertNotIn('count', first)
+        self.assertIsNone(first['previous'])
+        self.assertIn('page=2', first['next'])
+
+        last = self.client.get('/api/transactions/', {'count': 'false', 'page': 3}).json()
+        self.assertNotIn('count', last)
+        self.assertIsNone(last['next'])
+        self.assertIn('page=2', last['previous'])
+        self.assertEqual([row['id'] for row in last['results']], self.expected[40:])
+
+        full = self.client.get('/api/transactions/', {'count': 'false', 'page': 2}).json()
+        self.assertIn('page=3', full['next'])
+
+
+class DeleteRowsTests(TestCase):
+    """bulk.delete_rows relies on the private QuerySet._raw_delete; this pins what callers expect of it"""
+
+    def test_one_delete_statement_and_no_signals(self):
+        user = seed.seed_user(30)
+        expenses = Transaction.objects.filter(user=user, type='EXPENSE')
+        expected = expenses.count()
+        stored = list(MonthlyRollup.objects.filter(user=user).order_by('id').values_list('id', 'total', 'count'))
+        version = data_version(user.id)
+        sent = []
+
+        def receiver(sender, instance, **kwargs):
+            sent.append(instance.pk)
+
+        post_delete.connect(receiver, sender=Transaction)
+        self.addCleanup(post_delete.disconnect, receiver, sender=Transaction)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(bulk.delete_rows(expenses), expected)
+
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]['sql'].startswith('DELETE'))
+        self.assertEqual(sent, [])
+        self.assertEqual(Transaction.objects.filter(user=user).count(), 30 - expected)
+        self.assertEqual(list(MonthlyRollup.objects.filter(user=user).order_by('id').values_list('id', 'total', 'count')), stored)
+        self.assertEqual(data_version(user.id), version)
+
+
+class TimeseriesTests(TestCase):
+    def setUp(self):
+        self.user = seed.seed_user(0)
+        for txn_type, amount, day in (('INCOME', '100.00', 1), ('EXPENSE', '30.25', 3), ('EXPENSE', '10.00', 6), ('EXPENSE', '5.00', 7)):
+            Transaction.objects.create(user=self.user, type=txn_type, amount=Decimal(amount), date=date(2024, 5, day), description='')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def series(self, **params):
+        response = self.client.get('/api/transactions/timeseries/', {'start': '2024-05-01', 'end': '2024-05-06', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_gaps_are_zero_filled(self):
+        data = self.series()
+        self.assertEqual(data['periods'], [f'2024-05-0{day}' for day in range(1, 7)])
+        self.assertEqual(data['income'], [100, 0, 0, 0, 0, 0])
+        self.assertEqual(data['expenses'], [0, 0, 30.25, 0, 0, 10])
+        self.assertEqual(data['net'], [100, 0, -30.25, 0, 0, -10])
+        self.assertEqual(data['count'], [1, 0, 1, 0, 0, 1])
+
+        months = self.series(interval='month', start='2024-03-15', end='2024-06-30')
+        self.assertEqual(months['periods'], ['2024-03-01', '2024-04-01', '2024-05-01', '2024-06-01'])
+        self.assertEqual(months['net'], [0, 0, 54.75, 0])
+
+    def test_rolling_window_edges(self):
+        data = self.series(rolling='3,10', cumulative='true')
+        # The first buckets average over the days so far; a window longer
+        # than the range is the mean since the start
+        self.assertEqual(data['rolling']['3']['net'], [100, 50, 23.25, -10.08, -10.08, -3.33])
+        self.assertEqual(data['rolling']['10']['net'], [100, 50, 23.25, 17.44, 13.95, 9.96])
+        self.assertEqual(data['cumulative_balance'], [100, 100, 69.75, 69.75, 69.75, 59.75])
+
+        later = self.series(start='2024-05-06', end='2024-05-07', rolling='3', cumulative='true')
+        self.assertEqual(later['rolling']['3']['expenses'], [10, 7.5])
+        self.assertEqual(later['cumulative_balance'], [-10, -15])
+
+    @override_settings(API_MONEY_FORMAT='string')
+    def test_money_format_setting(self):
+        data = self.series(rolling='3', cumulative='true')
+        self.assertEqual(data['net'], ['100.00', '0.00', '-30.25', '0.00', '0.00', '-10.00'])
+        self.assertEqual(data['rolling']['3']['net'], ['100.00', '50.00', '23.25', '-10.08', '-10.08', '-3.33'])
+        self.assertEqual(data['cumulative_balance'][-1], '59.75')
+        self.assertEqual(data['count'], [1, 0, 1, 0, 0, 1])
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.user = seed.seed_user(25)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def export(self, params=None, **headers):
+        response = self.client.get('/api/transactions/export/', params or {}, **headers)
+        return response, b''.join(response.streaming_content).decode() if response.streaming else None
+
+    def test_csv(self):
+        response, body = self.export({'type': 'INCOME'}, HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('filename="transactions.csv"', response['Content-Disposition'])
+        header, *rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(header[:4], ['id', 'date', 'type', 'amount'])
+        self.assertEqual(
+            sorted(int(row[0]) for row in rows),
+            sorted(Transaction.objects.filter(user=self.user, type='INCOME').values_list('id', flat=True))
+        )
+
+    def test_ndjson(self):
+        response, body = self.export({'format': 'ndjson'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(rows), 25)
+        row = next(row for row in rows if row['id'] == Transaction.objects.filter(user=self.user).first().id)
+        self.assertEqual(Decimal(row['amount']), Transaction.objects.filter(user=self.user).first().amount)
+
+    def test_json_accept_header_gets_csv(self):
+        response, body = self.export(HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(len(body.splitlines()), 26)
+
+        response, _ = self.export({'format': 'json'})
+        self.assertEqual(response.status_code, 404)
\ No newline at end of file
@@ -0,0 +1,101 @@
+from datetime import timedelta
+import numpy as np
+from config.renderers import money_from_cents
+from . import rollups
+
+
+INTERVALS = ['day', 'week', 'month']
+MAX_BUCKETS = 5000
+MAX_WINDOW = 366
+
+
+def bucket_start(value, interval):
+    """Start of the bucket `value` falls in, matching TruncDay/TruncWeek/TruncMonth"""
+    if interval == 'week':
+        return value - timedelta(days=value.weekday())
+    if interval == 'month':
+        return rollups.month_start(value)
+    return value
+
+
+def bucket_starts(start_date, end_date, interval):
+    """Every bucket start from the one containing start_date through end_date"""
+    current = bucket_start(start_date, interval)
+    starts = []
+    while current <= end_date:
+        starts.append(current)
+        if interval == 'month':
+            current = rollups.next_month(current)
+        else:
+            current += timedelta(days=7 if interval == 'week' else 1)
+    return starts
+
+
+def bucket_count(start_date, end_date, interval):
+    """Number of buckets bucket_starts would return, without building them"""
+    first = bucket_start(start_date, interval)
+    if interval == 'month':
+        return (end_date.year - first.year) * 12 + end_date.month - first.month + 1
+    return (end_date - first).days // (7 if interval == 'week' else 1) + 1
+
+
+def rolling_mean(values, window):
+    """
+    Trailing mean over `window` buckets.
+
+    The first window - 1 buckets average over the buckets available so far,
+    so every bucket has a value.
+    """
+    sums = np.cumsum(values)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return sums / counts
+
+
+def build_series(user, start_date, end_date, interval, windows=(), cumulative=False):
+    """
+    Income, expenses and net per bucket as column arrays, gaps filled with zeros.
+
+    Totals come from one grouped query (monthly intervals read whole months
+    from the rollups). Money is summed as integer cents so cumulative and
+    rolling figures are exact until they are rounded to whole cents and
+    formatted per API_MONEY_FORMAT.
+    """
+    starts = bucket_starts(start_date, end_date, interval)
+    index = {start: position for position, start in enumerate(starts)}
+    income = np.zeros(len(starts), dtype=np.int64)
+    expenses = np.zeros(len(starts), dtype=np.int64)
+    count = np.zeros(len(starts), dtype=np.int64)
+
+    for row in rollups.period_totals(user, start_date, end_date, interval, by_category=False):
+        position = index[bucket_start(row['period'], interval)]
+        cents = int(row['total'] * 100)
+        if row['type'] == 'INCOME':
+            income[position] += cents
+        else:
+            expenses[position] += cents
+        count[position] += row['count']
+
+    net = income - expenses
+    series = {
+        'interval': interval,
+        'start_date': start_date,
+        'end_date': end_date,
+        'periods': [start.isoformat() for start in starts],
+        'income': money_from_cents(income),
+        'expenses': money_from_cents(expenses),
+        'net': money_from_cents(net),
+        'count': count,
+    }
+    if windows:
+        series['rolling'] = {
+            str(window): {
+                'income': money_from_cents(np.rint(rolling_mean(income, window))),
+                'expenses': money_from_cents(np.rint(rolling_mean(expenses, window))),
+                'net': money_from_cents(np.rint(rolling_mean(net, window))),
+            }
+            for window in windows
+        }
+    if cumulative:
+        series['cumulative_balance'] = money_from_cents(np.cumsum(net))
+    return series
\ No newline at end of file
@@ -1,8 +1,10 @@
-from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TransactionViewSet
+from .views import TransactionViewSet, ArchivedTransactionViewSet, RecurringTransactionViewSet
 
 router = DefaultRouter()
+# Before '' so that archive/ and recurring/ are not taken for a transaction id
+router.register('archive', ArchivedTransactionViewSet, basename='archived-transaction')
+router.register('recurring', RecurringTransactionViewSet, basename='recurring-transaction')
 router.register('', TransactionViewSet, basename='transaction')
 
 urlpatterns = router.urls
\ No newline at end of file
@@ -2,14 +2,38 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Sum, Count
 from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from django.http import StreamingHttpResponse
+from rest_framework.generics import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
-from datetime import datetime
-from .models import Transaction
-from .serializers import TransactionSerializer
-from .filters import TransactionFilter
+from datetime import timedelta
+from decimal import Decimal
+from .models import Transaction, ArchivedTransaction, RecurringTransaction
+from .serializers import TransactionSerializer, TransactionWithBalanceSerializer, ArchivedTransactionSerializer, RecurringTransactionSerializer, BulkUpdateSerializer, TransactionSelectionSerializer, TRANSACTION_READ_FIELDS, serialize_transaction_rows
+from .filters import TransactionFilter, ArchivedTransactionFilter
+from .pagination import TransactionPagination
+from .search import TransactionSearchFilter
+from .renderers import CSVRenderer, NDJSONRenderer, DefaultFirstContentNegotiation
+from config.views import conditional_get, read_from_replica
+from categories.cache import category_cache
+from . import rollups, importers, exporters, timeseries, recurring, bulk, balances
+
+
+def parse_date_param(request, param, default):
+    value = request.query_params.get(param)
+    if not value:
+        return default
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({param: "Date has wrong format. Use YYYY-MM-DD."})
+    return parsed
 
 
 @extend_schema(tags=['Transactions'])
@@ -20,13 +44,14 @@ class TransactionViewSet(viewsets.ModelViewSet):
     Supports filtering by type, category, date range, and amount range.
     """
     serializer_class = TransactionSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = TransactionPagination
+    filter_backends = [DjangoFilterBackend, TransactionSearchFilter, filters.OrderingFilter]
     filterset_class = TransactionFilter
     search_fields = ['description']
     ordering_fields = ['date', 'amount', 'created_at']
 
     def get_queryset(self):
-        return Transaction.objects.filter(user=self.request.user).select_related('category')
+        return Transaction.objects.filter(user=self.request.user)
 
     @extend_schema(
         summary="List all transactions",
@@ -38,12 +63,33 @@ class TransactionViewSet(viewsets.ModelViewSet):
             OpenApiParameter('end_date', OpenApiTypes.DATE, description='Filter to date (YYYY-MM-DD)'),
             OpenApiParameter('min_amount', OpenApiTypes.NUMBER, description='Minimum amount'),
             OpenApiParameter('max_amount', OpenApiTypes.NUMBER, description='Maximum amount'),
-            OpenApiParameter('search', OpenApiTypes.STR, description='Search in description'),
+            OpenApiParameter('search', OpenApiTypes.STR, description='Full-text search in description (word prefixes, ranked by relevance)'),
             OpenApiParameter('ordering', OpenApiTypes.STR, description='Order by field'),
+            OpenApiParameter('pagination', OpenApiTypes.STR, enum=['cursor'], description='Use keyset pagination with next/previous cursors instead of page numbers'),
+            OpenApiParameter('cursor', OpenApiTypes.STR, description='Cursor from a previous next/previous link'),
+            OpenApiParameter('count', OpenApiTypes.BOOL, description='Set to false to skip the total count'),
         ],
+        responses=TransactionWithBalanceSerializer,
     )
+    @read_from_replica
+    @conditional_get
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset()).values(*TRANSACTION_READ_FIELDS)
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.serialize_list_rows(page))
+        return Response(self.serialize_list_rows(queryset))
+
+    def serialize_list_rows(self, rows):
+        """serialize_transaction_rows plus each row's running balance"""
+        rows = list(rows)
+        data = serialize_transaction_rows(rows, category_cache.get(self.request.user.id))
+        running = balances.running_balances(self.request.user.id, rows)
+        to_representation = TransactionWithBalanceSerializer().fields['running_balance'].to_representation
+        for item in data:
+            item['running_balance'] = to_representation(running[item['id']])
+        return data
 
     @extend_schema(
         summary="Create transaction",
@@ -56,8 +102,13 @@ class TransactionViewSet(viewsets.ModelViewSet):
         summary="Get transaction",
         description="Retrieve a specific transaction by ID.",
     )
+    @conditional_get
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset()).values(*TRANSACTION_READ_FIELDS)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(request, row)
+        return Response(serialize_transaction_rows([row], category_cache.get(request.user.id))[0])
 
     @extend_schema(
         summary="Update transaction",
@@ -79,9 +130,13 @@ class TransactionViewSet(viewsets.ModelViewSet):
         parameters=[
             OpenApiParameter('start_date', OpenApiTypes.DATE, description='Summary from date (default: current month start)'),
             OpenApiParameter('end_date', OpenApiTypes.DATE, description='Summary to date (default: today)'),
+            OpenApiParameter('group_by', OpenApiTypes.STR, enum=['month', 'week', 'day'], description='Also return totals bucketed by month, week or day'),
         ],
+        responses=OpenApiTypes.OBJECT,
     )
     @action(detail=False, methods=['get'])
+    @read_from_replica
+    @conditional_get
     def summary(self, request):
         """Get financial summary for dashboard"""
         # Get current month
@@ -89,32 +144,277 @@ class TransactionViewSet(viewsets.ModelViewSet):
         month_start = today.replace(day=1)
         
         # Allow custom date range
-        start_date = request.query_params.get('start_date', month_start)
-        end_date = request.query_params.get('end_date', today)
+        start_date = parse_date_param(request, 'start_date', month_start)
+        end_date = parse_date_param(request, 'end_date', today)
         
-        queryset = self.get_queryset().filter(date__range=[start_date, end_date])
+        group_by = request.query_params.get('group_by')
+        if group_by and group_by not in rollups.PERIOD_FUNCTIONS:
+            raise ValidationError({'group_by': f"Must be one of: {', '.join(rollups.PERIOD_FUNCTIONS)}"})
+        
+        # One grouped pass by category, type and period; everything else is derived from it
+        rows = rollups.period_totals(request.user, start_date, end_date, group_by or 'month')
+        category_breakdown = rollups.breakdown_by_category(rows)
         
         # Calculate totals
-        income = queryset.filter(type='INCOME').aggregate(total=Sum('amount'))['total'] or 0
-        expenses = queryset.filter(type='EXPENSE').aggregate(total=Sum('amount'))['total'] or 0
+        income = sum((row['total'] for row in category_breakdown if row['type'] == 'INCOME'), Decimal('0.00'))
+        expenses = sum((row['total'] for row in category_breakdown if row['type'] == 'EXPENSE'), Decimal('0.00'))
         balance = income - expenses
         
-        # Category-wise breakdown
-        category_breakdown = queryset.values('category__name', 'type').annotate(
-            total=Sum('amount'),
-            count=Count('id')
-        ).order_by('-total')
-        
-        return Response({
+        data = {
             'period': {
                 'start_date': start_date,
                 'end_date': end_date
             },
             'summary': {
-                'total_income': float(income),
-                'total_expenses': float(expenses),
-                'balance': float(balance),
-                'transaction_count': queryset.count()
+                'total_income': income,
+                'total_expenses': expenses,
+                'balance': balance,
+                'transaction_count': sum(row['count'] for row in category_breakdown)
             },
-            'category_breakdown': list(category_breakdown)
-        })
\ No newline at end of file
+            'category_breakdown': category_breakdown
+        }
+        
+        if group_by:
+            data['group_by'] = group_by
+            data['buckets'] = [
+                {
+                    'period': bucket['period'],
+                    'income': bucket['income'],
+                    'expenses': bucket['expenses'],
+                    'balance': bucket['income'] - bucket['expenses'],
+                    'count': bucket['count']
+                }
+                for bucket in rollups.totals_by_period(rows)
+            ]
+        
+        return Response(data)
+
+    @extend_schema(
+        summary="Get balance as of a date",
+        description="Income minus expenses over all of the user's transactions dated up to and including as_of.",
+        parameters=[
+            OpenApiParameter('as_of', OpenApiTypes.DATE, description='Balance at the end of this date (default: today)'),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=False, methods=['get'])
+    @read_from_replica
+    @conditional_get
+    def balance(self, request):
+        """Point-in-time balance"""
+        as_of = parse_date_param(request, 'as_of', timezone.now().date())
+        return Response({
+            'as_of': as_of,
+            'balance': balances.balance_as_of(request.user.id, as_of)
+        })
+
+    @extend_schema(
+        summary="Get income/expense time series",
+        description="Income, expenses and net per day, week or month as column arrays (one entry per bucket, empty buckets filled with zeros). Optionally adds trailing rolling means and the cumulative balance over the range.",
+        parameters=[
+            OpenApiParameter('interval', OpenApiTypes.STR, enum=['day', 'week', 'month'], description='Bucket size (default: day)'),
+            OpenApiParameter('start', OpenApiTypes.DATE, description='Series from date (default: one year before end)'),
+            OpenApiParameter('end', OpenApiTypes.DATE, description='Series to date (default: today)'),
+            OpenApiParameter('rolling', OpenApiTypes.STR, description='Comma-separated rolling mean windows in buckets, e.g. 7,30'),
+            OpenApiParameter('cumulative', OpenApiTypes.BOOL, description='Include the running balance from the start of the range'),
+        ],
+    )
+    @action(detail=False, methods=['get'])
+    @read_from_replica
+    @conditional_get
+    def timeseries(self, request):
+        """Get bucketed income/expense series for charts"""
+        interval = request.query_params.get('interval', 'day')
+        if interval not in timeseries.INTERVALS:
+            raise ValidationError({'interval': f"Must be one of: {', '.join(timeseries.INTERVALS)}"})
+        
+        end_date = parse_date_param(request, 'end', timezone.now().date())
+        start_date = parse_date_param(request, 'start', end_date - timedelta(days=365))
+        if start_date > end_date:
+            raise ValidationError({'start': "Must not be after end."})
+        if timeseries.bucket_count(start_date, end_date, interval) > timeseries.MAX_BUCKETS:
+            raise ValidationError({'start': f"Range is limited to {timeseries.MAX_BUCKETS} buckets; use a longer interval."})
+        
+        windows = []
+        for value in filter(None, request.query_params.get('rolling', '').split(',')):
+            if not value.strip().isdigit() or not 1 <= int(value) <= timeseries.MAX_WINDOW:
+                raise ValidationError({'rolling': f"Windows must be whole numbers from 1 to {timeseries.MAX_WINDOW}."})
+            windows.append(int(value))
+        cumulative = request.query_params.get('cumulative', '').lower() in ('true', '1')
+        
+        return Response(timeseries.build_series(
+            request.user, start_date, end_date, interval, windows=sorted(set(windows)), cumulative=cumulative
+        ))
+
+    @extend_schema(
+        summary="Import transactions",
+        description="Bulk import transactions from an uploaded CSV or NDJSON file. Each row needs type, amount and date, plus optional description and category (ID or name). Invalid rows are reported and skipped.",
+        request={
+            'multipart/form-data': {
+                'type': 'object',
+                'properties': {
+                    'file': {'type': 'string', 'format': 'binary'},
+                    'file_format': {'type': 'string', 'enum': importers.FORMATS},
+                },
+                'required': ['file'],
+            }
+        },
+        responses={201: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_file(self, request):
+        """Bulk import transactions from a file"""
+        upload = request.FILES.get('file')
+        if not upload:
+            raise ValidationError({'file': "No file was submitted."})
+        
+        file_format = importers.detect_format(upload, request.data.get('file_format'))
+        if not file_format:
+            raise ValidationError({'file_format': f"Must be one of: {', '.join(importers.FORMATS)}"})
+        
+        result = importers.import_transactions(request.user, importers.read_rows(upload, file_format))
+        return Response(
+            result,
+            status=status.HTTP_201_CREATED if result['created'] else status.HTTP_400_BAD_REQUEST
+        )
+
+    @extend_schema(
+        summary="Update many transactions",
+        description="Apply the same changes (category, type, description, date) to a list of transaction ids or to every transaction matching the list filters, in one update. Returns the number updated.",
+        request=BulkUpdateSerializer,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=['post'])
+    def bulk_update(self, request):
+        """Update many transactions at once"""
+        serializer = BulkUpdateSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        updated = bulk.bulk_update(request.user, data['changes'], data.get('ids'), data.get('filters'))
+        return Response({'updated': updated})
+
+    @extend_schema(
+        summary="Delete many transactions",
+        description="Delete a list of transaction ids, or every transaction matching the list filters, in one delete. Returns the number deleted.",
+        request=TransactionSelectionSerializer,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request):
+        """Delete many transactions at once"""
+        serializer = TransactionSelectionSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        deleted = bulk.bulk_delete(request.user, data.get('ids'), data.get('filters'))
+        return Response({'deleted': deleted})
+
+    @extend_schema(
+        summary="Export transactions",
+        description="Stream every matching transaction as CSV or NDJSON without pagination. Accepts the same filters as the list endpoint. The format comes from ?format or the Accept header; clients accepting neither (e.g. application/json) get CSV.",
+        parameters=[
+            OpenApiParameter('format', OpenApiTypes.STR, enum=['csv', 'ndjson'], description='Export format (default: csv)'),
+            OpenApiParameter('type', OpenApiTypes.STR, description='Filter by INCOME or EXPENSE'),
+            OpenApiParameter('category', OpenApiTypes.INT, description='Filter by category ID'),
+            OpenApiParameter('start_date', OpenApiTypes.DATE, description='Filter from date (YYYY-MM-DD)'),
+            OpenApiParameter('end_date', OpenApiTypes.DATE, description='Filter to date (YYYY-MM-DD)'),
+            OpenApiParameter('min_amount', OpenApiTypes.NUMBER, description='Minimum amount'),
+            OpenApiParameter('max_amount', OpenApiTypes.NUMBER, description='Maximum amount'),
+            OpenApiParameter('search', OpenApiTypes.STR, description='Full-text search in description (word prefixes, ranked by relevance)'),
+            OpenApiParameter('ordering', OpenApiTypes.STR, description='Order by field'),
+        ],
+        responses={(200, 'text/csv'): OpenApiTypes.STR, (200, 'application/x-ndjson'): OpenApiTypes.STR},
+    )
+    @action(detail=False, methods=['get'], renderer_classes=[CSVRenderer, NDJSONRenderer], content_negotiation_class=DefaultFirstContentNegotiation)
+    def export(self, request):
+        """Stream all matching transactions"""
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = exporters.export_rows(queryset)
+        
+        renderer = request.accepted_renderer
+        if renderer.format == 'ndjson':
+            stream = exporters.ndjson_stream(rows)
+        else:
+            stream = exporters.csv_stream(rows)
+        
+        response = StreamingHttpResponse(stream, content_type=renderer.media_type)
+        response['Content-Disposition'] = f'attachment; filename="transactions.{renderer.format}"'
+        return response
+
+
+@extend_schema(tags=['Transactions'])
+class ArchivedTransactionViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only access to transactions moved to the archive table.
+
+    Archived rows are not searchable and the table has only the (user, date)
+    index, so this is slower than the live list. Their amounts remain in
+    every summary and report.
+    """
+    serializer_class = ArchivedTransactionSerializer
+    pagination_class = TransactionPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = ArchivedTransactionFilter
+    ordering_fields = ['date', 'amount', 'created_at']
+
+    def get_queryset(self):
+        return ArchivedTransaction.objects.filter(user=self.request.user)
+
+    @extend_schema(
+        summary="List archived transactions",
+        description="Get paginated list of archived transactions, with the same filters as the live list except search.",
+        parameters=[
+            OpenApiParameter('type', OpenApiTypes.STR, description='Filter by INCOME or EXPENSE'),
+            OpenApiParameter('category', OpenApiTypes.INT, description='Filter by category ID'),
+            OpenApiParameter('start_date', OpenApiTypes.DATE, description='Filter from date (YYYY-MM-DD)'),
+            OpenApiParameter('end_date', OpenApiTypes.DATE, description='Filter to date (YYYY-MM-DD)'),
+            OpenApiParameter('min_amount', OpenApiTypes.NUMBER, description='Minimum amount'),
+            OpenApiParameter('max_amount', OpenApiTypes.NUMBER, description='Maximum amount'),
+            OpenApiParameter('ordering', OpenApiTypes.STR, description='Order by field'),
+            OpenApiParameter('pagination', OpenApiTypes.STR, enum=['cursor'], description='Use keyset pagination with next/previous cursors instead of page numbers'),
+            OpenApiParameter('cursor', OpenApiTypes.STR, description='Cursor from a previous next/previous link'),
+            OpenApiParameter('count', OpenApiTypes.BOOL, description='Set to false to skip the total count'),
+        ],
+    )
+    @conditional_get
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        summary="Get archived transaction",
+        description="Retrieve a specific archived transaction by ID.",
+    )
+    @conditional_get
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+
+@extend_schema(tags=['Transactions'])
+class RecurringTransactionViewSet(viewsets.ModelViewSet):
+    """
+    Schedules for transactions that repeat, such as salary, rent and subscriptions.
+
+    Due occurrences are posted as ordinary transactions by
+    `manage.py materialize_recurring` (run daily) or the materialize action.
+    """
+    serializer_class = RecurringTransactionSerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['type', 'category', 'frequency', 'active']
+    ordering_fields = ['next_date', 'amount', 'created_at']
+
+    def get_queryset(self):
+        return RecurringTransaction.objects.filter(user=self.request.user)
+
+    @extend_schema(
+        summary="Post due recurring transactions",
+        description="Create the transactions for every occurrence of your active schedules due up to today. Occurrences already posted are never posted again.",
+        request=None,
+        responses={200: OpenApiTypes.OBJECT, 201: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=['post'])
+    def materialize(self, request):
+        """Post due occurrences of the user's schedules"""
+        schedules, created = recurring.materialize(user_ids=[request.user.id])
+        return Response(
+            {'schedules': schedules, 'created': created},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
\ No newline at end of file
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from metrics.registry import registry
+        from . import schema, signals  # noqa: F401
+        from .authentication import collect_cache_metrics
+        registry.add_collector(collect_cache_metrics)
\ No newline at end of file
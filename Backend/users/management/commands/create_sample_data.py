@@ -1,7 +1,8 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 from categories.models import Category
-from transactions.models import Transaction
+from transactions.models import Transaction, RecurringTransaction
+from transactions import recurring
 from budgets.models import Budget
 from django.utils import timezone
 from decimal import Decimal
@@ -71,19 +72,24 @@ class Command(BaseCommand):
 
         for user in users:
             salary_cat = Category.objects.get(user=user, name="Salary")
+            salary, created = RecurringTransaction.objects.get_or_create(
+                user=user,
+                category=salary_cat,
+                type="INCOME",
+                frequency=RecurringTransaction.MONTHLY,
+                defaults={
+                    "amount": Decimal("50000.00"),
+                    "description": "Monthly salary",
+                    "day_of_month": 1,
+                    "start_date": (today - timedelta(days=60)).replace(day=1),
+                },
+            )
+            if created:
+                recurring.reschedule(salary)
+                salary.save()
 
             for month_offset in range(0, 3):
                 date_ref = today - timedelta(days=month_offset * 30)
-                Transaction.objects.get_or_create(
-                    user=user,
-                    category=salary_cat,
-                    type="INCOME",
-                    date=date_ref.replace(day=1),
-                    defaults={
-                        "amount": Decimal("50000.00") + Decimal(random.randint(-2000, 2000)),
-                        "description": f"Monthly salary for {date_ref.strftime('%B')}",
-                    },
-                )
                 expense_cats = Category.objects.filter(user=user, type="EXPENSE")
                 for _ in range(random.randint(10, 15)):
                     cat = random.choice(expense_cats)
@@ -97,7 +103,8 @@ class Command(BaseCommand):
                         description=f"{cat.name} expense on {date_ref.strftime('%B')} {random_day}",
                     )
 
-        self.stdout.write(self.style.SUCCESS("Transactions created"))
+        schedules, posted = recurring.materialize(today, [user.id for user in users])
+        self.stdout.write(self.style.SUCCESS(f"Transactions created ({posted} recurring)"))
         for user in users:
             expense_cats = Category.objects.filter(user=user, type="EXPENSE")
             for cat in expense_cats:
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-17 19:24
+
+import django.db.models.deletion
+import users.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_data_versions(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    DataVersion = apps.get_model('users', 'DataVersion')
+    DataVersion.objects.bulk_create(
+        [DataVersion(user_id=user_id) for user_id in User.objects.values_list('id', flat=True).iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='data_version', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('version', models.BigIntegerField(default=users.models.initial_data_version)),
+            ],
+            options={
+                'db_table': 'data_versions',
+            },
+        ),
+        migrations.RunPython(create_data_versions, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,4 @@
+import secrets
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 
@@ -39,4 +40,29 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     class Meta:
         db_table = 'users'
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+
+
+def initial_data_version():
+    # Random, so a reused user id never repeats a deleted user's versions
+    return secrets.randbits(48)
+
+
+class DataVersion(models.Model):
+    """
+    Counter bumped on every write to a user's transactions, categories or
+    budgets. Read endpoints derive their ETag from it (see config.views).
+    """
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='data_version'
+    )
+    version = models.BigIntegerField(default=initial_data_version)
+
+    class Meta:
+        db_table = 'data_versions'
+
+    def __str__(self):
+        return f"{self.user_id} @ {self.version}"
\ No newline at end of file
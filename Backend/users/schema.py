@@ -0,0 +1,6 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """Document CachedJWTAuthentication as the same bearer JWT scheme"""
+    target_class = 'users.authentication.CachedJWTAuthentication'
\ No newline at end of file
@@ -0,0 +1,31 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .authentication import user_cache
+from .models import User, DataVersion
+from .versions import bump_data_version
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_id = str(instance.pk)
+    user_cache.invalidate(user_id)
+    # Again after commit, in case a concurrent request re-cached the old row
+    transaction.on_commit(lambda: user_cache.invalidate(user_id))
+
+
+@receiver(post_save, sender=User)
+def create_data_version(sender, instance, created, **kwargs):
+    if created:
+        DataVersion.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender='transactions.Transaction')
+@receiver(post_delete, sender='transactions.Transaction')
+@receiver(post_save, sender='categories.Category')
+@receiver(post_delete, sender='categories.Category')
+@receiver(post_save, sender='budgets.Budget')
+@receiver(post_delete, sender='budgets.Budget')
+def bump_data_version_on_write(sender, instance, **kwargs):
+    bump_data_version(instance.user_id)
\ No newline at end of file
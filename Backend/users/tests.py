@@ -1,3 +1,48 @@
+import copy
 from django.test import TestCase
+from benchmarks import runner
+from .authentication import user_cache
+from .models import User
 
-# Create your tests here.
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.user = User.objects.create_user('cached@example.com', 'cached-pass', first_name='Old')
+        self.client = runner.authenticated_client(self.user)
+
+    def profile(self):
+        return self.client.get('/api/auth/profile/')
+
+    def test_repeat_requests_hit_the_cache(self):
+        self.assertEqual(self.profile().status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.profile().status_code, 200)
+        self.assertEqual(user_cache.stats()['hits'], 1)
+
+    def test_save_evicts_the_cached_user(self):
+        self.profile()
+        self.user.first_name = 'New'
+        self.user.save()
+        self.assertIsNone(user_cache.get(str(self.user.pk)))
+        self.assertEqual(self.profile().json()['first_name'], 'New')
+
+    def test_delete_evicts_the_cached_user(self):
+        self.profile()
+        self.user.delete()
+        self.assertIsNone(user_cache.get(str(self.user.pk)))
+        self.assertEqual(self.profile().status_code, 401)
+
+    def test_deactivated_user_is_rejected_at_once(self):
+        self.assertEqual(self.profile().status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.profile().status_code, 401)
+
+    def test_inactive_cached_user_is_rejected(self):
+        self.profile()
+        inactive = copy.copy(self.user)
+        inactive.is_active = False
+        user_cache.set(str(self.user.pk), inactive)
+        self.assertEqual(self.profile().status_code, 401)
\ No newline at end of file
@@ -0,0 +1,21 @@
+from django.db.models import F
+from config.routers import pin_to_primary
+from .models import DataVersion
+
+
+def data_version(user_id):
+    """The user's current data version (a primary key lookup), or None if the user has none"""
+    return DataVersion.objects.filter(user_id=user_id).values_list('version', flat=True).first()
+
+
+def bump_data_version(user_id):
+    """
+    Mark the user's data as changed.
+
+    Call after writes that send no model signals (bulk_create, queryset
+    update/delete). The row is created with the user, so a bump is a single
+    UPDATE and is a no-op while the user itself is being deleted. The user's
+    reads are also pinned to the primary database for a few seconds.
+    """
+    DataVersion.objects.filter(user_id=user_id).update(version=F('version') + 1)
+    pin_to_primary(user_id)
\ No newline at end of file